@@ -1,4 +1,30 @@
-"""ADK entrypoint: exposes root_agent for adk web/run/api_server."""
+"""ADK entrypoint: exposes root_agent (and the App wrapping it) for adk web/run/api_server."""
+import os
+
+# Idle OpenMP workers sleep instead of spinning between FAISS searches. Only
+# takes effect if set before faiss is first imported (via the agent tools below).
+os.environ.setdefault("OMP_WAIT_POLICY", "PASSIVE")
+
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.apps import App
+
 from app.agents.root_agent import root_agent
+from app.tools.faiss_index import set_search_threads
+
+# Agent tools search one query at a time, often from concurrent tool threads:
+# one OpenMP thread per search avoids fork/join overhead and oversubscription
+set_search_threads(1)
+
+# Cache the static instructions + tool declarations server-side so later
+# turns skip re-prefilling them. Refreshed every 10 invocations / 1 hour.
+app = App(
+    name="app",
+    root_agent=root_agent,
+    context_cache_config=ContextCacheConfig(
+        min_tokens=1024,
+        ttl_seconds=3600,
+        cache_intervals=10
+    )
+)
 
-__all__ = ["root_agent"]
+__all__ = ["root_agent", "app"]
@@ -1,5 +1,6 @@
 """Planner agent: builds study plans from coverage and readiness."""
 from google.adk.agents.llm_agent import Agent
+from app.agents.prompts import PLANNER_INSTRUCTION
 from app.agents.tools import (
     get_current_date,
     extract_coverage,
@@ -16,56 +17,7 @@ planner_agent = Agent(
     model="gemini-3-flash-preview",
     name="planner_agent",
     description="Creates personalized study schedules from exam coverage enriched with textbook evidence.",
-    instruction="""Generate personalized study plans from exam coverage matched to textbook content.
-
-IMPORTANT: Always call get_current_date() first to get today's actual date before planning!
-
-Smart Planning Workflow:
-1. get_current_date() - Get today's date (ALWAYS call this first!)
-2. extract_coverage(file_id) - Parse exam objectives from overview (if needed)
-3. enrich_coverage_tool(exam_file_id) - Match objectives to textbook via RAG search (if needed)
-4. analyze_study_load(exam_file_ids, start_date, end_date, minutes_per_day) - ANALYZE FEASIBILITY
-   - Returns: time needed vs available, feasibility assessment, recommendations
-   - Use this BEFORE calling generate_plan to understand constraints!
-5a. generate_plan() - Basic plan (uses simple heuristics)
-   OR
-5b. generate_smart_plan() - Intelligent plan (uses LLM to prioritize topics)
-   - Priority strategies: "comprehensive", "balanced", "prioritized", "cramming"
-   - Scheduling strategies: "round_robin", "priority_first", "balanced"
-   - Use ACTUAL dates from get_current_date(), not hardcoded dates!
-   - ALL topics are included, just tagged by priority (critical/high/medium/low/optional)
-6. export_plan(plan_id, format) - Export as markdown/CSV/JSON
-
-Adaptive Planning Strategy:
-- If feasibility is "comfortable" or "realistic" → Use generate_plan() with balanced strategy
-- If feasibility is "tight" → Recommend generate_smart_plan() with priority_strategy="prioritized"
-  * This will tag topics by importance (critical/high/medium/low/optional)
-  * User can focus on high-priority topics if time runs short
-- If feasibility is "impossible" → Tell user time is insufficient, offer options:
-  * Extend the deadline
-  * Increase daily study time  
-  * Use generate_smart_plan() with priority_strategy="cramming" (critical topics only prioritized)
-  
-Plan Types:
-- generate_plan(): Simple, uses heuristics, good when time is sufficient
-- generate_smart_plan(): LLM-powered prioritization, better for time constraints
-  * Tags ALL topics with priority levels
-  * Doesn't drop topics, just marks them as optional/low priority
-  * More transparent - user sees full picture
-
-Check prerequisites: Use check_readiness() and list_available_exams() before planning.
-Warn if enrichment confidence is low (<0.6). Explain scheduling strategy clearly.
-
-Date handling:
-- When user says "today", "tomorrow", "next week", use get_current_date() to calculate actual dates
-- Default start date: tomorrow (today + 1 day)
-- Never use hardcoded dates from 2024 or other years!
-
-Communication:
-- Be transparent about time constraints
-- Explain what "tight" or "impossible" means
-- Offer alternatives and let user decide
-- Don't blindly create plans that won't work""",
+    instruction=PLANNER_INSTRUCTION,
     tools=[
         get_current_date,
         extract_coverage,
@@ -8,7 +8,8 @@ from datetime import date, timedelta
 import json
 import os
 import logging
-from typing import Literal, Optional
+import orjson
+from typing import Iterator, Literal, Optional
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -19,15 +20,16 @@ logging.basicConfig(
 
 # Import all the core functionality
 from app.tools.manifest_io import load_manifest, save_manifest, update_manifest
-from app.tools.fs_scan import scan_uploads, compute_sha256
+from app.tools.fs_scan import scan_uploads, compute_sha256, uploads_fingerprint
 from app.tools.pdf_extract import extract_text_from_pdf
-from app.tools.doc_classify import classify_document as classify_doc_llm
+from app.tools.text_extraction import find_extracted_by_hash, record_content_hash
+from app.tools.doc_classify import classify_document as classify_doc_llm, classify_and_extract_coverage
 from app.tools.coverage_extract import extract_coverage as extract_coverage_llm
 from app.tools.toc_extract import extract_toc
 from app.tools.smart_chunking import chunk_textbook_smart
 from app.tools.embed import embed_texts
 from app.tools.embedding_cache import get_or_compute_embeddings
-from app.tools.faiss_index import build_faiss_index, build_chunk_mapping, search_index, load_faiss_index, load_chunk_mapping, retrieve_chunks_with_text
+from app.tools.faiss_index import build_faiss_index, build_chunk_mapping, search_index, load_search_index, load_chunk_mapping, retrieve_chunks_with_text
 from app.tools.rag_scout import enrich_coverage
 from app.tools.study_planner import generate_multi_exam_plan
 from app.tools.plan_export import export_to_markdown, export_to_csv, export_to_json
@@ -36,7 +38,6 @@ from app.tools.intelligent_planner import analyze_study_load as analyze_load_imp
 
 from app.models.manifest import Manifest, ManifestFile
 from app.models.coverage import ExamCoverage
-from app.models.enriched_coverage import EnrichedCoverage
 from app.models.plan import StudyPlan
 
 
@@ -44,6 +45,18 @@ from app.models.plan import StudyPlan
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 UPLOADS_DIR = PROJECT_ROOT / "storage" / "uploads"
 STATE_DIR = PROJECT_ROOT / "storage" / "state"
+MANIFEST_PATH = STATE_DIR / "manifest.json"
+EXTRACTED_TEXT_DIR = STATE_DIR / "extracted_text"
+TOC_DIR = STATE_DIR / "textbook_metadata"
+COVERAGE_DIR = STATE_DIR / "coverage"
+ENRICHED_COVERAGE_DIR = STATE_DIR / "enriched_coverage"
+PLANS_DIR = STATE_DIR / "plans"
+CHUNKS_PATH = STATE_DIR / "chunks" / "chunks.jsonl"
+INDEX_PATH = STATE_DIR / "index" / "faiss.index"
+MAPPING_PATH = STATE_DIR / "index" / "row_to_chunk_id.json"
+
+# Uploads fingerprint from the last sync_files() that ran update_manifest
+_LAST_SYNC_FINGERPRINT: Optional[tuple] = None
 
 
 # ============================================================================
@@ -63,8 +76,7 @@ def list_files() -> dict:
         - by_status: breakdown by status (new, processed, stale, error)
     """
     try:
-        manifest_path = STATE_DIR / "manifest.json"
-        manifest = load_manifest(manifest_path)
+        manifest = load_manifest(MANIFEST_PATH)
         
         if not manifest:
             return {
@@ -109,25 +121,37 @@ def sync_files() -> dict:
     Scan uploads directory and update manifest with new/modified files.
     Returns detailed file list so agent knows what to process.
     
+    Files are only re-hashed when the uploads directory's (path, size, mtime)
+    fingerprint differs from the previous sync in this process.
+    
     Returns:
         dict with:
         - status: "success" or "error"
+        - changed: False if the uploads fast path skipped the rescan
         - new_files: list of new file entries (with file_id, filename, status)
         - updated_files: list of updated file entries
         - all_files: complete list of all files with IDs and statuses
         - total_files: total file count
         - message: summary message
     """
+    global _LAST_SYNC_FINGERPRINT
+    
     try:
         logger.info("🔄 Syncing files from uploads directory...")
-        manifest_path = STATE_DIR / "manifest.json"
         
-        # Use the existing update_manifest logic
-        stats = update_manifest(UPLOADS_DIR, manifest_path)
-        logger.info(f"✅ Sync complete: {stats['new']} new, {stats['stale']} updated, {stats['unchanged']} unchanged")
+        # Fast path: skip re-hashing uploads if nothing was added/modified/removed
+        fingerprint = uploads_fingerprint(UPLOADS_DIR)
+        if fingerprint == _LAST_SYNC_FINGERPRINT and MANIFEST_PATH.exists():
+            stats = None
+            logger.info("✅ Uploads unchanged since last sync")
+        else:
+            # Use the existing update_manifest logic
+            stats = update_manifest(UPLOADS_DIR, MANIFEST_PATH)
+            _LAST_SYNC_FINGERPRINT = fingerprint
+            logger.info(f"✅ Sync complete: {stats['new']} new, {stats['stale']} updated, {stats['unchanged']} unchanged")
         
-        # Load manifest to get file details
-        manifest = load_manifest(manifest_path)
+        # Load manifest to get file details (statuses change as files are processed)
+        manifest = load_manifest(MANIFEST_PATH)
         
         # Extract file details for agent to use
         all_files = []
@@ -149,13 +173,19 @@ def sync_files() -> dict:
             elif file.status == "stale":
                 updated_files.append(file_info)
         
+        if stats is None:
+            message = f"No upload changes since last sync. {len(new_files)} new and {len(updated_files)} updated files awaiting processing."
+        else:
+            message = f"Found {len(new_files)} new files, {len(updated_files)} updated files, {stats['unchanged']} unchanged. Use file_id from the lists to process files."
+        
         return {
             "status": "success",
+            "changed": stats is not None,
             "new_files": new_files,
             "updated_files": updated_files,
             "all_files": all_files,
             "total_files": len(all_files),
-            "message": f"Found {len(new_files)} new files, {len(updated_files)} updated files, {stats['unchanged']} unchanged. Use file_id from the lists to process files."
+            "message": message
         }
         
     except Exception as e:
@@ -182,7 +212,7 @@ def extract_text(file_id: str) -> dict:
     """
     try:
         # Load manifest to get file path
-        manifest = load_manifest(STATE_DIR / "manifest.json")
+        manifest = load_manifest(MANIFEST_PATH)
         file_entry = next((f for f in manifest.files if f.file_id == file_id), None)
         
         if not file_entry:
@@ -192,7 +222,7 @@ def extract_text(file_id: str) -> dict:
             }
         
         pdf_path = UPLOADS_DIR / file_entry.path
-        output_path = STATE_DIR / "extracted_text" / f"{file_id}.json"
+        output_path = EXTRACTED_TEXT_DIR / f"{file_id}.json"
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Check cache: skip if already extracted and status is processed
@@ -209,27 +239,33 @@ def extract_text(file_id: str) -> dict:
                 "cached": True
             }
         
-        # Extract text
-        logger.info(f"📄 Extracting text from {file_entry.filename}...")
-        extracted_text, error = extract_text_from_pdf(pdf_path, file_id, file_entry.path)
-        
-        if error or not extracted_text:
-            return {
-                "status": "error",
-                "message": f"Failed to extract text: {error or 'Unknown error'}"
-            }
-        
-        logger.info(f"✅ Extracted {len(extracted_text.pages)} pages from {file_entry.filename}")
+        # Reuse an earlier extraction of identical bytes (e.g. a renamed re-upload)
+        extracted_text = find_extracted_by_hash(file_entry.sha256, file_id, file_entry.path, output_path.parent)
+        if extracted_text is not None:
+            logger.info(f"✓ Reusing extraction of identical content for {file_entry.filename}")
+        else:
+            # Extract text
+            logger.info(f"📄 Extracting text from {file_entry.filename}...")
+            extracted_text, error = extract_text_from_pdf(pdf_path, file_id, file_entry.path)
+            
+            if error or not extracted_text:
+                return {
+                    "status": "error",
+                    "message": f"Failed to extract text: {error or 'Unknown error'}"
+                }
+            
+            logger.info(f"✅ Extracted {len(extracted_text.pages)} pages from {file_entry.filename}")
         
         # Save to cache
         with open(output_path, 'w') as f:
-            json.dump(extracted_text.model_dump(mode='json'), f, indent=2, default=str)
+            f.write(extracted_text.model_dump_json(indent=2))
+        record_content_hash(file_entry.sha256, file_id, output_path.parent)
         
         # Update manifest
         file_entry.status = "processed"
         if str(output_path.relative_to(PROJECT_ROOT)) not in file_entry.derived:
             file_entry.derived.append(str(output_path.relative_to(PROJECT_ROOT)))
-        save_manifest(manifest, STATE_DIR / "manifest.json")
+        save_manifest(manifest, MANIFEST_PATH)
         
         return {
             "status": "success",
@@ -264,7 +300,7 @@ def classify_document(file_id: str) -> dict:
     """
     try:
         # Load manifest FIRST to get file_entry
-        manifest = load_manifest(STATE_DIR / "manifest.json")
+        manifest = load_manifest(MANIFEST_PATH)
         file_entry = next((f for f in manifest.files if f.file_id == file_id), None)
         if not file_entry:
             return {
@@ -273,7 +309,7 @@ def classify_document(file_id: str) -> dict:
             }
         
         # Load extracted text
-        text_path = STATE_DIR / "extracted_text" / f"{file_id}.json"
+        text_path = EXTRACTED_TEXT_DIR / f"{file_id}.json"
         if not text_path.exists():
             return {
                 "status": "error",
@@ -298,7 +334,7 @@ def classify_document(file_id: str) -> dict:
         file_entry.doc_type = doc_type
         file_entry.doc_confidence = confidence
         file_entry.doc_reasoning = reasoning
-        save_manifest(manifest, STATE_DIR / "manifest.json")
+        save_manifest(manifest, MANIFEST_PATH)
         
         return {
             "status": "success",
@@ -316,6 +352,104 @@ def classify_document(file_id: str) -> dict:
         }
 
 
+def classify_and_extract(file_id: str) -> dict:
+    """
+    Classify a document and, for exam overviews, extract coverage in ONE LLM call.
+    Prefer this over classify_document + extract_coverage for files with doc_type='unknown'.
+    
+    Args:
+        file_id: File ID from manifest
+        
+    Returns:
+        dict with:
+        - status: "success" or "error"
+        - file_id: the file ID
+        - doc_type: "textbook", "exam_overview", "syllabus", or "other"
+        - confidence: 0.0-1.0
+        - reasoning: explanation
+        - coverage_extracted: True if exam coverage was saved
+        - next_step: follow-up tool to run, if any
+        - message: summary message
+    """
+    try:
+        manifest = load_manifest(MANIFEST_PATH)
+        file_entry = next((f for f in manifest.files if f.file_id == file_id), None)
+        if not file_entry:
+            return {
+                "status": "error",
+                "message": f"File {file_id} not found in manifest"
+            }
+        
+        text_path = EXTRACTED_TEXT_DIR / f"{file_id}.json"
+        if not text_path.exists():
+            return {
+                "status": "error",
+                "message": f"Extracted text not found for {file_id}. Run extract_text first."
+            }
+        
+        with open(text_path) as f:
+            extracted_text_data = json.load(f)
+        
+        result, coverage, coverage_error = classify_and_extract_coverage(
+            first_page=extracted_text_data.get("first_page", ""),
+            filename=file_entry.filename,
+            full_text=extracted_text_data.get("full_text", ""),
+            file_id=file_id
+        )
+        
+        doc_type = result["doc_type"]
+        file_entry.doc_type = doc_type
+        file_entry.doc_confidence = result["confidence"]
+        file_entry.doc_reasoning = result["reasoning"]
+        
+        next_step = None
+        if coverage is not None:
+            _save_coverage(coverage, file_entry)
+            message = f"Classified as {doc_type} and extracted {sum(len(ch.bullets) for ch in coverage.topics)} topics"
+        elif doc_type == "exam_overview":
+            next_step = f"extract_coverage({file_id})"
+            message = f"Classified as {doc_type}; coverage not extracted ({coverage_error}). Run {next_step}."
+        elif doc_type == "textbook":
+            next_step = f"extract_toc_tool({file_id})"
+            message = f"Classified as {doc_type}. Run {next_step} next."
+        else:
+            message = f"Classified as {doc_type} (confidence: {result['confidence']:.2f})"
+        
+        save_manifest(manifest, MANIFEST_PATH)
+        
+        return {
+            "status": "success",
+            "file_id": file_id,
+            "doc_type": doc_type,
+            "confidence": result["confidence"],
+            "reasoning": result["reasoning"],
+            "coverage_extracted": coverage is not None,
+            "next_step": next_step,
+            "message": message
+        }
+        
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Classification failed: {str(e)}"
+        }
+
+
+def _save_coverage(coverage: ExamCoverage, file_entry: ManifestFile) -> Path:
+    """Write coverage JSON and record it in the file's derived artifacts (caller saves manifest)."""
+    COVERAGE_DIR.mkdir(parents=True, exist_ok=True)
+    coverage_path = COVERAGE_DIR / f"{file_entry.file_id}.json"
+    
+    with open(coverage_path, 'w') as f:
+        f.write(coverage.model_dump_json(indent=2))
+    
+    derived_path = str(coverage_path.relative_to(PROJECT_ROOT))
+    if derived_path not in file_entry.derived:
+        file_entry.derived.append(derived_path)
+    
+    return coverage_path
+
+
 def extract_toc_tool(file_id: str) -> dict:
     """
     Extract table of contents from a textbook.
@@ -333,7 +467,7 @@ def extract_toc_tool(file_id: str) -> dict:
     """
     try:
         # Load extracted text
-        text_path = STATE_DIR / "extracted_text" / f"{file_id}.json"
+        text_path = EXTRACTED_TEXT_DIR / f"{file_id}.json"
         if not text_path.exists():
             return {
                 "status": "error",
@@ -344,7 +478,7 @@ def extract_toc_tool(file_id: str) -> dict:
             extracted_text_data = json.load(f)
         
         # Get file entry for filename
-        manifest = load_manifest(STATE_DIR / "manifest.json")
+        manifest = load_manifest(MANIFEST_PATH)
         file_entry = next((f for f in manifest.files if f.file_id == file_id), None)
         if not file_entry:
             return {"status": "error", "message": f"File {file_id} not found in manifest"}
@@ -357,7 +491,7 @@ def extract_toc_tool(file_id: str) -> dict:
             }
         
         # Check cache: skip if TOC already extracted and status is processed
-        output_path = STATE_DIR / "textbook_metadata" / f"{file_id}.json"
+        output_path = TOC_DIR / f"{file_id}.json"
         if output_path.exists() and file_entry.status not in ["new", "stale"]:
             with open(output_path) as f:
                 cached_toc = json.load(f)
@@ -386,15 +520,15 @@ def extract_toc_tool(file_id: str) -> dict:
             }
         
         # Save TOC
-        output_path = STATE_DIR / "textbook_metadata" / f"{file_id}.json"
+        output_path = TOC_DIR / f"{file_id}.json"
         output_path.parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, 'w') as f:
-            json.dump(toc_metadata.model_dump(mode='json'), f, indent=2, default=str)
+            f.write(toc_metadata.model_dump_json(indent=2))
         
         # Update manifest (already loaded above)
         if str(output_path.relative_to(PROJECT_ROOT)) not in file_entry.derived:
             file_entry.derived.append(str(output_path.relative_to(PROJECT_ROOT)))
-        save_manifest(manifest, STATE_DIR / "manifest.json")
+        save_manifest(manifest, MANIFEST_PATH)
         
         return {
             "status": "success",
@@ -428,7 +562,7 @@ def chunk_textbook(file_id: str) -> dict:
     """
     try:
         # Get file entry for filename
-        manifest = load_manifest(STATE_DIR / "manifest.json")
+        manifest = load_manifest(MANIFEST_PATH)
         if not manifest:
             return {"status": "error", "message": "Manifest not found"}
         
@@ -437,7 +571,7 @@ def chunk_textbook(file_id: str) -> dict:
             return {"status": "error", "message": f"File {file_id} not found in manifest"}
         
         # Check if extracted text exists
-        text_path = STATE_DIR / "extracted_text" / f"{file_id}.json"
+        text_path = EXTRACTED_TEXT_DIR / f"{file_id}.json"
         if not text_path.exists():
             return {"status": "error", "message": f"Extracted text not found for {file_id}. Run extract_text first."}
         
@@ -449,15 +583,14 @@ def chunk_textbook(file_id: str) -> dict:
             }
         
         # Validate prerequisite: TOC metadata should exist (optional but recommended)
-        toc_path = STATE_DIR / "textbook_metadata" / f"{file_id}.json"
+        toc_path = TOC_DIR / f"{file_id}.json"
         if not toc_path.exists():
             logger.warning(f"⚠️  No TOC metadata found for {file_entry.filename}. Will use semantic chunking without chapter boundaries.")
         
         # Check cache: skip if already chunked and status is processed
-        chunks_path = STATE_DIR / "chunks" / "chunks.jsonl"
-        if chunks_path.exists() and file_entry.status not in ["new", "stale"]:
+        if CHUNKS_PATH.exists() and file_entry.status not in ["new", "stale"]:
             # Check if this file already has chunks
-            existing_chunks = load_chunks_jsonl(chunks_path)
+            existing_chunks = load_chunks_jsonl(CHUNKS_PATH)
             file_chunks = [c for c in existing_chunks if c.get("file_id") == file_id]
             if file_chunks:
                 logger.info(f"✓ Using cached chunks for {file_entry.filename}")
@@ -465,21 +598,18 @@ def chunk_textbook(file_id: str) -> dict:
                     "status": "success",
                     "file_id": file_id,
                     "chunks_created": len(file_chunks),
-                    "output_path": str(chunks_path),
+                    "output_path": str(CHUNKS_PATH),
                     "message": f"Already chunked (cached) - {len(file_chunks)} chunks",
                     "cached": True
                 }
         
         # Chunk using smart chunking (handles TOC if available, falls back to semantic chunking)
-        extracted_text_dir = STATE_DIR / "extracted_text"
-        textbook_metadata_dir = STATE_DIR / "textbook_metadata"
-        coverage_dir = STATE_DIR / "coverage"
         
         chunks = chunk_textbook_smart(
             file_id=file_id,
-            extracted_text_dir=extracted_text_dir,
-            textbook_metadata_dir=textbook_metadata_dir,
-            coverage_dir=coverage_dir,
+            extracted_text_dir=EXTRACTED_TEXT_DIR,
+            textbook_metadata_dir=TOC_DIR,
+            coverage_dir=COVERAGE_DIR,
             filename=file_entry.filename,
             target_tokens=700,
             max_tokens=900,
@@ -487,24 +617,22 @@ def chunk_textbook(file_id: str) -> dict:
         )
         
         # Save chunks
-        chunks_dir = STATE_DIR / "chunks"
-        chunks_dir.mkdir(parents=True, exist_ok=True)
-        chunks_path = chunks_dir / "chunks.jsonl"
+        CHUNKS_PATH.parent.mkdir(parents=True, exist_ok=True)
         
         # Append to existing chunks file
-        append_chunks_jsonl(chunks, chunks_path)
+        append_chunks_jsonl(chunks, CHUNKS_PATH)
         
         # Update manifest
-        derived_path = str(chunks_path.relative_to(PROJECT_ROOT))
+        derived_path = str(CHUNKS_PATH.relative_to(PROJECT_ROOT))
         if derived_path not in file_entry.derived:
             file_entry.derived.append(derived_path)
-        save_manifest(manifest, STATE_DIR / "manifest.json")
+        save_manifest(manifest, MANIFEST_PATH)
         
         return {
             "status": "success",
             "file_id": file_id,
             "chunks_created": len(chunks),
-            "output_path": str(chunks_path),
+            "output_path": str(CHUNKS_PATH),
             "message": f"Created {len(chunks)} chunks"
         }
         
@@ -528,16 +656,15 @@ def build_index() -> dict:
         - message: summary message
     """
     try:
-        chunks_path = STATE_DIR / "chunks" / "chunks.jsonl"
-        if not chunks_path.exists():
+        if not CHUNKS_PATH.exists():
             return {
                 "status": "error",
                 "message": "No chunks found. Run chunk_textbook first."
             }
         
         # Load chunks
-        chunks = load_chunks_jsonl(chunks_path)
-        logger.info(f"📦 Loaded {len(chunks)} chunks from {chunks_path}")
+        chunks = load_chunks_jsonl(CHUNKS_PATH)
+        logger.info(f"📦 Loaded {len(chunks)} chunks from {CHUNKS_PATH}")
         
         # Validate prerequisite: at least one chunk must exist
         if not chunks or len(chunks) == 0:
@@ -558,7 +685,8 @@ def build_index() -> dict:
                 texts,
                 model="gemini-embedding-001",
                 task_type="RETRIEVAL_DOCUMENT",
-                batch_size=100
+                batch_size=100,
+                max_inflight=4
             )
         
         # Get or compute embeddings with cache
@@ -572,24 +700,21 @@ def build_index() -> dict:
         logger.info(f"✅ Embeddings ready: {stats['total']} total ({stats['cached']} cached, {stats['computed']} computed)")
         
         # Build index
-        index_dir = STATE_DIR / "index"
-        index_dir.mkdir(parents=True, exist_ok=True)
-        index_path = index_dir / "faiss.index"
-        mapping_path = index_dir / "row_to_chunk_id.json"
+        INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
         
         logger.info("🏗️  Building FAISS index...")
-        build_faiss_index(embeddings, index_path, normalize=True)
+        build_faiss_index(embeddings, INDEX_PATH, normalize=True, index_type="auto")
         
         logger.info("🗺️  Building chunk mapping...")
-        build_chunk_mapping(chunks, mapping_path)
+        build_chunk_mapping(chunks, MAPPING_PATH)
         
         logger.info(f"✅ Index built successfully: {len(chunks)} chunks indexed")
         
         return {
             "status": "success",
             "total_chunks": len(chunks),
-            "index_path": str(index_path),
-            "mapping_path": str(mapping_path),
+            "index_path": str(INDEX_PATH),
+            "mapping_path": str(MAPPING_PATH),
             "message": f"Indexed {len(chunks)} chunks"
         }
         
@@ -645,7 +770,7 @@ def extract_coverage(file_id: str) -> dict:
     """
     try:
         # Load extracted text
-        text_path = STATE_DIR / "extracted_text" / f"{file_id}.json"
+        text_path = EXTRACTED_TEXT_DIR / f"{file_id}.json"
         if not text_path.exists():
             return {"status": "error", "message": f"Extracted text not found for {file_id}"}
         
@@ -653,7 +778,7 @@ def extract_coverage(file_id: str) -> dict:
             extracted_text_data = json.load(f)
         
         # Get file entry for filename
-        manifest = load_manifest(STATE_DIR / "manifest.json")
+        manifest = load_manifest(MANIFEST_PATH)
         file_entry = next((f for f in manifest.files if f.file_id == file_id), None)
         if not file_entry:
             return {"status": "error", "message": f"File {file_id} not found in manifest"}
@@ -676,19 +801,9 @@ def extract_coverage(file_id: str) -> dict:
         if error or not coverage:
             return {"status": "error", "message": f"Coverage extraction failed: {error or 'Unknown error'}"}
         
-        # Save coverage
-        coverage_dir = STATE_DIR / "coverage"
-        coverage_dir.mkdir(parents=True, exist_ok=True)
-        coverage_path = coverage_dir / f"{file_id}.json"
-        
-        with open(coverage_path, 'w') as f:
-            json.dump(coverage.model_dump(mode='json'), f, indent=2, default=str)
-        
-        # Update manifest (already loaded above)
-        derived_path = str(coverage_path.relative_to(PROJECT_ROOT))
-        if derived_path not in file_entry.derived:
-            file_entry.derived.append(derived_path)
-        save_manifest(manifest, STATE_DIR / "manifest.json")
+        # Save coverage and update manifest (already loaded above)
+        coverage_path = _save_coverage(coverage, file_entry)
+        save_manifest(manifest, MANIFEST_PATH)
         
         total_topics = sum(len(ch.bullets) for ch in coverage.topics)
         
@@ -745,25 +860,24 @@ def enrich_coverage_tool(exam_file_id: str, force: bool = False) -> dict:
         - message: summary message
     """
     try:
-        manifest_path = STATE_DIR / "manifest.json"
-        enriched_dir = STATE_DIR / "enriched_coverage"
-        enriched_path = enriched_dir / f"{exam_file_id}.json"
+        enriched_path = ENRICHED_COVERAGE_DIR / f"{exam_file_id}.json"
         enriched_artifact = f"storage/state/enriched_coverage/{exam_file_id}.json"
 
         # Short-circuit if enriched coverage already exists (unless forced)
         if enriched_path.exists() and not force:
             try:
+                # Written by enrich_coverage below; only the stats are
+                # needed, so read them without validating every topic
                 with open(enriched_path) as f:
                     enriched_data = json.load(f)
-                enriched = EnrichedCoverage(**enriched_data)
-                _update_manifest_enriched(manifest_path, exam_file_id, enriched_artifact)
+                _update_manifest_enriched(MANIFEST_PATH, exam_file_id, enriched_artifact)
                 return {
                     "status": "success",
-                    "exam_id": enriched.exam_id,
-                    "total_topics": enriched.total_topics,
-                    "high_confidence_count": enriched.high_confidence_count,
-                    "medium_confidence_count": enriched.medium_confidence_count,
-                    "low_confidence_count": enriched.low_confidence_count,
+                    "exam_id": enriched_data["exam_id"],
+                    "total_topics": enriched_data.get("total_topics", 0),
+                    "high_confidence_count": enriched_data.get("high_confidence_count", 0),
+                    "medium_confidence_count": enriched_data.get("medium_confidence_count", 0),
+                    "low_confidence_count": enriched_data.get("low_confidence_count", 0),
                     "output_path": str(enriched_path),
                     "message": f"Enriched coverage already exists for {exam_file_id}. Skipping recompute."
                 }
@@ -771,7 +885,7 @@ def enrich_coverage_tool(exam_file_id: str, force: bool = False) -> dict:
                 logger.warning("Failed to load cached enriched coverage for %s: %s", exam_file_id, e)
 
         # Load coverage
-        coverage_path = STATE_DIR / "coverage" / f"{exam_file_id}.json"
+        coverage_path = COVERAGE_DIR / f"{exam_file_id}.json"
         if not coverage_path.exists():
             return {"status": "error", "message": f"Coverage not found for {exam_file_id}. Run extract_coverage first."}
         
@@ -780,32 +894,29 @@ def enrich_coverage_tool(exam_file_id: str, force: bool = False) -> dict:
         coverage = ExamCoverage(**coverage_data)
         
         # Check index exists
-        index_path = STATE_DIR / "index" / "faiss.index"
-        mapping_path = STATE_DIR / "index" / "row_to_chunk_id.json"
-        chunks_path = STATE_DIR / "chunks" / "chunks.jsonl"
         
-        if not index_path.exists():
+        if not INDEX_PATH.exists():
             return {"status": "error", "message": "FAISS index not found. Run build_index first."}
         
         # Enrich coverage
         print(f"Enriching {coverage.exam_name}...")
         enriched = enrich_coverage(
             coverage=coverage,
-            index_path=index_path,
-            mapping_path=mapping_path,
-            chunks_path=chunks_path,
+            index_path=INDEX_PATH,
+            mapping_path=MAPPING_PATH,
+            chunks_path=CHUNKS_PATH,
             top_k=10,
             min_score=0.6,
             use_chapter_filter=True
         )
         
         # Save enriched coverage
-        enriched_dir.mkdir(parents=True, exist_ok=True)
+        ENRICHED_COVERAGE_DIR.mkdir(parents=True, exist_ok=True)
         
         with open(enriched_path, 'w') as f:
-            json.dump(enriched.model_dump(mode='json'), f, indent=2, default=str)
+            f.write(enriched.model_dump_json(indent=2))
 
-        _update_manifest_enriched(manifest_path, exam_file_id, enriched_artifact)
+        _update_manifest_enriched(MANIFEST_PATH, exam_file_id, enriched_artifact)
         
         return {
             "status": "success",
@@ -851,11 +962,10 @@ def analyze_study_load(
         - message: Summary message
     """
     try:
-        enriched_dir = STATE_DIR / "enriched_coverage"
         
         enriched_paths = []
         for exam_id in exam_file_ids:
-            path = enriched_dir / f"{exam_id}.json"
+            path = ENRICHED_COVERAGE_DIR / f"{exam_id}.json"
             if not path.exists():
                 return {
                     "status": "error",
@@ -927,7 +1037,7 @@ def generate_plan(
         # Validate enriched coverage exists for all exams
         enriched_paths = []
         for exam_id in exam_file_ids:
-            enriched_path = STATE_DIR / "enriched_coverage" / f"{exam_id}.json"
+            enriched_path = ENRICHED_COVERAGE_DIR / f"{exam_id}.json"
             if not enriched_path.exists():
                 return {
                     "status": "error",
@@ -951,12 +1061,11 @@ def generate_plan(
         )
         
         # Save plan
-        plans_dir = STATE_DIR / "plans"
-        plans_dir.mkdir(parents=True, exist_ok=True)
-        plan_path = plans_dir / f"{plan.plan_id}.json"
+        PLANS_DIR.mkdir(parents=True, exist_ok=True)
+        plan_path = PLANS_DIR / f"{plan.plan_id}.json"
         
         with open(plan_path, 'w') as f:
-            json.dump(plan.model_dump(mode='json'), f, indent=2, default=str)
+            f.write(plan.model_dump_json(indent=2))
         
         return {
             "status": "success",
@@ -1018,7 +1127,7 @@ def generate_smart_plan(
         # Validate enriched coverage exists for all exams
         enriched_paths = []
         for exam_id in exam_file_ids:
-            enriched_path = STATE_DIR / "enriched_coverage" / f"{exam_id}.json"
+            enriched_path = ENRICHED_COVERAGE_DIR / f"{exam_id}.json"
             if not enriched_path.exists():
                 return {
                     "status": "error",
@@ -1056,12 +1165,11 @@ def generate_smart_plan(
                 priority_counts[block.priority] = priority_counts.get(block.priority, 0) + 1
         
         # Save plan
-        plans_dir = STATE_DIR / "plans"
-        plans_dir.mkdir(parents=True, exist_ok=True)
-        plan_path = plans_dir / f"{plan.plan_id}.json"
+        PLANS_DIR.mkdir(parents=True, exist_ok=True)
+        plan_path = PLANS_DIR / f"{plan.plan_id}.json"
         
         with open(plan_path, 'w') as f:
-            json.dump(plan.model_dump(mode='json'), f, indent=2, default=str)
+            f.write(plan.model_dump_json(indent=2))
         
         return {
             "status": "success",
@@ -1104,7 +1212,7 @@ def export_plan(
     """
     try:
         # Load plan
-        plan_path = STATE_DIR / "plans" / f"{plan_id}.json"
+        plan_path = PLANS_DIR / f"{plan_id}.json"
         if not plan_path.exists():
             return {"status": "error", "message": f"Plan {plan_id} not found"}
         
@@ -1114,7 +1222,7 @@ def export_plan(
         
         # Determine output path
         format_ext = "md" if format in ["md", "markdown"] else format
-        output_path = STATE_DIR / "plans" / f"{plan_id}.{format_ext}"
+        output_path = PLANS_DIR / f"{plan_id}.{format_ext}"
         
         # Export
         if format in ["md", "markdown"]:
@@ -1200,15 +1308,12 @@ def search_textbook(
             }
 
         # Load index
-        index_path = STATE_DIR / "index" / "faiss.index"
-        mapping_path = STATE_DIR / "index" / "row_to_chunk_id.json"
-        chunks_path = STATE_DIR / "chunks" / "chunks.jsonl"
         
-        if not index_path.exists():
+        if not INDEX_PATH.exists():
             return {"status": "error", "message": "FAISS index not found. Run build_index first."}
         
-        index = load_faiss_index(index_path)
-        mapping = load_chunk_mapping(mapping_path)
+        index = load_search_index(INDEX_PATH)
+        mapping = load_chunk_mapping(MAPPING_PATH)
         
         # Embed query
         from app.tools.embed import embed_query
@@ -1219,7 +1324,7 @@ def search_textbook(
         
         # If exam scoped, filter by chapters
         if exam_file_id:
-            coverage_path = STATE_DIR / "coverage" / f"{exam_file_id}.json"
+            coverage_path = COVERAGE_DIR / f"{exam_file_id}.json"
             if coverage_path.exists():
                 with open(coverage_path) as f:
                     coverage_data = json.load(f)
@@ -1239,11 +1344,11 @@ def search_textbook(
             query_embedding=query_embedding,
             index=index,
             mapping=mapping,
-            chunks_path=chunks_path,
+            chunks_path=CHUNKS_PATH,
             top_k=top_k,
             filters=filters
         )
-        results = retrieve_chunks_with_text(results, chunks_path)
+        results = retrieve_chunks_with_text(results, CHUNKS_PATH)
         
         # Format results
         formatted_results = []
@@ -1280,6 +1385,34 @@ def search_textbook(
 # ROOT AGENT TOOLS (Orchestration)
 # ============================================================================
 
+def _iter_enriched_exams(enriched_dir: Path) -> Iterator[dict]:
+    """
+    Yield the summary fields of each enriched coverage file.
+    
+    Only the header and stat fields are kept; the topic list (the bulk of
+    each file) is dropped as soon as it is parsed.
+    """
+    # scandir reuses the directory listing's type info: no per-entry stat or Path.
+    # A missing directory surfaces as FileNotFoundError rather than a separate exists().
+    try:
+        with os.scandir(enriched_dir) as entries:
+            json_files = [e for e in entries if e.name.endswith(".json") and e.is_file()]
+    except FileNotFoundError:
+        return
+    for entry in json_files:
+        with open(entry.path, "rb") as f:
+            data = orjson.loads(f.read())
+        yield {
+            "file_id": entry.name[:-len(".json")],
+            "exam_name": data["exam_name"],
+            "exam_id": data["exam_id"],
+            "exam_date": data.get("exam_date"),
+            "total_topics": data["total_topics"],
+            "high_confidence": data["high_confidence_count"],
+            "low_confidence": data["low_confidence_count"]
+        }
+
+
 def check_readiness(
     intent: str,
     exam_file_ids: Optional[list[str]] = None
@@ -1299,40 +1432,28 @@ def check_readiness(
         - message: summary message
     """
     try:
-        manifest = load_manifest(STATE_DIR / "manifest.json")
-        
         missing = []
-        available_exams = []
         
         # Check if index exists (required for all intents)
-        index_path = STATE_DIR / "index" / "faiss.index"
-        if not index_path.exists():
+        if not INDEX_PATH.exists():
             missing.append({
                 "type": "index",
                 "message": "FAISS index not built. Upload textbook and run build_index."
             })
         
         # Get available exams (those with enriched coverage)
-        enriched_dir = STATE_DIR / "enriched_coverage"
-        if enriched_dir.exists():
-            for enriched_path in enriched_dir.glob("*.json"):
-                file_id = enriched_path.stem
-                with open(enriched_path) as f:
-                    enriched_data = json.load(f)
-                available_exams.append({
-                    "file_id": file_id,
-                    "exam_name": enriched_data["exam_name"],
-                    "exam_id": enriched_data["exam_id"],
-                    "total_topics": enriched_data["total_topics"]
-                })
+        available_exams = [
+            {key: exam[key] for key in ("file_id", "exam_name", "exam_id", "total_topics")}
+            for exam in _iter_enriched_exams(ENRICHED_COVERAGE_DIR)
+        ]
         
         # Check specific intent requirements
         if intent == "create_plan" and exam_file_ids:
             for exam_id in exam_file_ids:
-                enriched_path = STATE_DIR / "enriched_coverage" / f"{exam_id}.json"
+                enriched_path = ENRICHED_COVERAGE_DIR / f"{exam_id}.json"
                 if not enriched_path.exists():
                     # Check if coverage exists (can enrich)
-                    coverage_path = STATE_DIR / "coverage" / f"{exam_id}.json"
+                    coverage_path = COVERAGE_DIR / f"{exam_id}.json"
                     if coverage_path.exists():
                         missing.append({
                             "type": "enrichment",
@@ -1373,22 +1494,7 @@ def list_available_exams() -> dict:
         - message: summary message
     """
     try:
-        exams = []
-        enriched_dir = STATE_DIR / "enriched_coverage"
-        
-        if enriched_dir.exists():
-            for enriched_path in enriched_dir.glob("*.json"):
-                with open(enriched_path) as f:
-                    enriched_data = json.load(f)
-                exams.append({
-                    "file_id": enriched_path.stem,
-                    "exam_name": enriched_data["exam_name"],
-                    "exam_id": enriched_data["exam_id"],
-                    "exam_date": enriched_data.get("exam_date"),
-                    "total_topics": enriched_data["total_topics"],
-                    "high_confidence": enriched_data["high_confidence_count"],
-                    "low_confidence": enriched_data["low_confidence_count"]
-                })
+        exams = list(_iter_enriched_exams(ENRICHED_COVERAGE_DIR))
         
         return {
             "status": "success",
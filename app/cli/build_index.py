@@ -1,20 +1,46 @@
 """CLI to build FAISS index from chunks (Phase 6)."""
 from pathlib import Path
 import sys
+import argparse
 
-from dotenv import load_dotenv
 
-from app.tools.chunk_store import load_chunks_jsonl
-from app.tools.embed import embed_texts
-from app.tools.embedding_cache import get_or_compute_embeddings
-from app.tools.faiss_index import build_faiss_index, build_chunk_mapping
+BANNER = "=" * 60
 
 
 def main():
     """Build FAISS index with embeddings."""
-    print("="*60)
-    print("BUILDING FAISS INDEX (Phase 6)")
-    print("="*60)
+    parser = argparse.ArgumentParser(description="Build FAISS index from textbook chunks")
+    parser.add_argument("--batch-size", type=int, default=100, help="Texts per embedding request (default: 100)")
+    parser.add_argument("--max-inflight", type=int, default=4, help="Embedding requests in flight at once (default: 4)")
+    parser.add_argument(
+        "--index-type",
+        type=str,
+        choices=["auto", "flat", "hnsw", "ivfpq"],
+        default="auto",
+        help="FAISS index type: exact flat, HNSW graph, IVF-PQ, or auto (flat up to 50k vectors, then HNSW; default: auto)"
+    )
+    parser.add_argument(
+        "--quantize",
+        type=str,
+        choices=["fp32", "fp16", "sq8"],
+        default="fp32",
+        help="Vector storage for flat/hnsw indexes: float32, float16, or 8-bit scalar quantized (default: fp32)"
+    )
+    parser.add_argument("--pca-dim", type=int, default=None, help="Reduce vectors to this many dimensions with PCA before indexing (e.g. 256)")
+    parser.add_argument("--legacy-mapping", action="store_true", help="Also write row_to_chunk_id.json for older readers")
+    parser.add_argument("--block-size", type=int, default=1000, help="Chunks held in memory at once (default: 1000)")
+    parser.add_argument("--device", type=str, choices=["cpu", "gpu"], default="cpu", help="Run FAISS on CPU or GPU (needs faiss-gpu + CUDA; default: cpu)")
+    
+    args = parser.parse_args()
+    
+    # Heavy imports (numpy/faiss/genai) deferred until after arg parsing
+    from dotenv import load_dotenv
+    from app.tools.chunk_store import iter_chunks_jsonl
+    from app.tools.embed import embed_texts
+    from app.tools.embedding_cache import EmbeddingCacheShard, get_or_compute_embedding_rows
+    from app.tools.faiss_index import build_faiss_index_from_rows, ChunkMappingWriter
+    
+    print(f"{BANNER}\nBUILDING FAISS INDEX (Phase 6)\n{BANNER}")
     
     load_dotenv()
     
@@ -30,16 +56,9 @@ def main():
         print("Run: python -m app.cli.chunk_textbooks first")
         sys.exit(1)
     
-    print(f"\n[1/4] Loading chunks from {chunks_path}...", flush=True)
-    chunks = load_chunks_jsonl(chunks_path)
-    print(f"  ✓ Loaded {len(chunks)} chunks", flush=True)
-    
-    if not chunks:
-        print("❌ No chunks found")
-        sys.exit(1)
-    
-    print(f"\n[2/4] Computing embeddings (using cache)...", flush=True)
+    print(f"\n[1/2] Streaming chunks from {chunks_path}...", flush=True)
     print(f"  Model: gemini-embedding-001")
+    print(f"  Batch size: {args.batch_size}, in-flight: {args.max_inflight}")
     print(f"  Cache dir: {cache_dir}", flush=True)
     
     # Define embedding function
@@ -48,46 +67,55 @@ def main():
             texts,
             model="gemini-embedding-001",
             task_type="RETRIEVAL_DOCUMENT",
-            batch_size=100
+            batch_size=args.batch_size,
+            max_inflight=args.max_inflight
         )
     
-    # Get or compute embeddings
-    embeddings, stats = get_or_compute_embeddings(
-        chunks=chunks,
-        cache_dir=cache_dir,
-        embed_function=embed_fn,
-        show_progress=True
-    )
+    # Embed chunks block by block, writing the row mapping as we go
+    cache = EmbeddingCacheShard(cache_dir)
+    with ChunkMappingWriter(mapping_path, legacy_json=args.legacy_mapping) as mapping_writer:
+        rows, stats = get_or_compute_embedding_rows(
+            chunks=iter_chunks_jsonl(chunks_path),
+            cache_dir=cache_dir,
+            embed_function=embed_fn,
+            block_size=args.block_size,
+            show_progress=True,
+            cache_backend=cache,
+            on_block=mapping_writer.write
+        )
+    
+    if stats["total"] == 0:
+        print("❌ No chunks found")
+        sys.exit(1)
     
     print(f"\n  📊 Embedding Stats:")
     print(f"    - Total: {stats['total']}")
     print(f"    - Cached: {stats['cached']}")
     print(f"    - Computed: {stats['computed']}")
-    print(f"    - Shape: {embeddings.shape}", flush=True)
+    print(f"    - Shape: ({stats['total']}, {cache.dim})", flush=True)
     
-    print(f"\n[3/4] Building FAISS index...", flush=True)
-    index = build_faiss_index(
-        embeddings=embeddings,
+    print(f"\n[2/2] Building FAISS index...", flush=True)
+    index = build_faiss_index_from_rows(
+        matrix=cache.matrix,
+        rows=rows,
         index_path=index_path,
-        normalize=True  # For cosine similarity
-    )
-    
-    print(f"\n[4/4] Building chunk mapping...", flush=True)
-    mapping = build_chunk_mapping(
-        chunks=chunks,
-        mapping_path=mapping_path
+        normalize=True,  # For cosine similarity
+        index_type=args.index_type,
+        quantization=args.quantize,
+        device=args.device,
+        pca_dim=args.pca_dim
     )
     
-    print(f"\n{'='*60}")
-    print("✅ Index Build Complete!")
-    print(f"{'='*60}")
+    print(f"\n{BANNER}\n✅ Index Build Complete!\n{BANNER}")
     print(f"\nFiles created:")
     print(f"  - FAISS index: {index_path}")
-    print(f"  - Row mapping: {mapping_path}")
-    print(f"  - Embeddings cache: {cache_dir}/ ({stats['total']} files)")
+    print(f"  - Row mapping: {mapping_writer.array_path} ({mapping_writer.count} rows)")
+    if args.legacy_mapping:
+        print(f"  - Row mapping (JSON): {mapping_path}")
+    print(f"  - Embeddings cache: {cache.matrix_path} ({len(cache)} embeddings)")
     print(f"\nIndex stats:")
     print(f"  - Vectors: {index.ntotal}")
-    print(f"  - Dimensions: {embeddings.shape[1]}")
+    print(f"  - Dimensions: {cache.dim}")
     print(f"  - Size: {index_path.stat().st_size / 1024 / 1024:.1f} MB")
     print(f"\nReady for Phase 7: RAG Scout!")
 
@@ -10,11 +10,12 @@ from app.tools.chunk_store import save_chunks_jsonl, append_chunks_jsonl, build_
 from app.tools.smart_chunking import chunk_textbook_smart
 
 
+BANNER = "=" * 60
+
+
 def main():
     """Chunk only required chapters from textbooks (fast mode)."""
-    print("="*60, flush=True)
-    print("STARTING SMART CHUNKING CLI", flush=True)
-    print("="*60, flush=True)
+    print(f"{BANNER}\nSTARTING SMART CHUNKING CLI\n{BANNER}", flush=True)
     
     print("\n[INIT] Loading environment...", flush=True)
     load_dotenv()
@@ -59,9 +60,7 @@ def main():
         print("Run classify_docs first to identify textbooks.", flush=True)
         return
     
-    print(f"\n{'='*60}", flush=True)
-    print(f"Smart chunking {len(textbooks)} textbook(s) (only required chapters)...", flush=True)
-    print(f"{'='*60}\n", flush=True)
+    print(f"\n{BANNER}\nSmart chunking {len(textbooks)} textbook(s) (only required chapters)...\n{BANNER}\n", flush=True)
     
     # Clear existing chunks file (rebuild)
     print("[SETUP] Clearing existing chunks...", flush=True)
@@ -86,9 +85,7 @@ def main():
     print("\n[PROCESSING] Starting textbook chunking loop...\n", flush=True)
     
     for idx, file_entry in enumerate(textbooks):
-        print(f"\n{'='*60}", flush=True)
-        print(f"[{idx+1}/{len(textbooks)}] {file_entry.filename}", flush=True)
-        print(f"{'='*60}", flush=True)
+        print(f"\n{BANNER}\n[{idx+1}/{len(textbooks)}] {file_entry.filename}\n{BANNER}", flush=True)
         sys.stdout.flush()
         
         try:
@@ -170,7 +167,7 @@ def main():
     save_manifest(manifest, manifest_path)
     print("  ✓ Manifest saved", flush=True)
     
-    print("\n" + "="*60, flush=True)
+    print("\n" + BANNER, flush=True)
     print("=== Chunking Summary ===", flush=True)
     print(f"Files chunked:    {stats['chunked']}")
     print(f"Total chunks:     {stats['total_chunks']}")
@@ -1,16 +1,26 @@
 """CLI to classify documents using LLM (Phase 3)."""
 from pathlib import Path
 import sys
-
-from dotenv import load_dotenv
-from tqdm import tqdm
-
-from app.tools.doc_classification import classify_all_processed
-from app.tools.manifest_io import load_manifest
+import argparse
 
 
 def main():
     """Classify all processed documents and show progress."""
+    parser = argparse.ArgumentParser(description="Classify processed documents with Gemini")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the persistent tool result cache")
+    parser.add_argument("--workers", type=int, default=4, help="Classification requests in flight at once (default: 4)")
+    args = parser.parse_args()
+    
+    # Heavy imports (genai/pydantic) deferred until after arg parsing
+    from dotenv import load_dotenv
+    from tqdm import tqdm
+    from app.tools.doc_classification import classify_all_processed
+    from app.tools.manifest_io import load_manifest
+    from app.tools.tool_cache import set_cache_enabled
+    
+    if args.no_cache:
+        set_cache_enabled(False)
+    
     # Load environment variables (for GOOGLE_API_KEY)
     load_dotenv()
     
@@ -53,7 +63,8 @@ def main():
         stats = classify_all_processed(
             manifest_path=manifest_path,
             extracted_text_dir=extracted_text_dir,
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            max_workers=args.workers
         )
         
         pbar.close()
@@ -4,11 +4,8 @@ import sys
 import json
 import argparse
 
-from dotenv import load_dotenv
 
-from app.models.coverage import ExamCoverage
-from app.tools.rag_scout import enrich_coverage
-from app.tools.manifest_io import load_manifest, save_manifest
+BANNER = "=" * 70
 
 
 def main():
@@ -20,14 +17,25 @@ def main():
     parser.add_argument("--no-chapter-filter", action="store_true", help="Disable chapter filtering")
     parser.add_argument("--output-dir", type=str, help="Custom output directory")
     parser.add_argument("--force", action="store_true", help="Recompute even if enriched coverage already exists")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max embedding requests in flight")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the persistent tool result cache")
+    parser.add_argument("--device", type=str, choices=["cpu", "gpu"], default="cpu", help="Run FAISS on CPU or GPU (needs faiss-gpu + CUDA; default: cpu)")
     
     args = parser.parse_args()
     
+    # Heavy imports (numpy/faiss/genai) deferred until after arg parsing
+    from dotenv import load_dotenv
+    from app.models.coverage import ExamCoverage
+    from app.tools.rag_scout import enrich_coverage
+    from app.tools.manifest_io import load_manifest, save_manifest
+    from app.tools.tool_cache import set_cache_enabled
+    
+    if args.no_cache:
+        set_cache_enabled(False)
+    
     load_dotenv()
     
-    print("="*70)
-    print("RAG SCOUT - ENRICHING EXAM COVERAGE (Phase 7)")
-    print("="*70)
+    print(f"{BANNER}\nRAG SCOUT - ENRICHING EXAM COVERAGE (Phase 7)\n{BANNER}")
     
     # Setup paths
     project_root = Path(__file__).parent.parent.parent
@@ -103,20 +111,20 @@ def main():
         chunks_path=chunks_path,
         top_k=args.top_k,
         min_score=args.min_score,
-        use_chapter_filter=not args.no_chapter_filter
+        use_chapter_filter=not args.no_chapter_filter,
+        concurrency=args.concurrency,
+        device=args.device
     )
     
     # Save enriched coverage
     print(f"\n[3/3] Saving enriched coverage...", flush=True)
     with open(output_path, 'w') as f:
-        json.dump(enriched.model_dump(mode='json'), f, indent=2, default=str)
+        f.write(enriched.model_dump_json(indent=2))
     
     print(f"  ✓ Saved to: {output_path}")
     
     # Final summary
-    print(f"\n{'='*70}")
-    print("✅ Enrichment Complete!")
-    print(f"{'='*70}")
+    print(f"\n{BANNER}\n✅ Enrichment Complete!\n{BANNER}")
     print(f"\nOutput file: {output_path}")
     print(f"Size: {output_path.stat().st_size / 1024:.1f} KB")
     
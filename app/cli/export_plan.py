@@ -4,8 +4,8 @@ import sys
 import json
 import argparse
 
-from app.models.plan import StudyPlan
-from app.tools.plan_export import export_to_markdown, export_to_csv, export_to_json
+
+BANNER = "=" * 70
 
 
 def main():
@@ -27,9 +27,7 @@ def main():
     
     args = parser.parse_args()
     
-    print("="*70)
-    print("STUDY PLAN EXPORT (Phase 9)")
-    print("="*70)
+    print(f"{BANNER}\nSTUDY PLAN EXPORT (Phase 9)\n{BANNER}")
     
     # Setup paths
     project_root = Path(__file__).parent.parent.parent
@@ -45,6 +43,10 @@ def main():
                 print(f"  - {f.stem}")
         sys.exit(1)
     
+    # Deferred until the plan is known to exist (keeps --help and typos fast)
+    from app.models.plan import StudyPlan
+    from app.tools.plan_export import export_to_markdown, export_to_csv, export_to_json
+    
     # Load plan
     print(f"\n[1/2] Loading plan {args.plan_id}...", flush=True)
     with open(plan_path) as f:
@@ -81,9 +83,7 @@ def main():
         sys.exit(1)
     
     # Summary
-    print(f"\n{'='*70}")
-    print("✅ Export Complete!")
-    print(f"{'='*70}")
+    print(f"\n{BANNER}\n✅ Export Complete!\n{BANNER}")
     print(f"\nOutput file: {output_path}")
     print(f"Size: {output_path.stat().st_size / 1024:.1f} KB")
     
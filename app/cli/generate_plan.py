@@ -5,9 +5,8 @@ import json
 import argparse
 from datetime import date, timedelta
 
-from dotenv import load_dotenv
 
-from app.tools.study_planner import generate_multi_exam_plan
+BANNER = "=" * 70
 
 
 def parse_date(date_str: str) -> date:
@@ -63,11 +62,13 @@ def main():
     
     args = parser.parse_args()
     
+    # Heavy imports (numpy/genai/pydantic) deferred until after arg parsing
+    from dotenv import load_dotenv
+    from app.tools.study_planner import generate_multi_exam_plan
+    
     load_dotenv()
     
-    print("="*70)
-    print("MULTI-EXAM STUDY PLANNER (Phase 8)")
-    print("="*70)
+    print(f"{BANNER}\nMULTI-EXAM STUDY PLANNER (Phase 8)\n{BANNER}")
     
     # Setup paths
     project_root = Path(__file__).parent.parent.parent
@@ -151,11 +152,9 @@ def main():
     # Save plan
     output_path = output_dir / f"{plan.plan_id}.json"
     with open(output_path, 'w') as f:
-        json.dump(plan.model_dump(mode='json'), f, indent=2, default=str)
+        f.write(plan.model_dump_json(indent=2))
     
-    print(f"\n{'='*70}")
-    print("✅ Study Plan Generated!")
-    print(f"{'='*70}")
+    print(f"\n{BANNER}\n✅ Study Plan Generated!\n{BANNER}")
     
     # Print summary
     print(f"\n📊 Plan Summary:")
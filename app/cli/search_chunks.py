@@ -3,15 +3,8 @@ from pathlib import Path
 import sys
 import argparse
 
-from dotenv import load_dotenv
 
-from app.tools.embed import embed_query
-from app.tools.faiss_index import (
-    load_faiss_index,
-    load_chunk_mapping,
-    search_index,
-    retrieve_chunks_with_text
-)
+BANNER = "=" * 70
 
 
 def main():
@@ -25,6 +18,16 @@ def main():
     
     args = parser.parse_args()
     
+    # Heavy imports (numpy/faiss/genai) deferred until after arg parsing
+    from dotenv import load_dotenv
+    from app.tools.embed import embed_query
+    from app.tools.faiss_index import (
+        load_search_index,
+        load_chunk_mapping,
+        search_index,
+        retrieve_chunks_with_text
+    )
+    
     load_dotenv()
     
     project_root = Path(__file__).parent.parent.parent
@@ -47,9 +50,9 @@ def main():
     
     # Load index and mapping
     print("Loading index...", flush=True)
-    index = load_faiss_index(index_path)
+    index = load_search_index(index_path)
     mapping = load_chunk_mapping(mapping_path)
-    print(f"✓ Loaded index with {index.ntotal} vectors\n")
+    print(f"✓ Loaded index with {len(mapping)} vectors\n")
     
     # Embed query
     print("Embedding query...", flush=True)
@@ -79,7 +82,7 @@ def main():
         sys.exit(0)
     
     print(f"✓ Found {len(results)} results\n")
-    print("="*70)
+    print(BANNER)
     
     # Add text if requested
     if args.show_text:
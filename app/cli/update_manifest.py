@@ -5,6 +5,16 @@ import sys
 from app.tools.manifest_io import update_manifest, load_manifest
 
 
+STATUS_MARKERS = {
+    "new": "[NEW]",
+    "stale": "[STALE]",
+    "processed": "[OK]",
+    "error": "[ERROR]"
+}
+# Bound format method for a file table row
+FILE_ROW = "{marker:10} {filename:50} ({doc_type})".format
+
+
 def main():
     """Update manifest and print summary."""
     # Get paths relative to project root
@@ -36,14 +46,15 @@ def main():
     manifest = load_manifest(manifest_path)
     if manifest and manifest.files:
         print("=== Files ===")
+        rows = []
         for file in manifest.files:
-            status_marker = {
-                "new": "[NEW]",
-                "stale": "[STALE]",
-                "processed": "[OK]",
-                "error": "[ERROR]"
-            }.get(file.status, f"[{file.status}]")
-            print(f"{status_marker:10} {file.filename:50} ({file.doc_type})")
+            rows.append(FILE_ROW(
+                marker=STATUS_MARKERS.get(file.status, f"[{file.status}]"),
+                filename=file.filename,
+                doc_type=file.doc_type
+            ))
+        # One write for the whole table instead of a print per file
+        sys.stdout.write("\n".join(rows) + "\n")
     
     print()
     print(f"Last scan: {manifest.last_scan if manifest else 'N/A'}")
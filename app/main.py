@@ -1,4 +1,4 @@
 """ADK entrypoint: root agent for adk run / adk web / adk api_server."""
-from app.agents.root_agent import root_agent
+from app.agent import app, root_agent
 
-__all__ = ["root_agent"]
+__all__ = ["root_agent", "app"]
@@ -60,6 +60,15 @@ class EnrichedCoverage(BaseModel):
     def calculate_stats(self):
         """Calculate enrichment statistics."""
         self.total_topics = len(self.topics)
-        self.high_confidence_count = sum(1 for t in self.topics if t.confidence_score >= 0.75)
-        self.medium_confidence_count = sum(1 for t in self.topics if 0.6 <= t.confidence_score < 0.75)
-        self.low_confidence_count = sum(1 for t in self.topics if t.confidence_score < 0.6)
+        high = medium = low = 0
+        for topic in self.topics:
+            score = topic.confidence_score
+            if score >= 0.75:
+                high += 1
+            elif score >= 0.6:
+                medium += 1
+            else:
+                low += 1
+        self.high_confidence_count = high
+        self.medium_confidence_count = medium
+        self.low_confidence_count = low
@@ -87,18 +87,20 @@ class StudyPlan(BaseModel):
         self.total_topics = sum(len(day.blocks) for day in self.days)
     
     def get_exam_stats(self) -> dict[str, dict]:
-        """Get per-exam statistics."""
-        stats = {}
-        for exam in self.exams:
-            exam_blocks = [
-                block for day in self.days 
-                for block in day.blocks 
-                if block.exam_id == exam.exam_id
-            ]
-            stats[exam.exam_id] = {
-                "exam_name": exam.exam_name,
-                "topics": len(exam_blocks),
-                "total_minutes": sum(b.time_estimate_minutes for b in exam_blocks),
-                "avg_confidence": sum(b.confidence_score for b in exam_blocks) / len(exam_blocks) if exam_blocks else 0.0
-            }
+        """Get per-exam statistics (single pass over all blocks)."""
+        stats = {
+            exam.exam_id: {"exam_name": exam.exam_name, "topics": 0, "total_minutes": 0, "avg_confidence": 0.0}
+            for exam in self.exams
+        }
+        for day in self.days:
+            for block in day.blocks:
+                exam_stats = stats.get(block.exam_id)
+                if exam_stats is not None:
+                    exam_stats["topics"] += 1
+                    exam_stats["total_minutes"] += block.time_estimate_minutes
+                    # Confidence sum for now; averaged below
+                    exam_stats["avg_confidence"] += block.confidence_score
+        for exam_stats in stats.values():
+            if exam_stats["topics"]:
+                exam_stats["avg_confidence"] /= exam_stats["topics"]
         return stats
@@ -1,7 +1,10 @@
 """Storage and retrieval for text chunks."""
 from pathlib import Path
 import json
-from typing import Optional
+import mmap
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+import orjson
 
 from app.models.chunks import Chunk
 
@@ -21,31 +24,70 @@ def save_chunks_jsonl(chunks: list[Chunk], output_path: Path) -> None:
             f.write(chunk.model_dump_json() + '\n')
 
 
-def load_chunks_jsonl(input_path: Path) -> list[Chunk]:
+def iter_chunks_jsonl(input_path: Path) -> Iterator[Chunk]:
     """
-    Load chunks from JSONL file.
+    Stream chunks from a JSONL file one at a time.
     
     Args:
         input_path: Path to JSONL file
         
-    Returns:
-        List of Chunk objects
+    Yields:
+        Chunk objects in file order
     """
     if not input_path.exists():
-        return []
+        return
     
-    chunks = []
     with input_path.open('r', encoding='utf-8') as f:
         for line in f:
             line = line.strip()
             if line:
                 try:
                     chunk_data = json.loads(line)
-                    chunks.append(Chunk(**chunk_data))
+                    yield Chunk(**chunk_data)
                 except Exception as e:
                     print(f"Warning: Failed to parse chunk line: {e}")
                     continue
+
+
+def load_chunks_jsonl(input_path: Path) -> list[Chunk]:
+    """
+    Load chunks from JSONL file.
+    
+    Args:
+        input_path: Path to JSONL file
+        
+    Returns:
+        List of Chunk objects
+    """
+    return list(iter_chunks_jsonl(input_path))
+
+
+def load_chunks_dict_jsonl(input_path: Path) -> Dict[str, Chunk]:
+    """
+    Load chunks straight into a {chunk_id: Chunk} lookup in one pass.
+    
+    Avoids holding a list and a dict of the same chunks; each line is parsed
+    and validated from bytes by pydantic-core.
     
+    Args:
+        input_path: Path to JSONL file
+        
+    Returns:
+        Dict of chunk_id -> Chunk (later duplicates win)
+    """
+    chunks = {}
+    if not input_path.exists():
+        return chunks
+    
+    with input_path.open('rb') as f:
+        for line in f:
+            if line.strip():
+                try:
+                    chunk = Chunk.model_validate_json(line)
+                except Exception as e:
+                    print(f"Warning: Failed to parse chunk line: {e}")
+                    continue
+                chunks[chunk.chunk_id] = chunk
     return chunks
 
 
@@ -75,11 +117,99 @@ def get_chunk_by_id(chunk_id: str, chunks_path: Path) -> Optional[Chunk]:
     Returns:
         Chunk object if found, None otherwise
     """
-    chunks = load_chunks_jsonl(chunks_path)
-    for chunk in chunks:
-        if chunk.chunk_id == chunk_id:
-            return chunk
-    return None
+    return get_chunks_by_ids([chunk_id], chunks_path).get(chunk_id)
+
+
+def get_offsets_path(chunks_path: Path) -> Path:
+    """Path of the chunk_id → byte offset index kept next to a chunks JSONL file."""
+    return chunks_path.with_name(chunks_path.stem + ".offsets.json")
+
+
+def build_chunk_offset_index(chunks_path: Path, offsets_path: Path) -> Dict[str, list]:
+    """
+    Scan a chunks JSONL file once and record where each chunk's line lives.
+    
+    The saved index carries the JSONL size and mtime so a rewritten or
+    appended chunks file is detected and the index rebuilt.
+    
+    Args:
+        chunks_path: Path to JSONL file
+        offsets_path: Path to save the offsets JSON
+        
+    Returns:
+        Dictionary mapping chunk_id to [byte_offset, byte_length]
+    """
+    offsets = {}
+    with chunks_path.open('rb') as f:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            try:
+                offsets[orjson.loads(line)["chunk_id"]] = [offset, len(line)]
+            except (orjson.JSONDecodeError, KeyError) as e:
+                print(f"Warning: Failed to index chunk line at byte {offset}: {e}")
+    
+    stat = chunks_path.stat()
+    offsets_path.parent.mkdir(parents=True, exist_ok=True)
+    offsets_path.write_text(json.dumps({
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "offsets": offsets,
+    }))
+    return offsets
+
+
+def load_chunk_offsets(chunks_path: Path) -> Dict[str, list]:
+    """Load the offset index for chunks_path, rebuilding it if missing or stale."""
+    offsets_path = get_offsets_path(chunks_path)
+    stat = chunks_path.stat()
+    if offsets_path.exists():
+        try:
+            data = json.loads(offsets_path.read_text())
+            if data["size"] == stat.st_size and data["mtime_ns"] == stat.st_mtime_ns:
+                return data["offsets"]
+        except (ValueError, KeyError):
+            pass
+    return build_chunk_offset_index(chunks_path, offsets_path)
+
+
+def get_chunks_by_ids(
+    chunk_ids: Iterable[str],
+    chunks_path: Path,
+    raw: bool = False
+) -> Dict[str, Union[Chunk, dict]]:
+    """
+    Fetch specific chunks without parsing the whole JSONL file.
+    
+    Seeks straight to each requested line via the offset index, so a
+    top-k lookup costs O(k) parses instead of O(N).
+    
+    Args:
+        chunk_ids: Chunk IDs to fetch
+        chunks_path: Path to JSONL file
+        raw: Return plain dicts (orjson, no validation) instead of Chunk models
+        
+    Returns:
+        Dictionary mapping chunk_id to Chunk (or dict) for the IDs that were found
+    """
+    if not chunks_path.exists() or chunks_path.stat().st_size == 0:
+        return {}
+    
+    offsets = load_chunk_offsets(chunks_path)
+    found = {}
+    with chunks_path.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for chunk_id in chunk_ids:
+            entry = offsets.get(chunk_id)
+            if entry is None or chunk_id in found:
+                continue
+            offset, length = entry
+            line = mm[offset:offset + length]
+            found[chunk_id] = orjson.loads(line) if raw else Chunk.model_validate_json(line)
+    return found
 
 
 def build_chunk_index(chunks_path: Path, index_path: Path) -> None:
@@ -90,7 +220,7 @@ def build_chunk_index(chunks_path: Path, index_path: Path) -> None:
         chunks_path: Path to JSONL file
         index_path: Path to save index JSON
     """
-    chunks = load_chunks_jsonl(chunks_path)
+    chunks = iter_chunks_jsonl(chunks_path)
     
     # Create index: chunk_id -> {file_id, page_start, page_end, section_type, chapter_number}
     index = {}
@@ -120,5 +250,4 @@ def get_chunks_by_file_id(file_id: str, chunks_path: Path) -> list[Chunk]:
     Returns:
         List of chunks for that file
     """
-    chunks = load_chunks_jsonl(chunks_path)
-    return [chunk for chunk in chunks if chunk.file_id == file_id]
+    return [chunk for chunk in iter_chunks_jsonl(chunks_path) if chunk.file_id == file_id]
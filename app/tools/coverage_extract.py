@@ -4,13 +4,24 @@ import os
 from datetime import datetime, timezone
 from typing import Optional
 
-from google import genai
 from google.genai import types
 from pydantic import ValidationError
 
 from app.models.coverage import ExamCoverage
+from app.tools.llm_utils import get_client
+from app.tools.tool_cache import cached_tool
 
 
+COVERAGE_MODEL = "gemini-2.5-flash"
+
+
+@cached_tool(
+    "extract_coverage",
+    model=COVERAGE_MODEL,
+    encode=lambda result: result[0].model_dump(mode="json"),
+    decode=lambda data: (ExamCoverage(**data), None),
+    should_cache=lambda result: result[0] is not None
+)
 def extract_coverage(
     full_text: str,
     filename: str,
@@ -22,7 +33,7 @@ def extract_coverage(
     if not api_key:
         return None, "GOOGLE_API_KEY not found"
     
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
     
     text_to_analyze = full_text[:max_chars]
     if len(full_text) > max_chars:
@@ -53,7 +64,7 @@ Document text:
     
     try:
         response = client.models.generate_content(
-            model="gemini-2.5-flash",
+            model=COVERAGE_MODEL,
             contents=prompt,
             config=types.GenerateContentConfig(
                 temperature=0.1,
@@ -1,18 +1,24 @@
 """Orchestrator for document classification with manifest integration (Phase 3)."""
 from pathlib import Path
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from app.models.manifest import Manifest
 from app.models.extracted_text import ExtractedText
 from app.tools.manifest_io import load_manifest, save_manifest
 from app.tools.text_extraction import load_extracted_text
-from app.tools.doc_classify import classify_document
+from app.tools.doc_classify import classify_batch
+
+
+BATCH_SIZE = 8  # Documents per LLM call
+MAX_WORKERS = 4  # Concurrent batch calls
 
 
 def classify_all_processed(
     manifest_path: Path,
     extracted_text_dir: Path,
-    progress_callback: Optional[callable] = None
+    progress_callback: Optional[callable] = None,
+    max_workers: int = MAX_WORKERS
 ) -> dict:
     """
     Classify all documents that have been processed (extracted).
@@ -25,7 +31,10 @@ def classify_all_processed(
     Args:
         manifest_path: Path to manifest.json
         extracted_text_dir: Directory with extracted text files
-        progress_callback: Optional callback(file_entry) for progress reporting
+        progress_callback: Optional callback(file_entry), called as each document finishes.
+            Always invoked on the calling thread (never from batch workers), so a
+            plain tqdm bar needs no cross-thread locking.
+        max_workers: Batch LLM calls in flight at once
     
     Returns:
         dict with stats: {"classified": int, "skipped": int, "failed": int}
@@ -38,7 +47,8 @@ def classify_all_processed(
     # Track stats
     stats = {"classified": 0, "skipped": 0, "failed": 0}
     
-    # Process each file that has been extracted
+    # Collect files that still need classification
+    pending = []
     for file_entry in manifest.files:
         if file_entry.status != "processed":
             stats["skipped"] += 1
@@ -49,34 +59,52 @@ def classify_all_processed(
             stats["skipped"] += 1
             continue
         
-        # Report progress
-        if progress_callback:
-            progress_callback(file_entry)
-        
         # Load extracted text
         extracted = load_extracted_text(file_entry.file_id, extracted_text_dir)
         if extracted is None:
             stats["failed"] += 1
+            if progress_callback:
+                progress_callback(file_entry)
             continue
         
-        # Classify using LLM
-        try:
-            result = classify_document(
-                first_page=extracted.first_page,
-                filename=file_entry.filename,
-                full_text_sample=extracted.full_text[:2000] if len(extracted.full_text) > 2000 else ""
-            )
-            
-            # Update manifest entry
-            file_entry.doc_type = result["doc_type"]
-            file_entry.doc_confidence = result["confidence"]
-            file_entry.doc_reasoning = result["reasoning"]
-            
-            stats["classified"] += 1
+        pending.append((file_entry, {
+            "first_page": extracted.first_page,
+            "filename": file_entry.filename,
+            "full_text_sample": extracted.full_text[:2000] if len(extracted.full_text) > 2000 else ""
+        }))
+    
+    # Classify in batches, several batches in flight at once
+    batches = [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
+    
+    if batches:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(classify_batch, [doc for _, doc in batch]): batch
+                for batch in batches
+            }
             
-        except Exception as e:
-            stats["failed"] += 1
-            file_entry.doc_reasoning = f"Classification error: {str(e)}"
+            # Results are applied (and progress reported) here on the calling thread
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    results = [e] * len(batch)
+                
+                for (file_entry, _), result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        stats["failed"] += 1
+                        file_entry.doc_reasoning = f"Classification error: {str(result)}"
+                    else:
+                        # Update manifest entry
+                        file_entry.doc_type = result["doc_type"]
+                        file_entry.doc_confidence = result["confidence"]
+                        file_entry.doc_reasoning = result["reasoning"]
+                        stats["classified"] += 1
+                    
+                    # Report progress
+                    if progress_callback:
+                        progress_callback(file_entry)
     
     # Save updated manifest
     save_manifest(manifest, manifest_path)
@@ -1,10 +1,18 @@
 """Document classification using LLM (Phase 3)."""
 import json
 import os
+from datetime import datetime, timezone
 from typing import Optional
 
-from google import genai
 from google.genai import types
+from pydantic import ValidationError
+
+from app.models.coverage import ExamCoverage
+from app.tools.llm_utils import get_client
+from app.tools.tool_cache import cached_tool
+
+
+CLASSIFY_MODEL = "gemini-2.5-flash"  # Latest, fastest, cheapest model
 
 
 def classify_document(
@@ -32,17 +40,8 @@ def classify_document(
         # Fallback to heuristic classification if no API key
         return _fallback_classify(first_page, filename)
     
-    client = genai.Client(api_key=api_key)
-    
     # Prepare context for classification
-    context = f"""Filename: {filename}
-
-First page:
-{first_page[:2000]}
-"""
-    
-    if full_text_sample:
-        context += f"\n\nAdditional sample:\n{full_text_sample[:1000]}"
+    context = _build_context(first_page, filename, full_text_sample)
     
     # Prompt for classification
     prompt = f"""You are a document classifier for educational materials.
@@ -68,25 +67,7 @@ Respond in JSON format:
 }}"""
     
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",  # Latest, fastest, cheapest model
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                temperature=0.1,  # Low temperature for consistent classification
-                response_mime_type="application/json"
-            )
-        )
-        result = json.loads(response.text)
-        
-        # Validate response
-        valid_types = {"syllabus", "exam_overview", "textbook", "other"}
-        if result.get("doc_type") not in valid_types:
-            result["doc_type"] = "other"
-        
-        if not 0.0 <= result.get("confidence", 0) <= 1.0:
-            result["confidence"] = 0.5
-        
-        return result
+        return _classify_with_llm(prompt)
         
     except Exception as e:
         # Fallback on error
@@ -97,6 +78,241 @@ Respond in JSON format:
         }
 
 
+@cached_tool("classify_document", model=CLASSIFY_MODEL)
+def _classify_with_llm(prompt: str) -> dict:
+    """Run the classification prompt. Raises on failure (so errors aren't cached)."""
+    client = get_client(os.getenv("GOOGLE_API_KEY"))
+    
+    response = client.models.generate_content(
+        model=CLASSIFY_MODEL,
+        contents=prompt,
+        config=types.GenerateContentConfig(
+            temperature=0.1,  # Low temperature for consistent classification
+            response_mime_type="application/json"
+        )
+    )
+    return _validate_result(json.loads(response.text))
+
+
+def classify_and_extract_coverage(
+    first_page: str,
+    filename: str,
+    full_text: str,
+    file_id: str,
+    max_chars: int = 8000
+) -> tuple[dict, Optional[ExamCoverage], Optional[str]]:
+    """
+    Classify a document and, if it is an exam overview, extract its coverage
+    in the same Gemini call (one round-trip instead of two).
+    
+    Args:
+        first_page: Text from first page of document
+        filename: Original filename (can provide hints)
+        full_text: Full extracted text (truncated to max_chars)
+        file_id: File ID recorded as the coverage source
+        max_chars: Max characters of full text sent to the model
+    
+    Returns:
+        Tuple of (classification dict, coverage or None, coverage error or None).
+        Coverage is None for non-exam documents or if it failed to validate.
+    """
+    if not os.getenv("GOOGLE_API_KEY"):
+        return _fallback_classify(first_page, filename), None, "GOOGLE_API_KEY not found"
+    
+    text_to_analyze = full_text[:max_chars]
+    if len(full_text) > max_chars:
+        text_to_analyze += "\n[...truncated...]"
+    
+    prompt = f"""You are a document classifier for educational materials.
+
+Step 1 - Classify this document into ONE of these categories:
+1. **syllabus** - Course syllabus with grading, schedule, policies
+2. **exam_overview** - Exam preparation document listing topics/chapters covered
+3. **textbook** - Educational textbook with chapters and sections
+4. **other** - Anything else (notes, assignments, etc.)
+
+Step 2 - ONLY if doc_type is "exam_overview", extract the exam coverage.
+- If the filename contains a course code (e.g., "HLTH 204", "SYSD 300", "PHYS 234"), include it in the exam_name
+- Format exam_name as: "COURSE CODE - Exam Name" (e.g., "HLTH 204 - Midterm Examination 1")
+- If no course code in filename, use the exam name from the document
+For any other doc_type, set "coverage" to null.
+
+Source filename: {filename}
+
+Respond in JSON format:
+{{
+  "doc_type": "syllabus|exam_overview|textbook|other",
+  "confidence": 0.95,
+  "reasoning": "Brief explanation...",
+  "coverage": {{
+    "exam_id": "midterm_1",
+    "exam_name": "COURSE CODE - Midterm Examination 1",
+    "exam_date": "February 27, 2026",
+    "chapters": [1, 2, 3],
+    "topics": [
+      {{"chapter": 1, "chapter_title": "Title", "bullets": ["topic1", "topic2"]}}
+    ]
+  }}
+}}
+
+Document text:
+{text_to_analyze}"""
+    
+    try:
+        data = _classify_and_extract_with_llm(prompt)
+    except Exception as e:
+        return {
+            "doc_type": "other",
+            "confidence": 0.3,
+            "reasoning": f"Classification failed: {str(e)}"
+        }, None, f"Extraction failed: {str(e)}"
+    
+    coverage_data = data.pop("coverage", None)
+    classification = _validate_result(data)
+    
+    if classification["doc_type"] != "exam_overview":
+        return classification, None, None
+    if not coverage_data:
+        return classification, None, "Model returned no coverage"
+    
+    try:
+        coverage = ExamCoverage(
+            **coverage_data,
+            source_file_id=file_id,
+            generated_at=datetime.now(timezone.utc).isoformat()
+        )
+    except (ValidationError, TypeError) as e:
+        return classification, None, f"Validation failed: {e}"
+    
+    return classification, coverage, None
+
+
+@cached_tool("classify_and_extract", model=CLASSIFY_MODEL)
+def _classify_and_extract_with_llm(prompt: str) -> dict:
+    """Run the fused classify + coverage prompt. Raises on failure."""
+    client = get_client(os.getenv("GOOGLE_API_KEY"))
+    
+    response = client.models.generate_content(
+        model=CLASSIFY_MODEL,
+        contents=prompt,
+        config=types.GenerateContentConfig(
+            temperature=0.1,
+            response_mime_type="application/json"
+        )
+    )
+    data = json.loads(response.text)
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object, got {type(data).__name__}")
+    return data
+
+
+def classify_batch(docs: list[dict]) -> list[dict]:
+    """
+    Classify several documents with a single Gemini call.
+    
+    Args:
+        docs: List of dicts with first_page, filename and optional full_text_sample
+    
+    Returns:
+        List of classification dicts (same shape as classify_document), in input order.
+        Falls back to one call per document if the batch response can't be parsed.
+    """
+    if not docs:
+        return []
+    
+    if not os.getenv("GOOGLE_API_KEY"):
+        return [_fallback_classify(d["first_page"], d["filename"]) for d in docs]
+    
+    if len(docs) == 1:
+        return [classify_document(**docs[0])]
+    
+    sections = []
+    for i, doc in enumerate(docs, start=1):
+        context = _build_context(doc["first_page"], doc["filename"], doc.get("full_text_sample", ""))
+        sections.append(f"### Document {i}\n{context}")
+    documents_text = "\n\n".join(sections)
+    
+    prompt = f"""You are a document classifier for educational materials.
+
+Classify EACH of the {len(docs)} documents below into ONE of these categories:
+1. **syllabus** - Course syllabus with grading, schedule, policies
+2. **exam_overview** - Exam preparation document listing topics/chapters covered
+3. **textbook** - Educational textbook with chapters and sections
+4. **other** - Anything else (notes, assignments, etc.)
+
+For every document provide the category, a confidence score (0.0 to 1.0) and brief reasoning.
+
+{documents_text}
+
+Respond with a JSON array containing exactly {len(docs)} objects, one per document, in order:
+[
+  {{"index": 1, "doc_type": "syllabus|exam_overview|textbook|other", "confidence": 0.95, "reasoning": "Brief explanation..."}}
+]"""
+    
+    try:
+        return _classify_batch_with_llm(prompt, len(docs))
+    except Exception:
+        # Batch response unusable - classify individually
+        return [classify_document(**doc) for doc in docs]
+
+
+@cached_tool("classify_batch", model=CLASSIFY_MODEL)
+def _classify_batch_with_llm(prompt: str, expected: int) -> list[dict]:
+    """Run a batch classification prompt. Raises if the response doesn't match the batch."""
+    client = get_client(os.getenv("GOOGLE_API_KEY"))
+    
+    response = client.models.generate_content(
+        model=CLASSIFY_MODEL,
+        contents=prompt,
+        config=types.GenerateContentConfig(
+            temperature=0.1,
+            response_mime_type="application/json"
+        )
+    )
+    items = json.loads(response.text)
+    if not isinstance(items, list) or len(items) != expected:
+        raise ValueError(f"Expected {expected} classifications, got {type(items).__name__}")
+    
+    # Honor explicit indices if the model reordered its answers
+    if all(isinstance(item, dict) and isinstance(item.get("index"), int) for item in items):
+        items = sorted(items, key=lambda item: item["index"])
+    
+    results = []
+    for item in items:
+        item = dict(item)
+        item.pop("index", None)
+        results.append(_validate_result(item))
+    return results
+
+
+def _build_context(first_page: str, filename: str, full_text_sample: str = "") -> str:
+    """Format the document excerpt shown to the classifier."""
+    context = f"""Filename: {filename}
+
+First page:
+{first_page[:2000]}
+"""
+    
+    if full_text_sample:
+        context += f"\n\nAdditional sample:\n{full_text_sample[:1000]}"
+    
+    return context
+
+
+def _validate_result(result: dict) -> dict:
+    """Clamp an LLM classification to valid doc types and confidence range."""
+    valid_types = {"syllabus", "exam_overview", "textbook", "other"}
+    if result.get("doc_type") not in valid_types:
+        result["doc_type"] = "other"
+    
+    if "confidence" not in result or not 0.0 <= result["confidence"] <= 1.0:
+        result["confidence"] = 0.5
+    
+    result.setdefault("reasoning", "")
+    
+    return result
+
+
 def _fallback_classify(first_page: str, filename: str) -> dict:
     """Fallback heuristic classification when LLM unavailable."""
     first_page_lower = first_page.lower()
@@ -1,20 +1,73 @@
 """Embedding utilities using modern google-genai SDK."""
 import os
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List
 import numpy as np
-from google import genai
 from google.genai import types
 
+from app.tools.llm_utils import get_client
+
 
 def get_genai_client():
-    """Get authenticated Google GenAI client."""
+    """
+    Get authenticated Google GenAI client.
+    
+    The client is reused per API key so repeated embed calls share one
+    HTTP connection pool instead of paying client setup + TLS each time.
+    """
     api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise ValueError("GOOGLE_API_KEY or GEMINI_API_KEY not found in environment")
     
-    client = genai.Client(api_key=api_key)
-    return client
+    return get_client(api_key)
+
+
+def _embed_batch(
+    client,
+    batch: List[str],
+    model: str,
+    task_type: str,
+    max_retries: int
+) -> list:
+    """
+    Embed a single batch, retrying with exponential backoff on rate limits.
+    
+    Returns:
+        List of embedding vectors (one per text in batch)
+    """
+    for attempt in range(max_retries):
+        try:
+            # Create embedding config (without model - that goes in embed_content)
+            config = types.EmbedContentConfig(
+                task_type=task_type
+            )
+            
+            # Embed the batch
+            response = client.models.embed_content(
+                model=model,
+                contents=batch,
+                config=config
+            )
+            
+            # Extract embeddings
+            return [emb.values for emb in response.embeddings]
+            
+        except Exception as e:
+            if "429" in str(e) or "quota" in str(e).lower():
+                # Rate limit - wait and retry. Jitter keeps concurrent
+                # batches from retrying in lockstep.
+                wait_time = 2 ** attempt + random.uniform(0, 1)  # Exponential backoff
+                print(f"    ⚠ Rate limit hit, waiting {wait_time:.1f}s (attempt {attempt + 1}/{max_retries})...", flush=True)
+                time.sleep(wait_time)
+                
+                if attempt == max_retries - 1:
+                    raise Exception(f"Failed after {max_retries} retries: {e}")
+            else:
+                # Other error - raise immediately
+                raise Exception(f"Embedding error: {e}")
 
 
 def embed_texts(
@@ -22,7 +75,8 @@ def embed_texts(
     model: str = "gemini-embedding-001",
     task_type: str = "RETRIEVAL_DOCUMENT",
     batch_size: int = 100,
-    max_retries: int = 3
+    max_retries: int = 3,
+    max_inflight: int = 1
 ) -> np.ndarray:
     """
     Embed a list of texts using Google's embedding-001 model.
@@ -33,63 +87,48 @@ def embed_texts(
         task_type: Task type for embeddings (RETRIEVAL_DOCUMENT or RETRIEVAL_QUERY)
         batch_size: Maximum texts per batch (default 100)
         max_retries: Maximum retry attempts for rate limits
+        max_inflight: Number of batches sent concurrently (default 1 = serial)
         
     Returns:
         numpy array of shape (len(texts), embedding_dim)
     """
     client = get_genai_client()
     
-    all_embeddings = []
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    total_batches = len(batches)
     
-    # Process in batches
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i:i + batch_size]
-        batch_num = i // batch_size + 1
-        total_batches = (len(texts) + batch_size - 1) // batch_size
-        
+    def run_batch(batch_num: int, batch: List[str]) -> list:
         print(f"  Embedding batch {batch_num}/{total_batches} ({len(batch)} texts)...", flush=True)
-        
-        # Retry logic for rate limits
-        for attempt in range(max_retries):
-            try:
-                # Create embedding config (without model - that goes in embed_content)
-                config = types.EmbedContentConfig(
-                    task_type=task_type
-                )
-                
-                # Embed the batch
-                response = client.models.embed_content(
-                    model=model,
-                    contents=batch,
-                    config=config
-                )
-                
-                # Extract embeddings
-                batch_embeddings = [emb.values for emb in response.embeddings]
-                all_embeddings.extend(batch_embeddings)
-                
-                # Success - break retry loop
-                break
-                
-            except Exception as e:
-                if "429" in str(e) or "quota" in str(e).lower():
-                    # Rate limit - wait and retry
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    print(f"    ⚠ Rate limit hit, waiting {wait_time}s (attempt {attempt + 1}/{max_retries})...", flush=True)
-                    time.sleep(wait_time)
-                    
-                    if attempt == max_retries - 1:
-                        raise Exception(f"Failed after {max_retries} retries: {e}")
-                else:
-                    # Other error - raise immediately
-                    raise Exception(f"Embedding error: {e}")
-        
-        # Small delay between batches to avoid rate limits
-        if i + batch_size < len(texts):
-            time.sleep(0.1)
+        return _embed_batch(client, batch, model, task_type, max_retries)
     
-    # Convert to numpy array
-    embeddings_array = np.array(all_embeddings, dtype=np.float32)
+    # Filled batch by batch once the first response reveals the dimension,
+    # instead of accumulating Python float lists and copying at the end
+    embeddings_array = None
+    
+    def store(batch_num: int, batch_embeddings: list) -> None:
+        nonlocal embeddings_array
+        if embeddings_array is None:
+            dim = len(batch_embeddings[0]) if batch_embeddings else 0
+            embeddings_array = np.empty((len(texts), dim), dtype=np.float32)
+        start = (batch_num - 1) * batch_size
+        embeddings_array[start:start + len(batch_embeddings)] = batch_embeddings
+    
+    if max_inflight > 1 and total_batches > 1:
+        # Network-bound: keep several batches in flight. map() preserves
+        # submission order so rows stay aligned with `texts`.
+        with ThreadPoolExecutor(max_workers=max_inflight) as executor:
+            for batch_num, batch_embeddings in enumerate(executor.map(run_batch, range(1, total_batches + 1), batches), 1):
+                store(batch_num, batch_embeddings)
+    else:
+        for batch_num, batch in enumerate(batches, 1):
+            store(batch_num, run_batch(batch_num, batch))
+            
+            # Small delay between batches to avoid rate limits
+            if batch_num < total_batches:
+                time.sleep(0.1)
+    
+    if embeddings_array is None:
+        embeddings_array = np.array([], dtype=np.float32)
     print(f"  ✓ Embedded {len(texts)} texts, shape: {embeddings_array.shape}", flush=True)
     
     return embeddings_array
@@ -102,6 +141,10 @@ def embed_query(
     """
     Embed a single query text for retrieval.
     
+    Repeated queries (e.g. the tutor re-asking the same question) are served
+    from an in-process LRU cache keyed on (query, model). Whitespace is
+    collapsed first so trivially different phrasings share an entry.
+    
     Args:
         query: Query text to embed
         model: Model name (default: models/embedding-001)
@@ -109,6 +152,12 @@ def embed_query(
     Returns:
         numpy array of shape (embedding_dim,)
     """
+    # Copy so callers can't mutate the cached vector (e.g. in-place normalize)
+    return _embed_query_cached(" ".join(query.split()), model).copy()
+
+
+@lru_cache(maxsize=2048)
+def _embed_query_cached(query: str, model: str) -> np.ndarray:
     client = get_genai_client()
     
     config = types.EmbedContentConfig(
@@ -1,5 +1,8 @@
 """Simple file-based embedding cache to avoid redundant API calls."""
 from pathlib import Path
+from itertools import islice
+from typing import Callable, Iterable, Optional
+import json
 import numpy as np
 import hashlib
 
@@ -97,11 +100,148 @@ def save_embedding_to_cache(
     meta_path.write_text(text_hash)
 
 
+class EmbeddingCacheShard:
+    """
+    Single-file embedding cache: one float32 matrix plus a JSON row index.
+    
+    Replaces one .npy/.meta pair per chunk with:
+    - embeddings.bin: raw float32 rows, appended in place
+    - embeddings_index.json: {"dim": D, "rows": {chunk_id: [row, text_hash]}}
+    
+    Rows are read through np.memmap, so a rebuild does one mmap instead of
+    one open() per chunk. Rows for re-embedded chunks are appended and the
+    index repointed; the old row is left orphaned until the cache is reset.
+    """
+    
+    MATRIX_FILE = "embeddings.bin"
+    INDEX_FILE = "embeddings_index.json"
+    
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.matrix_path = cache_dir / self.MATRIX_FILE
+        self.index_path = cache_dir / self.INDEX_FILE
+        self.dim: int | None = None
+        self.rows: dict[str, list] = {}
+        self._matrix = None
+        self._pending: list[np.ndarray] = []
+        self._index_dirty = False
+        
+        if self.index_path.exists():
+            data = json.loads(self.index_path.read_text())
+            self.dim = data.get("dim")
+            self.rows = data.get("rows", {})
+        
+        # Rows persisted in the matrix file (including orphaned ones); stat once
+        # here and advance in flush() so lookups never touch the filesystem
+        self.num_rows = 0
+        if self.dim is not None and self.matrix_path.exists():
+            self.num_rows = self.matrix_path.stat().st_size // (self.dim * 4)
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    @property
+    def matrix(self) -> np.ndarray | None:
+        """Memory-mapped (num_rows, dim) view of the persisted embeddings."""
+        if self._matrix is None:
+            n = self.num_rows
+            if n == 0:
+                return None
+            self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r", shape=(n, self.dim))
+        return self._matrix
+    
+    def get_row(self, chunk_id: str, text: str) -> int | None:
+        """Return the matrix row for chunk_id if cached and the text is unchanged."""
+        entry = self.rows.get(chunk_id)
+        if entry is None:
+            return None
+        row, text_hash = entry
+        # Migrated legacy entries may lack a hash - assume valid (backward compat)
+        if text_hash is not None and text_hash != get_text_hash(text):
+            return None
+        if row >= self.num_rows:
+            return None
+        return row
+    
+    def get(self, chunk_id: str, text: str) -> np.ndarray | None:
+        """Return the cached embedding if present and the text is unchanged."""
+        row = self.get_row(chunk_id, text)
+        if row is None:
+            return None
+        return np.asarray(self.matrix[row])
+    
+    def put(self, chunk_id: str, text: str | None, embedding: np.ndarray) -> int:
+        """Stage an embedding and return its future row; call flush() to persist."""
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        if self.dim is None:
+            self.dim = int(embedding.shape[0])
+        elif embedding.shape[0] != self.dim:
+            raise ValueError(f"Embedding dim {embedding.shape[0]} does not match cache dim {self.dim}")
+        
+        row = self.num_rows + len(self._pending)
+        self._pending.append(embedding)
+        self.rows[chunk_id] = [row, get_text_hash(text) if text is not None else None]
+        return row
+    
+    def flush_rows(self) -> None:
+        """Append staged rows to the matrix file; the index is written by flush()."""
+        if not self._pending:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        with self.matrix_path.open("ab") as f:
+            f.write(np.stack(self._pending).astype(np.float32, copy=False).tobytes())
+        self.num_rows += len(self._pending)
+        self._pending = []
+        self._matrix = None  # Re-map on next access to pick up new rows
+        self._index_dirty = True
+    
+    def flush(self) -> None:
+        """Append staged rows to the matrix file and rewrite the index atomically."""
+        self.flush_rows()
+        if not self._index_dirty:
+            return
+        
+        temp_path = self.index_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps({"dim": self.dim, "rows": self.rows}))
+        temp_path.replace(self.index_path)
+        self._index_dirty = False
+
+
+def migrate_legacy_cache(cache_dir: Path, shard: EmbeddingCacheShard) -> int:
+    """
+    One-shot import of legacy per-chunk .npy/.meta files into a shard.
+    
+    Legacy files are left in place; the shard takes precedence afterwards.
+    
+    Returns:
+        Number of embeddings migrated
+    """
+    migrated = 0
+    for npy_path in sorted(cache_dir.glob("*.npy")):
+        chunk_id = npy_path.stem
+        if chunk_id in shard.rows:
+            continue
+        try:
+            embedding = np.load(npy_path)
+        except Exception as e:
+            print(f"Warning: Failed to migrate cached embedding for {chunk_id}: {e}")
+            continue
+        shard.put(chunk_id, None, embedding)
+        meta_path = npy_path.with_suffix('.meta')
+        if meta_path.exists():
+            shard.rows[chunk_id][1] = meta_path.read_text().strip()
+        migrated += 1
+    shard.flush()
+    return migrated
+
+
 def get_or_compute_embeddings(
     chunks: list,
     cache_dir: Path,
     embed_function: callable,
-    show_progress: bool = True
+    show_progress: bool = True,
+    cache_backend: EmbeddingCacheShard | None = None
 ) -> tuple[np.ndarray, dict]:
     """
     Get embeddings from cache or compute them.
@@ -111,70 +251,101 @@ def get_or_compute_embeddings(
         cache_dir: Directory for embedding cache
         embed_function: Function to compute embeddings for a list of texts
         show_progress: Whether to show progress messages
+        cache_backend: Shard to read/write (default: EmbeddingCacheShard(cache_dir))
         
     Returns:
         Tuple of (embeddings array, stats dict)
     """
-    embeddings_list = []
-    texts_to_embed = []
-    indices_to_embed = []
-    
-    stats = {
-        "total": len(chunks),
-        "cached": 0,
-        "computed": 0
-    }
+    shard = cache_backend if cache_backend is not None else EmbeddingCacheShard(cache_dir)
     
     if show_progress:
         print(f"  Checking cache for {len(chunks)} chunks...", flush=True)
     
-    # Check cache for each chunk
-    for idx, chunk in enumerate(chunks):
-        cached_embedding, is_valid = load_cached_embedding(
-            chunk.chunk_id,
-            chunk.text,
-            cache_dir
-        )
-        
-        if is_valid and cached_embedding is not None:
-            # Use cached embedding
-            embeddings_list.append(cached_embedding)
-            stats["cached"] += 1
-        else:
-            # Need to compute
-            embeddings_list.append(None)  # Placeholder
-            texts_to_embed.append(chunk.text)
-            indices_to_embed.append(idx)
+    rows, stats = get_or_compute_embedding_rows(
+        chunks,
+        cache_dir,
+        embed_function,
+        block_size=max(1, len(chunks)),
+        show_progress=show_progress,
+        cache_backend=shard
+    )
     
-    if show_progress:
-        print(f"  ✓ Found {stats['cached']} cached embeddings, computing {len(texts_to_embed)} new ones", flush=True)
+    if not len(rows):
+        return np.zeros((0, shard.dim or 0), dtype=np.float32), stats
     
-    # Compute missing embeddings
-    if texts_to_embed:
-        if show_progress:
-            print(f"  Computing {len(texts_to_embed)} embeddings...", flush=True)
-        
-        new_embeddings = embed_function(texts_to_embed)
-        stats["computed"] = len(texts_to_embed)
+    # A single fancy-index gather already yields a fresh float32 array
+    return shard.matrix[rows], stats
+
+
+def get_or_compute_embedding_rows(
+    chunks: Iterable,
+    cache_dir: Path,
+    embed_function: callable,
+    block_size: int = 1000,
+    show_progress: bool = True,
+    cache_backend: EmbeddingCacheShard | None = None,
+    on_block: Optional[Callable[[list], None]] = None
+) -> tuple[np.ndarray, dict]:
+    """
+    Streaming variant of get_or_compute_embeddings.
+    
+    Consumes chunks block by block (e.g. from iter_chunks_jsonl), embeds the
+    uncached ones and appends them to the shard matrix before reading the next
+    block, so memory stays O(block_size) instead of O(num_chunks). The JSON
+    row index is written once at the end.
+    
+    Args:
+        chunks: Iterable of Chunk objects
+        cache_dir: Directory for embedding cache
+        embed_function: Function to compute embeddings for a list of texts
+        block_size: Chunks held in memory at once
+        show_progress: Whether to show progress messages
+        cache_backend: Shard to read/write (default: EmbeddingCacheShard(cache_dir))
+        on_block: Optional callback(block) run after each block is embedded
         
-        # Insert computed embeddings and save to cache
-        for i, idx in enumerate(indices_to_embed):
-            embedding = new_embeddings[i]
-            embeddings_list[idx] = embedding
-            
-            # Save to cache
-            chunk = chunks[idx]
-            save_embedding_to_cache(
-                chunk.chunk_id,
-                chunk.text,
-                embedding,
-                cache_dir
-            )
-    
-    # Convert to numpy array
-    embeddings_array = np.array(embeddings_list, dtype=np.float32)
+    Returns:
+        Tuple of (shard row per chunk in input order, stats dict).
+        Embeddings are shard.matrix[rows].
+    """
+    shard = cache_backend if cache_backend is not None else EmbeddingCacheShard(cache_dir)
     
-    if show_progress:
-        print(f"  ✓ Total: {stats['cached']} cached + {stats['computed']} computed = {stats['total']} embeddings", flush=True)
+    # Import any legacy per-chunk files the first time the shard is used
+    if len(shard) == 0 and cache_dir.exists() and any(cache_dir.glob("*.npy")):
+        migrated = migrate_legacy_cache(cache_dir, shard)
+        if show_progress:
+            print(f"  ✓ Migrated {migrated} legacy cache files into {shard.matrix_path.name}", flush=True)
+    
+    rows = []
+    stats = {"total": 0, "cached": 0, "computed": 0}
+    
+    chunk_iter = iter(chunks)
+    try:
+        while True:
+            block = list(islice(chunk_iter, block_size))
+            if not block:
+                break
+            
+            block_rows = [shard.get_row(chunk.chunk_id, chunk.text) for chunk in block]
+            missing = [i for i, row in enumerate(block_rows) if row is None]
+            
+            if missing:
+                new_embeddings = embed_function([block[i].text for i in missing])
+                for i, embedding in zip(missing, new_embeddings):
+                    block_rows[i] = shard.put(block[i].chunk_id, block[i].text, embedding)
+                shard.flush_rows()
+            
+            rows.extend(block_rows)
+            stats["total"] += len(block)
+            stats["cached"] += len(block) - len(missing)
+            stats["computed"] += len(missing)
+            
+            if on_block:
+                on_block(block)
+            
+            if show_progress:
+                print(f"  ✓ {stats['total']} chunks ({stats['cached']} cached, {stats['computed']} computed)", flush=True)
+    finally:
+        # Rewrite the row index once, also keeping rows embedded before a failure
+        shard.flush()
     
-    return embeddings_array, stats
+    return np.array(rows, dtype=np.int64), stats
@@ -1,131 +1,621 @@
 """FAISS index building and search with chapter-aware filtering."""
 from pathlib import Path
 import json
+import math
 import numpy as np
 import faiss
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Sequence, Union
 
 from app.models.chunks import Chunk
-from app.tools.chunk_store import load_chunks_jsonl
+from app.tools.chunk_store import get_chunks_by_ids
 
 
-def normalize_vectors(vectors: np.ndarray) -> np.ndarray:
+def normalize_vectors(vectors: np.ndarray, inplace: bool = False) -> np.ndarray:
     """
     Normalize vectors to unit length for cosine similarity.
     
     Args:
         vectors: Array of shape (n, dim)
+        inplace: Normalize `vectors` itself instead of allocating a copy
+            (requires a writable float array; mutates the caller's data)
         
     Returns:
         Normalized vectors
     """
-    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    if inplace and vectors.dtype == np.float32 and vectors.flags.c_contiguous:
+        # One SIMD pass in C++; zero rows are left as zeros
+        faiss.normalize_L2(vectors)
+        return vectors
+    
+    # Row norms via einsum: no (n, dim) temporary for the squares
+    norms = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))[:, np.newaxis]
     # Avoid division by zero
-    norms = np.where(norms == 0, 1, norms)
+    norms[norms == 0] = 1
+    if inplace:
+        return np.divide(vectors, norms, out=vectors)
     return vectors / norms
 
 
+def set_search_threads(num_threads: int) -> None:
+    """
+    Set FAISS's OpenMP thread count for the whole process.
+    
+    The setting is process-global, so call it once at startup (see app/agent.py)
+    rather than around individual searches, which may run concurrently.
+    """
+    faiss.omp_set_num_threads(num_threads)
+
+
+_GPU_RESOURCES = None  # One StandardGpuResources per process
+
+
+def gpu_available() -> bool:
+    """True if this FAISS build has GPU support and a CUDA device is visible."""
+    return hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0
+
+
+def to_device(index: faiss.Index, device: str = "cpu") -> faiss.Index:
+    """
+    Return index on the requested device ("cpu" or "gpu").
+    
+    Falls back to the CPU index (with a warning) when faiss-gpu/CUDA is missing
+    or the index type has no GPU implementation (e.g. HNSW).
+    """
+    global _GPU_RESOURCES
+    
+    if device != "gpu":
+        return index
+    if not gpu_available():
+        print("  ⚠ FAISS GPU support not available - using CPU", flush=True)
+        return index
+    
+    if _GPU_RESOURCES is None:
+        _GPU_RESOURCES = faiss.StandardGpuResources()
+    try:
+        return faiss.index_cpu_to_gpu(_GPU_RESOURCES, 0, index)
+    except RuntimeError as e:
+        print(f"  ⚠ Index type not supported on GPU ({e}) - using CPU", flush=True)
+        return index
+
+
+def get_index_meta_path(index_path: Path) -> Path:
+    """Sidecar JSON recording how the index was built (type + search params)."""
+    return index_path.with_suffix(".meta.json")
+
+
+def get_vectors_path(index_path: Path) -> Path:
+    """Raw normalized float32 matrix saved next to flat indexes for mmap loading."""
+    return index_path.with_suffix(".vectors.npy")
+
+
+def create_index(
+    embeddings: np.ndarray,
+    index_type: str = "flat",
+    quantization: str = "fp32",
+    pca_dim: Optional[int] = None
+) -> tuple[faiss.Index, dict]:
+    """
+    Create and populate an inner-product FAISS index.
+    
+    Index types:
+    - flat: exact brute-force search (IndexFlatIP)
+    - hnsw: graph-based approximate search (IndexHNSWFlat, M=32)
+    - ivfpq: inverted lists + product quantization (IndexIVFPQ, ~16x smaller)
+    - auto: flat up to AUTO_HNSW_THRESHOLD vectors, hnsw above
+    
+    Quantization (flat/hnsw only; IVF-PQ is already compressed):
+    - fp32: store full float32 vectors
+    - fp16: half-precision vectors (~2x smaller, near-lossless)
+    - sq8: 8-bit scalar quantization per dimension (~4x smaller)
+    
+    With pca_dim set, vectors are projected to pca_dim dimensions first
+    (IndexPreTransform); queries are projected automatically at search time.
+    
+    Args:
+        embeddings: Array of shape (n, dim), already normalized if needed
+        index_type: "flat", "hnsw", "ivfpq", or "auto"
+        quantization: "fp32", "fp16" or "sq8"
+        pca_dim: Optional reduced dimension (e.g. 256-512 for 3072-d Gemini vectors)
+        
+    Returns:
+        Tuple of (populated index, metadata dict for the sidecar)
+    """
+    n, dim = embeddings.shape
+    index, meta = create_empty_index(
+        n, dim, index_type, training_vectors=embeddings, quantization=quantization, pca_dim=pca_dim
+    )
+    index.add(embeddings)
+    return index, meta
+
+
+# Above this many vectors "auto" switches from exact flat search to HNSW
+AUTO_HNSW_THRESHOLD = 50_000
+
+
+def resolve_index_type(index_type: str, n: int) -> str:
+    """Map "auto" to a concrete index type for n vectors; others pass through."""
+    if index_type == "auto":
+        return "hnsw" if n > AUTO_HNSW_THRESHOLD else "flat"
+    return index_type
+
+
+# Scalar quantizer per --quantize option (fp16 needs no training)
+_SCALAR_QUANTIZERS = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "sq8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+
+def create_empty_index(
+    n: int,
+    dim: int,
+    index_type: str = "flat",
+    training_vectors: Optional[np.ndarray] = None,
+    quantization: str = "fp32",
+    pca_dim: Optional[int] = None
+) -> tuple[faiss.Index, dict]:
+    """
+    Create an empty (trained, if needed) inner-product FAISS index for n vectors.
+    
+    Args:
+        n: Number of vectors that will be added (sizes IVF lists)
+        dim: Embedding dimension
+        index_type: "flat", "hnsw", "ivfpq", or "auto" (see create_index)
+        training_vectors: Normalized sample to train IVF-PQ / SQ8 / PCA on
+        quantization: "fp32", "fp16" or "sq8" (see create_index)
+        pca_dim: Optional reduced dimension (see create_index)
+        
+    Returns:
+        Tuple of (index ready for add(), metadata dict for the sidecar)
+    """
+    index_type = resolve_index_type(index_type, n)
+    
+    if pca_dim and pca_dim < dim:
+        if training_vectors is None or len(training_vectors) < pca_dim:
+            print(f"  ⚠ Too few vectors to train PCA to {pca_dim} dims, keeping {dim}", flush=True)
+        else:
+            pca = faiss.PCAMatrix(dim, pca_dim, 0, True)
+            pca.train(training_vectors)
+            # Project without centering so inner products approximate the
+            # original cosine scores instead of mean-shifted ones
+            faiss.copy_array_to_vector(np.zeros(pca_dim, dtype=np.float32), pca.b)
+            inner, meta = create_empty_index(
+                n, pca_dim, index_type, pca.apply(training_vectors), quantization
+            )
+            meta.update({"dim": dim, "pca_dim": pca_dim})
+            return faiss.IndexPreTransform(pca, inner), meta
+    
+    if quantization != "fp32" and quantization not in _SCALAR_QUANTIZERS:
+        raise ValueError(f"Unknown quantization: {quantization}")
+    
+    meta = {"index_type": index_type, "dim": dim}
+    sq_type = _SCALAR_QUANTIZERS.get(quantization) if index_type in ("flat", "hnsw") else None
+    if sq_type is not None:
+        meta["quantization"] = quantization
+    
+    if index_type == "hnsw" and sq_type is not None:
+        index = faiss.IndexHNSWSQ(dim, sq_type, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 200
+        if not index.is_trained:
+            index.train(training_vectors)
+        meta["ef_search"] = 64
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 200
+        meta["ef_search"] = 64
+    elif index_type == "ivfpq":
+        nlist = max(1, int(4 * math.sqrt(n)))
+        m = dim // 4 if dim % 4 == 0 else dim
+        # IVF needs ~30 points per list and PQ needs >= 256 points per codebook
+        if n < max(256, 30 * nlist):
+            nlist = max(1, n // 30)
+        if n < 256:
+            print(f"  ⚠ Only {n} vectors - too few to train IVF-PQ, using flat index", flush=True)
+            return create_empty_index(n, dim, "flat", training_vectors, quantization)
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, m, 8, faiss.METRIC_INNER_PRODUCT)
+        index.train(training_vectors)
+        meta.update({"nlist": nlist, "m": m, "nprobe": max(1, nlist // 8)})
+    elif index_type == "flat" and sq_type is not None:
+        index = faiss.IndexScalarQuantizer(dim, sq_type, faiss.METRIC_INNER_PRODUCT)
+        if not index.is_trained:
+            index.train(training_vectors)
+    elif index_type == "flat":
+        # Flat IP index (inner product - equivalent to cosine with normalized vectors)
+        index = faiss.IndexFlatIP(dim)
+    else:
+        raise ValueError(f"Unknown index type: {index_type}")
+    
+    return index, meta
+
+
+def apply_search_params(index: faiss.Index, meta: dict) -> None:
+    """Set query-time parameters (efSearch / nprobe) recorded in the sidecar."""
+    if isinstance(index, faiss.IndexPreTransform):
+        index = faiss.downcast_index(index.index)
+    if "ef_search" in meta and hasattr(index, "hnsw"):
+        index.hnsw.efSearch = meta["ef_search"]
+    if "nprobe" in meta and hasattr(index, "nprobe"):
+        index.nprobe = meta["nprobe"]
+
+
 def build_faiss_index(
     embeddings: np.ndarray,
     index_path: Path,
-    normalize: bool = True
+    normalize: bool = True,
+    index_type: str = "flat",
+    quantization: str = "fp32",
+    pca_dim: Optional[int] = None
 ) -> faiss.Index:
     """
     Build FAISS index for semantic search.
     
-    Uses IndexFlatIP (inner product) with normalized vectors for cosine similarity.
+    Uses inner product with normalized vectors for cosine similarity.
     
     Args:
-        embeddings: Array of shape (n_chunks, embedding_dim)
+        embeddings: Array of shape (n_chunks, embedding_dim); a contiguous
+            float32 array is normalized in place
         index_path: Path to save index
         normalize: Whether to normalize vectors (default True for cosine similarity)
+        index_type: "flat" (exact), "hnsw", "ivfpq", or "auto" (see create_index)
+        quantization: "fp32", "fp16" or "sq8" (see create_index)
+        pca_dim: Optional reduced dimension (see create_index)
         
     Returns:
         Built FAISS index
     """
-    print(f"  Building FAISS index...", flush=True)
+    index_type = resolve_index_type(index_type, len(embeddings))
+    print(f"  Building FAISS index ({index_type}, {quantization})...", flush=True)
     
-    # Normalize for cosine similarity
+    # Normalize for cosine similarity (in place: no second [N, D] copy)
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
     if normalize:
-        embeddings = normalize_vectors(embeddings)
+        normalize_vectors(embeddings, inplace=True)
     
     # Get embedding dimension
     dim = embeddings.shape[1]
     
-    # Create flat IP index (inner product - equivalent to cosine with normalized vectors)
-    index = faiss.IndexFlatIP(dim)
+    index, meta = create_index(embeddings, index_type, quantization, pca_dim)
     
-    # Add vectors to index
-    index.add(embeddings)
+    print(f"  ✓ Built FAISS index: {index.ntotal} vectors, {dim} dimensions", flush=True)
+    
+    save_faiss_index(index, meta, index_path)
+    
+    return index
+
+
+def build_faiss_index_from_rows(
+    matrix: np.ndarray,
+    rows: np.ndarray,
+    index_path: Path,
+    normalize: bool = True,
+    index_type: str = "flat",
+    quantization: str = "fp32",
+    block_size: int = 10000,
+    max_training_vectors: int = 100000,
+    device: str = "cpu",
+    pca_dim: Optional[int] = None
+) -> faiss.Index:
+    """
+    Build a FAISS index block by block from rows of an on-disk matrix.
+    
+    Avoids materializing the full [N, D] array: only block_size rows (plus an
+    IVF-PQ training sample) are in memory at a time.
+    
+    Args:
+        matrix: (num_rows, dim) array, typically EmbeddingCacheShard.matrix (memmap)
+        rows: Matrix row for each index position, in chunk order
+        index_path: Path to save index
+        normalize: Whether to normalize vectors (default True for cosine similarity)
+        index_type: "flat" (exact), "hnsw", "ivfpq", or "auto" (see create_index)
+        quantization: "fp32", "fp16" or "sq8" (see create_index)
+        block_size: Rows added per index.add() call
+        max_training_vectors: Cap on the IVF-PQ / SQ8 / PCA training sample
+        device: "cpu" or "gpu" for the add phase (saved index is always CPU)
+        pca_dim: Optional reduced dimension (see create_index)
+        
+    Returns:
+        Built FAISS index
+    """
+    n, dim = len(rows), matrix.shape[1]
+    index_type = resolve_index_type(index_type, n)
+    print(f"  Building FAISS index ({index_type}, {quantization}, streaming)...", flush=True)
+    
+    def load_block(block_rows: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(matrix[block_rows], dtype=np.float32)
+        return normalize_vectors(vectors, inplace=True) if normalize else vectors
+    
+    training_vectors = None
+    if (index_type == "ivfpq" and n >= 256) or quantization == "sq8" or pca_dim:
+        sample = rows
+        if n > max_training_vectors:
+            sample = np.sort(np.random.default_rng(0).choice(rows, max_training_vectors, replace=False))
+        training_vectors = load_block(sample)
+    
+    index, meta = create_empty_index(
+        n, dim, index_type, training_vectors=training_vectors, quantization=quantization, pca_dim=pca_dim
+    )
+    del training_vectors
+    
+    device_index = to_device(index, device)
+    for start in range(0, n, block_size):
+        device_index.add(load_block(rows[start:start + block_size]))
+    if device_index is not index:
+        index = faiss.index_gpu_to_cpu(device_index)
     
     print(f"  ✓ Built FAISS index: {index.ntotal} vectors, {dim} dimensions", flush=True)
     
-    # Save index
-    index_path.parent.mkdir(parents=True, exist_ok=True)
-    faiss.write_index(index, str(index_path))
-    print(f"  ✓ Saved index to {index_path}", flush=True)
+    save_faiss_index(index, meta, index_path)
     
     return index
 
 
+def _chunk_mapping_entry(chunk: Chunk) -> Dict[str, Any]:
+    """Metadata stored per FAISS row in the row→chunk mapping."""
+    return {
+        "chunk_id": chunk.chunk_id,
+        "file_id": chunk.file_id,
+        "filename": chunk.filename,
+        "page_start": chunk.page_start,
+        "page_end": chunk.page_end,
+        "chapter_number": chunk.chapter_number,
+        "chapter_title": chunk.chapter_title,
+        "token_count": chunk.token_count
+    }
+
+
+_MAPPING_STR_FIELDS = ("chunk_id", "file_id", "filename", "chapter_title")
+_MAPPING_INT_FIELDS = ("page_start", "page_end", "chapter_number", "token_count")
+
+
+def get_mapping_array_path(mapping_path: Path) -> Path:
+    """Binary (.npy) twin of row_to_chunk_id.json."""
+    return mapping_path.with_suffix(".npy")
+
+
+def _mapping_record(entry: Dict[str, Any]) -> tuple:
+    """Flatten a mapping entry into a record tuple (None -> "" / -1)."""
+    return (
+        *(entry[f] or "" for f in _MAPPING_STR_FIELDS),
+        *(-1 if entry[f] is None else entry[f] for f in _MAPPING_INT_FIELDS)
+    )
+
+
+def save_mapping_array(records: List[tuple], array_path: Path) -> None:
+    """Save mapping records as a fixed-width structured .npy (memory-mappable)."""
+    widths = [
+        max([len(r[i]) for r in records], default=0) or 1
+        for i in range(len(_MAPPING_STR_FIELDS))
+    ]
+    dtype = (
+        [(f, f"U{w}") for f, w in zip(_MAPPING_STR_FIELDS, widths)]
+        + [(f, "i4") for f in _MAPPING_INT_FIELDS]
+    )
+    array_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = array_path.with_suffix(".tmp.npy")
+    np.save(temp_path, np.array(records, dtype=dtype))
+    temp_path.replace(array_path)
+
+
+class ChunkMappingArray:
+    """
+    Read-only row→chunk mapping backed by a memory-mapped structured array.
+    
+    Drop-in for the list loaded from the JSON mapping: supports mapping[row],
+    mapping.get(row), len() and `row in mapping`, returning the same metadata
+    dicts, but loads with no parsing.
+    """
+    
+    def __init__(self, records: np.ndarray):
+        self.records = records
+        self._chapter_counts: Optional[Dict[int, int]] = None
+    
+    @property
+    def chapter_counts(self) -> Dict[int, int]:
+        """Rows per chapter_number (-1 = no chapter), computed once."""
+        if self._chapter_counts is None:
+            chapters, counts = np.unique(self.records["chapter_number"], return_counts=True)
+            self._chapter_counts = dict(zip(chapters.tolist(), counts.tolist()))
+        return self._chapter_counts
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def __contains__(self, row: int) -> bool:
+        return 0 <= row < len(self.records)
+    
+    def __getitem__(self, row: int) -> Dict[str, Any]:
+        if row not in self:
+            raise KeyError(row)
+        record = self.records[row]
+        entry = {f: str(record[f]) or None for f in _MAPPING_STR_FIELDS}
+        for f in _MAPPING_INT_FIELDS:
+            value = int(record[f])
+            entry[f] = None if value == -1 and f == "chapter_number" else value
+        return entry
+    
+    def get(self, row: int, default=None) -> Optional[Dict[str, Any]]:
+        return self[row] if row in self else default
+    
+    def filter_mask(self, rows: np.ndarray, filters: Dict[str, Any]) -> np.ndarray:
+        """Vectorized chapter_number / file_id filter over many rows at once."""
+        records = self.records[rows]
+        mask = np.ones(len(rows), dtype=bool)
+        if "chapter_number" in filters:
+            chapters = filters["chapter_number"]
+            if not isinstance(chapters, (list, tuple)):
+                chapters = [chapters]
+            mask &= np.isin(records["chapter_number"], [-1 if c is None else c for c in chapters])
+        if "file_id" in filters:
+            mask &= records["file_id"] == filters["file_id"]
+        return mask
+
+
 def build_chunk_mapping(
     chunks: List[Chunk],
-    mapping_path: Path
-) -> Dict[int, str]:
+    mapping_path: Path,
+    legacy_json: bool = False
+) -> List[Dict]:
     """
-    Build mapping from FAISS row index to chunk_id.
+    Build mapping from FAISS row index to chunk metadata.
     
     Args:
         chunks: List of Chunk objects (in same order as embeddings)
-        mapping_path: Path to save mapping JSON
+        mapping_path: Path to the mapping (.json; the .npy twin is written alongside)
+        legacy_json: Also write the JSON mapping for older readers
         
     Returns:
-        Dictionary mapping row index to chunk_id
-    """
-    mapping = {}
-    for idx, chunk in enumerate(chunks):
-        mapping[idx] = {
-            "chunk_id": chunk.chunk_id,
-            "file_id": chunk.file_id,
-            "filename": chunk.filename,
-            "page_start": chunk.page_start,
-            "page_end": chunk.page_end,
-            "chapter_number": chunk.chapter_number,
-            "chapter_title": chunk.chapter_title,
-            "token_count": chunk.token_count
-        }
+        List of chunk metadata indexed by row (rows are contiguous 0..N-1)
+    """
+    mapping = [_chunk_mapping_entry(chunk) for chunk in chunks]
     
     # Save mapping
-    mapping_path.parent.mkdir(parents=True, exist_ok=True)
-    mapping_path.write_text(json.dumps(mapping, indent=2))
-    print(f"  ✓ Saved row→chunk mapping to {mapping_path}", flush=True)
+    save_mapping_array([_mapping_record(e) for e in mapping], get_mapping_array_path(mapping_path))
+    if legacy_json:
+        mapping_path.parent.mkdir(parents=True, exist_ok=True)
+        mapping_path.write_text(json.dumps(mapping, indent=2))
+    print(f"  ✓ Saved row→chunk mapping to {get_mapping_array_path(mapping_path)}", flush=True)
     
     return mapping
 
 
-def load_faiss_index(index_path: Path) -> faiss.Index:
-    """Load FAISS index from disk."""
+class ChunkMappingWriter:
+    """
+    Incrementally build the row→chunk mapping while chunks stream past.
+    
+    Keeps only compact record tuples in memory and writes the .npy mapping on
+    a clean exit. With legacy_json=True the JSON mapping (same format as
+    build_chunk_mapping) is streamed to a temp file and swapped in as well.
+    """
+    
+    def __init__(self, mapping_path: Path, legacy_json: bool = False):
+        self.mapping_path = mapping_path
+        self.array_path = get_mapping_array_path(mapping_path)
+        self.temp_path = mapping_path.with_suffix(".tmp")
+        self.legacy_json = legacy_json
+        self.count = 0
+        self._records: List[tuple] = []
+        self._file = None
+    
+    def __enter__(self) -> "ChunkMappingWriter":
+        if self.legacy_json:
+            self.mapping_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.temp_path.open("w", encoding="utf-8")
+            self._file.write("[")
+        return self
+    
+    def write(self, chunks: List[Chunk]) -> None:
+        """Append the next chunks (rows continue from the previous call)."""
+        for chunk in chunks:
+            entry = _chunk_mapping_entry(chunk)
+            self._records.append(_mapping_record(entry))
+            if self._file:
+                sep = "," if self.count else ""
+                self._file.write(f'{sep}\n  {json.dumps(entry)}')
+            self.count += 1
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._file:
+            self._file.write("\n]")
+            self._file.close()
+        if exc_type is None:
+            save_mapping_array(self._records, self.array_path)
+            if self._file:
+                self.temp_path.replace(self.mapping_path)
+            print(f"  ✓ Saved row→chunk mapping to {self.array_path}", flush=True)
+        elif self._file:
+            self.temp_path.unlink(missing_ok=True)
+        self._records = []
+
+
+def save_faiss_index(index: faiss.Index, meta: dict, index_path: Path) -> None:
+    """
+    Write the index, its metadata sidecar and (flat only) the vectors twin.
+    
+    The .vectors.npy copy lets readers mmap the matrix instead of
+    deserializing the FAISS buffer; other index types remove any stale one.
+    """
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    faiss.write_index(index, str(index_path))
+    get_index_meta_path(index_path).write_text(json.dumps(meta, indent=2))
+    
+    vectors_path = get_vectors_path(index_path)
+    matrix = flat_index_matrix(index)
+    if matrix is not None:
+        np.save(vectors_path, matrix)
+    else:
+        vectors_path.unlink(missing_ok=True)
+    print(f"  ✓ Saved index to {index_path}", flush=True)
+
+
+def load_search_index(index_path: Path) -> Union[faiss.Index, np.ndarray]:
+    """
+    Load whatever search_index should query for index_path.
+    
+    For flat indexes this is the memory-mapped .vectors.npy matrix: opening
+    it is near-instant and pages fault in on demand, instead of copying the
+    whole FAISS buffer into RAM. Falls back to load_faiss_index.
+    """
+    vectors_path = get_vectors_path(index_path)
+    if vectors_path.exists() and index_path.exists():
+        if vectors_path.stat().st_mtime_ns >= index_path.stat().st_mtime_ns:
+            return np.load(vectors_path, mmap_mode="r")
+    return load_faiss_index(index_path)
+
+
+def load_faiss_index(index_path: Path, mmap: bool = True) -> faiss.Index:
+    """
+    Load FAISS index from disk.
+    
+    By default the file is memory-mapped read-only: opening is near-instant,
+    pages fault in on demand and are shared through the OS page cache
+    across processes. The result is for searching only (no add()). Index
+    types FAISS can't map are read into RAM instead.
+    """
     if not index_path.exists():
         raise FileNotFoundError(f"Index not found: {index_path}")
     
-    index = faiss.read_index(str(index_path))
+    index = None
+    if mmap:
+        try:
+            index = faiss.read_index(str(index_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            pass
+    if index is None:
+        index = faiss.read_index(str(index_path))
+    
+    meta_path = get_index_meta_path(index_path)
+    if meta_path.exists():
+        apply_search_params(index, json.loads(meta_path.read_text()))
+    
     return index
 
 
-def load_chunk_mapping(mapping_path: Path) -> Dict[int, Dict]:
-    """Load row→chunk mapping from disk."""
+def load_chunk_mapping(mapping_path: Path) -> Sequence[Dict]:
+    """
+    Load row→chunk mapping from disk as a row-indexed sequence.
+    
+    Prefers the memory-mapped .npy twin; falls back to the legacy JSON file
+    (a list, or the older {"row": entry} object form).
+    """
+    array_path = get_mapping_array_path(mapping_path)
+    if array_path.exists():
+        return ChunkMappingArray(np.load(array_path, mmap_mode="r"))
+    
     if not mapping_path.exists():
         raise FileNotFoundError(f"Mapping not found: {mapping_path}")
     
     mapping = json.loads(mapping_path.read_text())
-    # Convert string keys to integers
-    return {int(k): v for k, v in mapping.items()}
+    if isinstance(mapping, dict):
+        # Older object form: rows are contiguous, so order by key
+        return [mapping[str(row)] for row in range(len(mapping))]
+    return mapping
 
 
 def search_index(
     query_embedding: np.ndarray,
-    index: faiss.Index,
-    mapping: Dict[int, Dict],
+    index: Union[faiss.Index, np.ndarray],
+    mapping: Sequence[Dict],
     chunks_path: Path,
     top_k: int = 10,
     filters: Optional[Dict[str, Any]] = None,
@@ -136,7 +626,7 @@ def search_index(
     
     Args:
         query_embedding: Query vector of shape (embedding_dim,)
-        index: FAISS index
+        index: FAISS index, or a normalized vector matrix (see load_search_index)
         mapping: Row→chunk mapping
         chunks_path: Path to chunks JSONL file
         top_k: Number of results to return
@@ -149,30 +639,191 @@ def search_index(
     Returns:
         List of dicts with chunk info and scores
     """
-    # Normalize query
-    if normalize:
-        query_embedding = normalize_vectors(query_embedding.reshape(1, -1))[0]
-    
     # Search with larger k for post-filtering
-    search_k = top_k * 3 if filters else top_k
-    scores, indices = index.search(
-        query_embedding.reshape(1, -1).astype(np.float32),
-        search_k
+    search_k = adaptive_search_k(top_k, mapping, filters)
+    scores, indices = search_index_batch(
+        query_embedding.reshape(1, -1),
+        index,
+        search_k,
+        normalize=normalize
     )
     
+    return filter_search_hits(scores[0], indices[0], mapping, top_k, filters)
+
+
+def adaptive_search_k(
+    top_k: int,
+    mapping: Sequence[Dict],
+    filters: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    Raw hits to fetch so that post-filtering can still yield top_k results.
+    
+    With a chapter filter on the binary mapping, over-fetches by the inverse
+    of the filter's selectivity (row counts per chapter), capped at the
+    corpus size and at 100x. Hits come back sorted, so min_score alone needs
+    no over-fetch; other filters (and JSON mappings) keep the 3x default.
+    """
+    if not filters or set(filters) <= {"min_score"}:
+        return top_k
+    
+    if set(filters) <= {"min_score", "chapter_number"} and isinstance(mapping, ChunkMappingArray):
+        chapters = filters["chapter_number"]
+        if not isinstance(chapters, (list, tuple)):
+            chapters = [chapters]
+        counts = mapping.chapter_counts
+        matching = sum(counts.get(-1 if c is None else c, 0) for c in chapters)
+        selectivity = max(matching / max(len(mapping), 1), 0.01)
+        return min(len(mapping), max(top_k, math.ceil(top_k / selectivity)))
+    
+    return top_k * 3
+
+
+def search_index_batch(
+    query_embeddings: np.ndarray,
+    index: Union[faiss.Index, np.ndarray],
+    search_k: int,
+    normalize: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Search FAISS with many queries in a single call.
+    
+    Args:
+        query_embeddings: Query matrix of shape (num_queries, embedding_dim)
+        index: FAISS index, or a normalized vector matrix (see load_search_index)
+        search_k: Number of raw hits per query
+        normalize: Whether to normalize query vectors
+        
+    Returns:
+        Tuple of (scores, indices), each of shape (num_queries, search_k)
+    """
+    if normalize:
+        # Own contiguous copy, then normalize it in place
+        queries = normalize_vectors(np.array(query_embeddings, dtype=np.float32, order="C"), inplace=True)
+    else:
+        queries = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+    
+    matrix = index if isinstance(index, np.ndarray) else flat_index_matrix(index)
+    if matrix is not None:
+        return search_numpy(queries, matrix, search_k)
+    
+    # HNSW returns at most efSearch hits; widen the beam for large k
+    if hasattr(index, "hnsw") and index.hnsw.efSearch < search_k:
+        index.hnsw.efSearch = search_k
+    
+    return index.search(queries, search_k)
+
+
+def flat_index_matrix(index: faiss.Index) -> Optional[np.ndarray]:
+    """
+    Zero-copy (ntotal, dim) float32 view of a CPU IndexFlatIP's vectors.
+    
+    Returns None for any other index type (HNSW, IVF-PQ, SQ8, GPU), which
+    must go through index.search.
+    """
+    if type(index) is not faiss.IndexFlatIP or index.ntotal == 0:
+        return None
+    return faiss.rev_swig_ptr(index.get_xb(), index.ntotal * index.d).reshape(index.ntotal, index.d)
+
+
+def search_numpy(
+    queries: np.ndarray,
+    matrix: np.ndarray,
+    search_k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact inner-product search with a single matmul + argpartition.
+    
+    Skips FAISS's per-call dispatch, which dominates for the one-or-few
+    query searches the tutor and enrichment issue. Output matches
+    index.search: rows sorted by descending score, padded with -1.
+    
+    Args:
+        queries: Query matrix of shape (num_queries, dim)
+        matrix: Indexed vectors of shape (ntotal, dim)
+        search_k: Number of hits per query
+        
+    Returns:
+        Tuple of (scores, indices), each of shape (num_queries, search_k)
+    """
+    all_scores = queries @ matrix.T
+    top = top_k_argpartition(all_scores, search_k)
+    k = top.shape[1]
+    
+    scores = np.full((len(queries), search_k), -np.inf, dtype=np.float32)
+    indices = np.full((len(queries), search_k), -1, dtype=np.int64)
+    scores[:, :k] = np.take_along_axis(all_scores, top, axis=1)
+    indices[:, :k] = top
+    return scores, indices
+
+
+def top_k_argpartition(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores along the last axis, best first.
+    
+    O(N) selection with argpartition, then sorts only the k survivors
+    instead of a full O(N log N) argsort.
+    
+    Args:
+        scores: Array of shape (..., N)
+        k: Number of indices to keep (clipped to N)
+        
+    Returns:
+        Array of shape (..., min(k, N))
+    """
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    
+    top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(top, order, axis=-1)
+
+
+def filter_search_hits(
+    scores: np.ndarray,
+    indices: np.ndarray,
+    mapping: Sequence[Dict],
+    top_k: int = 10,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[Dict]:
+    """
+    Turn one query's raw FAISS hits into filtered result dicts.
+    
+    Args:
+        scores: Scores for one query (row of search_index_batch output)
+        indices: Row ids for one query
+        mapping: Row→chunk mapping
+        top_k: Number of results to return
+        filters: Same filters as search_index()
+        
+    Returns:
+        List of dicts with chunk info and scores
+    """
+    scores = np.asarray(scores)
+    indices = np.asarray(indices)
+    
+    # FAISS returns -1 for empty results
+    mask = (indices >= 0) & (indices < len(mapping))
+    if filters and "min_score" in filters:
+        mask &= scores >= filters["min_score"]
+    
+    # The binary mapping can evaluate chapter/file filters as array masks
+    vectorized = isinstance(mapping, ChunkMappingArray)
+    if filters and vectorized:
+        # Only valid rows are looked up (an empty mapping has no row 0)
+        mask[mask] = mapping.filter_mask(indices[mask], filters)
+    
     # Get results
     results = []
-    for score, idx in zip(scores[0], indices[0]):
-        if idx == -1:  # FAISS returns -1 for empty results
-            continue
+    for pos in np.flatnonzero(mask):
+        score, idx = scores[pos], indices[pos]
         
-        # Get chunk metadata from mapping
-        chunk_meta = mapping.get(int(idx))
-        if not chunk_meta:
-            continue
+        # Rows are contiguous, so the mapping is indexed by position
+        chunk_meta = mapping[int(idx)]
         
-        # Apply filters
-        if filters:
+        # Apply filters (list mappings loaded from legacy JSON)
+        if filters and not vectorized:
             # Chapter filter
             if "chapter_number" in filters:
                 chapter_filter = filters["chapter_number"]
@@ -187,11 +838,6 @@ def search_index(
             if "file_id" in filters:
                 if chunk_meta.get("file_id") != filters["file_id"]:
                     continue
-            
-            # Score filter
-            if "min_score" in filters:
-                if float(score) < filters["min_score"]:
-                    continue
         
         result = {
             "chunk_id": chunk_meta["chunk_id"],
@@ -227,14 +873,13 @@ def retrieve_chunks_with_text(
     Returns:
         List of results with 'text' field added
     """
-    # Load all chunks
-    chunks = load_chunks_jsonl(chunks_path)
-    chunk_dict = {chunk.chunk_id: chunk for chunk in chunks}
+    # Read only the hit chunks via the byte-offset index
+    chunk_dict = get_chunks_by_ids([r["chunk_id"] for r in results], chunks_path, raw=True)
     
     # Add text to results
     for result in results:
         chunk = chunk_dict.get(result["chunk_id"])
         if chunk:
-            result["text"] = chunk.text
+            result["text"] = chunk["text"]
     
     return results
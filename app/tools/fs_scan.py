@@ -39,6 +39,26 @@ def scan_uploads(uploads_dir: Path) -> list[dict]:
     return results
 
 
+def uploads_fingerprint(uploads_dir: Path) -> tuple:
+    """
+    Cheap change detector for uploads_dir: (path, size, mtime_ns) per PDF.
+    
+    Only stats files (no hashing), so it can run on every agent turn.
+    """
+    if not uploads_dir.is_dir():
+        return ()
+    
+    entries = []
+    for pdf_path in uploads_dir.rglob("*.pdf"):
+        try:
+            stat = pdf_path.stat()
+        except OSError:
+            continue
+        entries.append((pdf_path.relative_to(uploads_dir).as_posix(), stat.st_size, stat.st_mtime_ns))
+    
+    return tuple(sorted(entries))
+
+
 def compute_sha256(file_path: Path) -> str:
     """Compute SHA-256 hash of a file."""
     sha256 = hashlib.sha256()
@@ -1,14 +1,93 @@
 """LLM-powered intelligent study planning (Priority analysis)."""
 from pathlib import Path
-from datetime import date
-import json
+from datetime import date, timedelta
+import numpy as np
+import orjson
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from app.models.enriched_coverage import EnrichedCoverage, EnrichedTopic
 from app.models.plan import Priority
 from app.tools.llm_utils import call_gemini
 
 
+PRIORITIZE_CHUNK_SIZE = 50  # Topics per LLM request
+PRIORITIZE_MAX_WORKERS = 4  # Concurrent prioritization requests
+
+
+# Fixed instructions for prioritize_topics; kept byte-identical across calls
+# so the prompt prefix can be served from Gemini's context cache
+PRIORITIZATION_RUBRIC = """You are an expert study planner analyzing exam coverage. 
+
+Strategies:
+- "comprehensive": Study everything thoroughly
+- "balanced": Mix of depth and breadth  
+- "prioritized": Focus on high-value topics
+- "cramming": Only critical must-know topics
+
+Task: Analyze each topic in the exam coverage below and assign a priority level based on:
+1. **Foundational importance**: Is this a prerequisite for other topics?
+2. **Exam emphasis**: Early chapters and topics with practice problems are usually more important
+3. **Complexity**: Adjust time estimates based on topic depth
+4. **Strategy fit**: Align with the user's time constraints and the strategy given below
+
+Priority Levels:
+- "critical": Foundational concepts, definitely on exam, must study
+- "high": Very important, likely to be tested
+- "medium": Should know, might be tested
+- "low": Good to know, less likely to be tested heavily
+- "optional": Extra depth, review if time permits
+
+Time Estimates:
+- Simple concepts: 20-30 min
+- Standard topics: 30-45 min  
+- Complex topics with problems: 45-75 min
+- Deep/advanced topics: 60-90 min
+
+Exam coverage is given as a compact JSON array, one object per topic, with keys:
+e = exam, c = chapter, t = chapter title, o = learning objective,
+p = has practice problems (1/0), q = evidence quality (0-1), k = number of key terms
+
+Return JSON array (one object per topic), copying c into "chapter" and o into "objective" verbatim:
+[
+  {
+    "chapter": <int>,
+    "objective": "<string>",
+    "priority": "critical|high|medium|low|optional",
+    "reason": "<brief explanation>",
+    "time_estimate_minutes": <int>
+  },
+  ...
+]
+
+Be concise but clear in reasons. Focus on why the priority matters."""
+
+
+@lru_cache(maxsize=32)
+def _load_coverage_cached(path_str: str, mtime_ns: int) -> EnrichedCoverage:
+    # mtime_ns is only part of the key: a rewritten file misses the cache
+    return EnrichedCoverage.model_validate_json(Path(path_str).read_bytes())
+
+
+def load_coverage(path: Path) -> EnrichedCoverage:
+    """
+    Load an enriched coverage file, parsing each (path, mtime) only once.
+
+    analyze_study_load and prioritize_topics run back to back on the same
+    files during planning; the second call is served from memory. Callers
+    must treat the returned model as read-only since it is shared.
+
+    Args:
+        path: Path to an enriched coverage JSON file
+
+    Returns:
+        Validated EnrichedCoverage
+    """
+    path = Path(path)
+    return _load_coverage_cached(str(path.resolve()), path.stat().st_mtime_ns)
+
+
 def analyze_study_load(
     enriched_coverage_paths: list[Path],
     start_date: date,
@@ -34,12 +113,8 @@ def analyze_study_load(
         - coverage_percentage: What % of material fits in time
         - recommendation: Strategy recommendation
     """
-    # Load coverages
-    coverages = []
-    for path in enriched_coverage_paths:
-        with open(path) as f:
-            data = json.load(f)
-        coverages.append(EnrichedCoverage(**data))
+    # Shared with prioritize_topics, which usually follows on the same files
+    coverages = [load_coverage(path) for path in enriched_coverage_paths]
     
     # Count topics and estimate time
     total_topics = sum(len(c.topics) for c in coverages)
@@ -51,9 +126,8 @@ def analyze_study_load(
     total_hours_needed = total_minutes_needed / 60
     
     # Calculate available time
-    days_available = (end_date - start_date).days + 1
-    # Skip weekends (rough estimate - 5/7 of days)
-    weekdays_available = int(days_available * 5/7)
+    # Skip weekends (exact Mon-Fri count, end date inclusive)
+    weekdays_available = max(0, int(np.busday_count(start_date, end_date + timedelta(days=1))))
     total_minutes_available = weekdays_available * minutes_per_day
     total_hours_available = total_minutes_available / 60
     
@@ -93,6 +167,45 @@ def analyze_study_load(
     }
 
 
+def _time_breakdown(result_topics: list[dict]) -> dict[str, int]:
+    """Total minutes per priority level, in one pass over the topics."""
+    breakdown = {"critical": 0, "high": 0, "medium": 0, "low": 0, "optional": 0}
+    for t in result_topics:
+        if t["priority"] in breakdown:
+            breakdown[t["priority"]] += t["time_estimate"]
+    return breakdown
+
+
+def _prioritize_chunk(topic_summaries: list[dict], strategy: str) -> list[dict]:
+    """Ask the LLM to prioritize one chunk of topic summaries."""
+    # Static rubric first, variable data last: identical prompt prefixes
+    # across calls are eligible for Gemini's implicit context caching
+    prompt = f"""{PRIORITIZATION_RUBRIC}
+
+Strategy: {strategy}
+
+Exam Coverage:
+{orjson.dumps(topic_summaries).decode()}"""
+
+    response = call_gemini(
+        prompt=prompt,
+        model="gemini-2.0-flash-exp",
+        temperature=0.3  # Low temperature for consistent analysis
+    )
+    
+    # Parse response
+    # Clean markdown code blocks if present
+    content = (
+        response.strip()
+        .removeprefix("```json")
+        .removeprefix("```")
+        .removesuffix("```")
+        .strip()
+    )
+    
+    return orjson.loads(content)
+
+
 def prioritize_topics(
     enriched_coverage_paths: list[Path],
     strategy: str = "balanced"
@@ -110,105 +223,49 @@ def prioritize_topics(
         - time_breakdown: Minutes per priority level
         - strategy_used: Strategy applied
     """
-    # Load coverages
-    coverages = []
-    for path in enriched_coverage_paths:
-        with open(path) as f:
-            data = json.load(f)
-        coverages.append(EnrichedCoverage(**data))
+    # Load coverages (cached per path + mtime, see load_coverage)
+    coverages = [load_coverage(path) for path in enriched_coverage_paths]
     
     # Prepare topic summaries for LLM
     topic_summaries = []
     for coverage in coverages:
         for topic in coverage.topics:
-            # Create concise summary
+            # Create concise summary (short keys are documented in the rubric)
             summary = {
-                "exam": coverage.exam_name,
-                "chapter": topic.chapter,
-                "chapter_title": topic.chapter_title,
-                "objective": topic.bullet,
-                "has_practice_problems": len(topic.practice_problems) > 0,
-                "evidence_quality": topic.confidence_score,
-                "key_terms_count": len(topic.key_terms)
+                "e": coverage.exam_name,
+                "c": topic.chapter,
+                "t": topic.chapter_title,
+                "o": topic.bullet,
+                "p": 1 if topic.practice_problems else 0,
+                "q": round(topic.confidence_score, 2),
+                "k": len(topic.key_terms)
             }
             topic_summaries.append(summary)
     
-    # Build LLM prompt
-    prompt = f"""You are an expert study planner analyzing exam coverage. 
-
-Strategy: {strategy}
-- "comprehensive": Study everything thoroughly
-- "balanced": Mix of depth and breadth  
-- "prioritized": Focus on high-value topics
-- "cramming": Only critical must-know topics
-
-Exam Coverage:
-{json.dumps(topic_summaries, indent=2)}
-
-Task: Analyze each topic and assign a priority level based on:
-1. **Foundational importance**: Is this a prerequisite for other topics?
-2. **Exam emphasis**: Early chapters and topics with practice problems are usually more important
-3. **Complexity**: Adjust time estimates based on topic depth
-4. **Strategy fit**: Align with the user's time constraints
-
-Priority Levels:
-- "critical": Foundational concepts, definitely on exam, must study
-- "high": Very important, likely to be tested
-- "medium": Should know, might be tested
-- "low": Good to know, less likely to be tested heavily
-- "optional": Extra depth, review if time permits
-
-Time Estimates:
-- Simple concepts: 20-30 min
-- Standard topics: 30-45 min  
-- Complex topics with problems: 45-75 min
-- Deep/advanced topics: 60-90 min
-
-Return JSON array (one object per topic):
-[
-  {{
-    "chapter": <int>,
-    "objective": "<string>",
-    "priority": "critical|high|medium|low|optional",
-    "reason": "<brief explanation>",
-    "time_estimate_minutes": <int>
-  }},
-  ...
-]
-
-Be concise but clear in reasons. Focus on why the priority matters."""
-
-    # Call LLM
+    # Call LLM: large plans are split into chunks prioritized concurrently
     try:
-        response = call_gemini(
-            prompt=prompt,
-            model="gemini-2.0-flash-exp",
-            temperature=0.3  # Low temperature for consistent analysis
-        )
-        
-        # Parse response
-        # Clean markdown code blocks if present
-        content = response.strip()
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
+        chunks = [
+            topic_summaries[i:i + PRIORITIZE_CHUNK_SIZE]
+            for i in range(0, len(topic_summaries), PRIORITIZE_CHUNK_SIZE)
+        ]
+        priorities = []
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=PRIORITIZE_MAX_WORKERS) as executor:
+                for chunk_priorities in executor.map(lambda c: _prioritize_chunk(c, strategy), chunks):
+                    priorities.extend(chunk_priorities)
+        elif chunks:
+            priorities = _prioritize_chunk(chunks[0], strategy)
         
-        priorities = json.loads(content)
+        # Match priorities back to topics (first assignment wins on duplicates)
+        priority_index = {}
+        for p in priorities:
+            priority_index.setdefault((p["chapter"], p["objective"]), p)
         
-        # Match priorities back to topics
         result_topics = []
         for coverage in coverages:
             for topic in coverage.topics:
                 # Find matching priority assignment
-                priority_data = next(
-                    (p for p in priorities 
-                     if p["chapter"] == topic.chapter and p["objective"] == topic.bullet),
-                    None
-                )
+                priority_data = priority_index.get((topic.chapter, topic.bullet))
                 
                 if priority_data:
                     result_topics.append({
@@ -228,18 +285,9 @@ Be concise but clear in reasons. Focus on why the priority matters."""
                         "time_estimate": 45
                     })
         
-        # Calculate time breakdown
-        time_breakdown = {
-            "critical": sum(t["time_estimate"] for t in result_topics if t["priority"] == "critical"),
-            "high": sum(t["time_estimate"] for t in result_topics if t["priority"] == "high"),
-            "medium": sum(t["time_estimate"] for t in result_topics if t["priority"] == "medium"),
-            "low": sum(t["time_estimate"] for t in result_topics if t["priority"] == "low"),
-            "optional": sum(t["time_estimate"] for t in result_topics if t["priority"] == "optional")
-        }
-        
         return {
             "topics": result_topics,
-            "time_breakdown": time_breakdown,
+            "time_breakdown": _time_breakdown(result_topics),
             "strategy_used": strategy,
             "total_topics": len(result_topics)
         }
@@ -271,17 +319,9 @@ Be concise but clear in reasons. Focus on why the priority matters."""
                     "time_estimate": time_est
                 })
         
-        time_breakdown = {
-            "critical": sum(t["time_estimate"] for t in result_topics if t["priority"] == "critical"),
-            "high": sum(t["time_estimate"] for t in result_topics if t["priority"] == "high"),
-            "medium": sum(t["time_estimate"] for t in result_topics if t["priority"] == "medium"),
-            "low": 0,
-            "optional": 0
-        }
-        
         return {
             "topics": result_topics,
-            "time_breakdown": time_breakdown,
+            "time_breakdown": _time_breakdown(result_topics),
             "strategy_used": strategy,
             "total_topics": len(result_topics)
         }
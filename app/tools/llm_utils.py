@@ -1,11 +1,23 @@
 """Shared LLM utilities."""
 import os
+from functools import lru_cache
 from typing import Optional
 
 from google import genai
 from google.genai import types
 
 
+@lru_cache(maxsize=4)
+def get_client(api_key: str) -> genai.Client:
+    """
+    Shared GenAI client per API key.
+    
+    Reusing one client keeps its HTTP connection pool warm across calls
+    instead of redoing client setup + TLS for every prompt.
+    """
+    return genai.Client(api_key=api_key)
+
+
 def call_gemini(
     prompt: str,
     model: str = "gemini-2.0-flash-exp",
@@ -28,7 +40,7 @@ def call_gemini(
     if not api_key:
         raise ValueError("GOOGLE_API_KEY environment variable not set")
     
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
     
     response = client.models.generate_content(
         model=model,
@@ -1,5 +1,4 @@
 """Manifest I/O: load, save, and update logic (Phase 1)."""
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -15,8 +14,8 @@ def load_manifest(manifest_path: Path) -> Optional[Manifest]:
         return None
     
     try:
-        data = json.loads(manifest_path.read_text())
-        return Manifest(**data)
+        # Parsed and validated from bytes in pydantic-core (no intermediate dict)
+        return Manifest.model_validate_json(manifest_path.read_bytes())
     except Exception:
         return None
 
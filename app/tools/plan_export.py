@@ -7,6 +7,25 @@ from collections import defaultdict
 from app.models.plan import StudyPlan, Priority
 
 
+PRIORITY_ORDER = [Priority.CRITICAL, Priority.HIGH, Priority.MEDIUM, Priority.LOW, Priority.OPTIONAL]
+
+PRIORITY_EMOJI = {
+    Priority.CRITICAL: "🔴",
+    Priority.HIGH: "🟠",
+    Priority.MEDIUM: "🟡",
+    Priority.LOW: "🟢",
+    Priority.OPTIONAL: "⚪"
+}
+
+PRIORITY_LABELS = {
+    Priority.CRITICAL: "CRITICAL - Must Study",
+    Priority.HIGH: "HIGH PRIORITY",
+    Priority.MEDIUM: "MEDIUM PRIORITY",
+    Priority.LOW: "LOW PRIORITY - Optional",
+    Priority.OPTIONAL: "OPTIONAL - If Time Permits"
+}
+
+
 def export_to_markdown(plan: StudyPlan, output_path: Path) -> None:
     """
     Export study plan to Markdown format.
@@ -44,28 +63,24 @@ def export_to_markdown(plan: StudyPlan, output_path: Path) -> None:
         lines.append(f"- Time: {hours:.1f}h ({exam_stats['total_minutes']} minutes)")
         lines.append(f"- Avg Confidence: {exam_stats['avg_confidence']:.2f}\n")
     
-    # Priority breakdown (if priorities are used)
+    # Priority breakdown (if priorities are used); the per-day groups for
+    # the schedule below are built in the same pass over the blocks
     priority_counts = defaultdict(int)
-    has_priorities = False
+    day_groups = []
     for day in plan.days:
+        priority_groups = defaultdict(list)
         for block in day.blocks:
-            if hasattr(block, 'priority') and block.priority != Priority.MEDIUM:
-                has_priorities = True
-            if hasattr(block, 'priority'):
-                priority_counts[block.priority] += 1
+            priority_groups[block.priority].append(block)
+        for priority, blocks in priority_groups.items():
+            priority_counts[priority] += len(blocks)
+        day_groups.append(priority_groups)
+    has_priorities = any(p != Priority.MEDIUM for p in priority_counts)
     
     if has_priorities:
         lines.append("## Priority Breakdown\n")
-        priority_emoji = {
-            Priority.CRITICAL: "🔴",
-            Priority.HIGH: "🟠",
-            Priority.MEDIUM: "🟡",
-            Priority.LOW: "🟢",
-            Priority.OPTIONAL: "⚪"
-        }
-        for priority in [Priority.CRITICAL, Priority.HIGH, Priority.MEDIUM, Priority.LOW, Priority.OPTIONAL]:
+        for priority in PRIORITY_ORDER:
             if priority in priority_counts:
-                emoji = priority_emoji.get(priority, "")
+                emoji = PRIORITY_EMOJI.get(priority, "")
                 lines.append(f"- {emoji} **{priority.value.title()}:** {priority_counts[priority]} topics")
         lines.append("")
     
@@ -73,41 +88,19 @@ def export_to_markdown(plan: StudyPlan, output_path: Path) -> None:
     lines.append("---\n")
     lines.append("## Daily Schedule\n")
     
-    for day in plan.days:
+    for day, priority_groups in zip(plan.days, day_groups):
         # Day header
         lines.append(f"### {day.day_name}, {day.date}")
         lines.append(f"**Total:** {day.total_minutes} minutes, {len(day.blocks)} topics\n")
         
-        # Group blocks by priority for better organization
-        priority_groups = defaultdict(list)
-        for block in day.blocks:
-            priority = getattr(block, 'priority', Priority.MEDIUM)
-            priority_groups[priority].append(block)
-        
         # Display in priority order
-        priority_order = [Priority.CRITICAL, Priority.HIGH, Priority.MEDIUM, Priority.LOW, Priority.OPTIONAL]
-        priority_emoji = {
-            Priority.CRITICAL: "🔴",
-            Priority.HIGH: "🟠",
-            Priority.MEDIUM: "🟡",
-            Priority.LOW: "🟢",
-            Priority.OPTIONAL: "⚪"
-        }
-        priority_labels = {
-            Priority.CRITICAL: "CRITICAL - Must Study",
-            Priority.HIGH: "HIGH PRIORITY",
-            Priority.MEDIUM: "MEDIUM PRIORITY",
-            Priority.LOW: "LOW PRIORITY - Optional",
-            Priority.OPTIONAL: "OPTIONAL - If Time Permits"
-        }
-        
         block_counter = 1
-        for priority in priority_order:
+        for priority in PRIORITY_ORDER:
             if priority in priority_groups and priority_groups[priority]:
                 # Only show priority header if we have multiple priorities
                 if len(priority_groups) > 1 or (len(priority_groups) == 1 and priority != Priority.MEDIUM):
-                    emoji = priority_emoji.get(priority, "")
-                    label = priority_labels.get(priority, priority.value.upper())
+                    emoji = PRIORITY_EMOJI.get(priority, "")
+                    label = PRIORITY_LABELS.get(priority, priority.value.upper())
                     lines.append(f"\n**{emoji} {label}**\n")
                 
                 for block in priority_groups[priority]:
@@ -130,7 +123,7 @@ def export_to_markdown(plan: StudyPlan, output_path: Path) -> None:
                         lines.append(f"❓ **Question:** {block.study_question}\n")
                     
                     # Show priority reason if available
-                    if hasattr(block, 'priority_reason') and block.priority_reason:
+                    if block.priority_reason:
                         lines.append(f"🎯 **Why this priority:** {block.priority_reason}\n")
                     
                     lines.append(f"⏱️ **Time:** {block.time_estimate_minutes} minutes")
@@ -151,6 +144,27 @@ def export_to_markdown(plan: StudyPlan, output_path: Path) -> None:
     output_path.write_text("\n".join(lines))
 
 
+def _csv_rows(plan: StudyPlan):
+    """Yield one CSV row per study block, in schedule order."""
+    for day in plan.days:
+        for block in day.blocks:
+            yield (
+                day.date,
+                day.day_name,
+                block.course or block.exam_name,
+                f"Ch {block.chapter}: {block.chapter_title}",
+                block.topic,
+                block.objective,
+                block.priority.value.upper(),
+                block.reading_pages,
+                "; ".join([f"{p.text} (p. {p.page})" for p in block.practice_problems]),
+                ", ".join(block.key_terms),
+                block.study_question,
+                block.time_estimate_minutes,
+                f"{block.confidence_score:.2f}"
+            )
+
+
 def export_to_csv(plan: StudyPlan, output_path: Path) -> None:
     """
     Export study plan to CSV format.
@@ -180,29 +194,7 @@ def export_to_csv(plan: StudyPlan, output_path: Path) -> None:
         ])
         
         # Data rows
-        for day in plan.days:
-            for block in day.blocks:
-                # Format practice problems for CSV
-                problems_str = "; ".join([f"{p.text} (p. {p.page})" for p in block.practice_problems])
-                
-                # Get priority
-                priority_str = getattr(block, 'priority', Priority.MEDIUM).value.upper()
-                
-                writer.writerow([
-                    day.date,
-                    day.day_name,
-                    block.course or block.exam_name,
-                    f"Ch {block.chapter}: {block.chapter_title}",
-                    block.topic,
-                    block.objective,
-                    priority_str,
-                    block.reading_pages,
-                    problems_str,
-                    ", ".join(block.key_terms),
-                    block.study_question,
-                    block.time_estimate_minutes,
-                    f"{block.confidence_score:.2f}"
-                ])
+        writer.writerows(_csv_rows(plan))
 
 
 def export_to_json(plan: StudyPlan, output_path: Path) -> None:
@@ -213,7 +205,5 @@ def export_to_json(plan: StudyPlan, output_path: Path) -> None:
         plan: StudyPlan to export
         output_path: Path to save JSON file
     """
-    import json
-    
     with open(output_path, 'w') as f:
-        json.dump(plan.model_dump(mode='json'), f, indent=2, default=str)
+        f.write(plan.model_dump_json(indent=2))
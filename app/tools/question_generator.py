@@ -1,8 +1,17 @@
 """Generate study questions from textbook content (Phase 8+)."""
 import os
-from google import genai
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 from google.genai import types
 
+from app.tools.llm_utils import get_client
+from app.tools.tool_cache import cached_tool
+
+
+QUESTION_MODEL = "gemini-2.0-flash"
+CONTEXT_CHAR_LIMIT = 500  # Max excerpt characters sent per question
+QUESTION_MAX_WORKERS = 8  # Concurrent question requests
+
 
 def get_genai_client():
     """Get authenticated Google GenAI client."""
@@ -10,8 +19,7 @@ def get_genai_client():
     if not api_key:
         raise ValueError("GOOGLE_API_KEY or GEMINI_API_KEY not found in environment")
     
-    client = genai.Client(api_key=api_key)
-    return client
+    return get_client(api_key)
 
 
 def generate_study_question(
@@ -34,14 +42,15 @@ def generate_study_question(
     if not chunk_excerpts:
         return ""
     
-    client = get_genai_client()
-    
-    # Build context from chunks (limit to top 2 for brevity)
-    context_text = "\n\n".join(chunk_excerpts[:2])
-    
-    # Truncate if too long (max ~500 chars)
-    if len(context_text) > 500:
-        context_text = context_text[:500] + "..."
+    # Build context from chunks (limit to top 2 for brevity), truncated to
+    # ~500 chars; each excerpt is cut first so long chunks are never joined whole
+    excerpts = chunk_excerpts[:2]
+    context_len = sum(len(c) for c in excerpts) + 2 * (len(excerpts) - 1)
+    if context_len > CONTEXT_CHAR_LIMIT:
+        context_text = "\n\n".join(c[:CONTEXT_CHAR_LIMIT] for c in excerpts)
+        context_text = context_text[:CONTEXT_CHAR_LIMIT] + "..."
+    else:
+        context_text = "\n\n".join(excerpts)
     
     chapter_context = f" in {chapter_title}" if chapter_title else ""
     
@@ -59,9 +68,48 @@ Based on the textbook content above, generate ONE focused study question that:
 
 Output only the question, no preamble."""
     
+    return _generate_question_with_llm(prompt)
+
+
+def generate_study_questions_batch(
+    items: list[dict],
+    max_workers: int = QUESTION_MAX_WORKERS,
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> list[str]:
+    """
+    Generate study questions for many topics concurrently.
+    
+    Each call is a blocking network round-trip, so requests are fanned out
+    over a thread pool; cached prompts return without a request.
+    
+    Args:
+        items: Keyword arguments for generate_study_question, one dict per topic
+        max_workers: Maximum concurrent requests
+        on_progress: Optional callback(done, total) after each result
+        
+    Returns:
+        Questions in the same order as items ("" where generation failed)
+    """
+    if not items:
+        return []
+    
+    questions = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        for question in executor.map(lambda kw: generate_study_question(**kw), items):
+            questions.append(question)
+            if on_progress:
+                on_progress(len(questions), len(items))
+    return questions
+
+
+@cached_tool("generate_study_question", model=QUESTION_MODEL, should_cache=bool)
+def _generate_question_with_llm(prompt: str) -> str:
+    """Ask Gemini for one question; cached on the exact prompt (failures return "")."""
+    client = get_genai_client()
+    
     try:
         response = client.models.generate_content(
-            model="gemini-2.0-flash",
+            model=QUESTION_MODEL,
             contents=prompt,
             config=types.GenerateContentConfig(
                 temperature=0.7,
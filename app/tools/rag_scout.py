@@ -6,12 +6,12 @@ This tool bridges abstract learning objectives to concrete textbook resources by
 3. Calculating confidence scores for each topic
 """
 from pathlib import Path
+import io
 import re
+import sys
 import json
-from collections import Counter
-from typing import Optional
-
-import numpy as np
+from collections import Counter, OrderedDict
+from typing import Optional, Sequence
 
 from app.models.coverage import ExamCoverage
 from app.models.enriched_coverage import (
@@ -21,46 +21,78 @@ from app.models.enriched_coverage import (
     PracticeProblem
 )
 from app.models.chunks import Chunk
-from app.tools.chunk_store import load_chunks_jsonl
+from app.tools.chunk_store import get_chunks_by_ids, load_chunks_dict_jsonl
 from app.tools.faiss_index import (
     load_faiss_index,
     load_chunk_mapping,
-    search_index
+    to_device,
+    search_index_batch,
+    adaptive_search_k,
+    filter_search_hits
 )
-from app.tools.embed import embed_query
+from app.tools.embed import embed_query, embed_texts
+from app.tools.semantic_cache import SemanticCache
+from app.tools.tool_cache import cache_get, cache_put, is_cache_enabled, make_key, ENRICHMENT_TTL
 
 
-def consolidate_page_ranges(pages: list[int], gap_tolerance: int = 3) -> list[list[int]]:
+# Practice problem references ("Problem 3.2", "Exercise 4", "Challenge 1.2.3", ...)
+_PROBLEM_RE = re.compile(
+    r'(?:Problem|Exercise|Question|Practice)\s+\d+\.?\d*|Challenge\s+\d+\.\d+\.\d+',
+    re.IGNORECASE
+)
+# Literal keywords one of which every _PROBLEM_RE match contains (lowercase)
+_PROBLEM_KEYWORDS = ("problem", "exercise", "question", "challenge", "practice")
+# Capitalized phrases (2-4 words) used as key term candidates
+_KEY_TERM_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}\b')
+# Common words that disqualify a phrase; _KEY_TERM_RE only yields
+# capitalized words, so these are stored in that exact form
+_KEY_TERM_STOPWORDS = frozenset({
+    'The', 'A', 'An', 'This', 'That', 'These', 'Those', 'In', 'On', 'At',
+    'To', 'For', 'Of', 'With', 'By', 'From', 'As', 'Is', 'Are', 'Was',
+    'Were', 'Be', 'Been', 'Being', 'Have', 'Has', 'Had', 'Do', 'Does',
+    'Did', 'Will', 'Would', 'Could', 'Should', 'May', 'Might', 'Must',
+    'Can', 'Chapter', 'Section', 'Figure', 'Table', 'Page'
+})
+# Separator line for the enrichment summary header
+_BANNER = "=" * 70
+
+
+def merge_intervals(
+    intervals: Sequence[tuple[int, int]],
+    gap_tolerance: int = 3
+) -> list[list[int]]:
     """
-    Consolidate page numbers into ranges.
+    Merge inclusive (start, end) page intervals into consolidated ranges.
+    
+    Works on intervals directly, so a chunk spanning 80 pages costs one
+    comparison instead of 80 page entries.
     
     Args:
-        pages: List of page numbers
+        intervals: Inclusive (start, end) pairs, in any order
         gap_tolerance: Max gap to consider pages consecutive
         
     Returns:
         List of [start, end] ranges
         
     Example:
-        [1, 2, 3, 7, 8, 15] -> [[1, 3], [7, 8], [15, 15]]
+        [(9, 10), (1, 3), (2, 4), (15, 15)] -> [[1, 4], [9, 10], [15, 15]]
     """
-    if not pages:
+    # Empty intervals (end < start) cover no pages
+    ordered = sorted((start, end) for start, end in intervals if end >= start)
+    if not ordered:
         return []
     
-    pages = sorted(set(pages))  # Remove duplicates and sort
     ranges = []
-    start = pages[0]
-    end = pages[0]
+    start, end = ordered[0]
     
-    for page in pages[1:]:
-        if page - end <= gap_tolerance:
+    for next_start, next_end in ordered[1:]:
+        if next_start - end <= gap_tolerance:
             # Extend current range
-            end = page
+            end = max(end, next_end)
         else:
             # Start new range
             ranges.append([start, end])
-            start = page
-            end = page
+            start, end = next_start, next_end
     
     # Add final range
     ranges.append([start, end])
@@ -68,6 +100,73 @@ def consolidate_page_ranges(pages: list[int], gap_tolerance: int = 3) -> list[li
     return ranges
 
 
+def consolidate_page_ranges(pages: list[int], gap_tolerance: int = 3) -> list[list[int]]:
+    """
+    Consolidate page numbers into ranges.
+    
+    Args:
+        pages: List of page numbers
+        gap_tolerance: Max gap to consider pages consecutive
+        
+    Returns:
+        List of [start, end] ranges
+        
+    Example:
+        [1, 2, 3, 7, 8, 15] -> [[1, 3], [7, 8], [15, 15]]
+    """
+    return merge_intervals([(page, page) for page in set(pages)], gap_tolerance)
+
+
+KEY_TERM_CHUNKS = 5  # Key terms come from the top chunks only
+
+
+def _add_chunk_problems(chunk: Chunk, problems: list[PracticeProblem], max_problems: int) -> None:
+    """Append a chunk's problem references to problems, up to max_problems."""
+    # Most chunks mention no problems at all; a substring test is much
+    # cheaper than running the regex over the whole text
+    lowered = chunk.text.lower()
+    if not any(k in lowered for k in _PROBLEM_KEYWORDS):
+        return
+    
+    # Search for problem patterns in text (one pass, in document order)
+    for match in _PROBLEM_RE.finditer(chunk.text):
+        # Extract snippet (200 chars after match to get full problem text)
+        start = match.start()
+        # Clean up snippet (strip and collapse multiple spaces/newlines)
+        snippet = ' '.join(chunk.text[start:start + 250].split())
+        
+        problems.append(PracticeProblem(
+            file_id=chunk.file_id,
+            filename=chunk.filename,
+            page=chunk.page_start,
+            snippet=snippet
+        ))
+        
+        if len(problems) >= max_problems:
+            return
+
+
+def _count_chunk_terms(chunk: Chunk, term_counts: Counter, min_frequency: int) -> int:
+    """Count a chunk's candidate key terms; returns how many newly reached min_frequency."""
+    newly_qualified = 0
+    for match in _KEY_TERM_RE.findall(chunk.text):
+        # Filter stopwords
+        if _KEY_TERM_STOPWORDS.isdisjoint(match.split()):
+            term_counts[match] += 1
+            if term_counts[match] == min_frequency:
+                newly_qualified += 1
+    return newly_qualified
+
+
+def _top_terms(term_counts: Counter, top_k: int, min_frequency: int) -> list[str]:
+    """Filter by frequency and return top K."""
+    terms = [
+        term for term, count in term_counts.most_common(top_k * 2)
+        if count >= min_frequency
+    ]
+    return terms[:top_k]
+
+
 def extract_practice_problems(
     chunks: list[Chunk],
     max_problems: int = 5
@@ -83,37 +182,13 @@ def extract_practice_problems(
         List of PracticeProblem objects
     """
     problems = []
-    problem_patterns = [
-        r'Problem\s+\d+\.?\d*',
-        r'Exercise\s+\d+\.?\d*',
-        r'Question\s+\d+\.?\d*',
-        r'Challenge\s+\d+\.\d+\.\d+',
-        r'Practice\s+\d+\.?\d*',
-    ]
     
     for chunk in chunks:
-        # Search for problem patterns in text
-        for pattern in problem_patterns:
-            matches = re.finditer(pattern, chunk.text, re.IGNORECASE)
-            for match in matches:
-                # Extract snippet (200 chars after match to get full problem text)
-                start = match.start()
-                snippet = chunk.text[start:start + 250].strip()
-                # Clean up snippet (collapse multiple spaces/newlines)
-                snippet = re.sub(r'\s+', ' ', snippet)
-                
-                problem = PracticeProblem(
-                    file_id=chunk.file_id,
-                    filename=chunk.filename,
-                    page=chunk.page_start,
-                    snippet=snippet
-                )
-                problems.append(problem)
-                
-                if len(problems) >= max_problems:
-                    return problems
+        _add_chunk_problems(chunk, problems, max_problems)
+        if len(problems) >= max_problems:
+            break
     
-    return problems[:max_problems]
+    return problems
 
 
 def extract_key_terms(
@@ -134,35 +209,56 @@ def extract_key_terms(
     Returns:
         List of key term strings
     """
-    # Common words to exclude
-    stopwords = {
-        'The', 'A', 'An', 'This', 'That', 'These', 'Those', 'In', 'On', 'At',
-        'To', 'For', 'Of', 'With', 'By', 'From', 'As', 'Is', 'Are', 'Was',
-        'Were', 'Be', 'Been', 'Being', 'Have', 'Has', 'Had', 'Do', 'Does',
-        'Did', 'Will', 'Would', 'Could', 'Should', 'May', 'Might', 'Must',
-        'Can', 'Chapter', 'Section', 'Figure', 'Table', 'Page'
-    }
-    
-    # Pattern for capitalized phrases (2-4 words)
-    pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}\b'
-    
     term_counts = Counter()
+    qualified = 0  # Terms seen at least min_frequency times
     
-    for chunk in chunks[:5]:  # Only look at top 5 chunks
-        matches = re.findall(pattern, chunk.text)
-        for match in matches:
-            # Filter stopwords
-            words = match.split()
-            if not any(word in stopwords for word in words):
-                term_counts[match] += 1
+    for chunk in chunks[:KEY_TERM_CHUNKS]:
+        qualified += _count_chunk_terms(chunk, term_counts, min_frequency)
+        
+        # Chunks are in relevance order: once the best ones yield enough
+        # candidates, the lower-ranked ones are not scanned
+        if qualified >= top_k * 2:
+            break
     
-    # Filter by frequency and return top K
-    terms = [
-        term for term, count in term_counts.most_common(top_k * 2)
-        if count >= min_frequency
-    ]
+    return _top_terms(term_counts, top_k, min_frequency)
+
+
+def extract_problems_and_terms(
+    chunks: list[Chunk],
+    max_problems: int = 5,
+    top_k: int = 8,
+    min_frequency: int = 2
+) -> tuple[list[PracticeProblem], list[str]]:
+    """
+    Extract practice problems and key terms in one pass over the chunks.
     
-    return terms[:top_k]
+    Same results as extract_practice_problems + extract_key_terms, but both
+    scans run on each chunk's text back to back while it is still in cache.
+    
+    Args:
+        chunks: Retrieved chunks in relevance order
+        max_problems: Maximum number of problems to return
+        top_k: Maximum number of terms to return
+        min_frequency: Minimum appearances across chunks for a term
+        
+    Returns:
+        (practice problems, key terms)
+    """
+    problems = []
+    term_counts = Counter()
+    qualified = 0
+    
+    for i, chunk in enumerate(chunks):
+        need_problems = len(problems) < max_problems
+        need_terms = i < KEY_TERM_CHUNKS and qualified < top_k * 2
+        if not (need_problems or need_terms):
+            break
+        if need_problems:
+            _add_chunk_problems(chunk, problems, max_problems)
+        if need_terms:
+            qualified += _count_chunk_terms(chunk, term_counts, min_frequency)
+    
+    return problems, _top_terms(term_counts, top_k, min_frequency)
 
 
 def enrich_topic(
@@ -170,12 +266,14 @@ def enrich_topic(
     chapter_number: int,
     chapter_title: str,
     index,
-    mapping: dict,
+    mapping: Sequence[dict],
     chunks_path: Path,
     top_k: int = 10,
     min_score: float = 0.6,
     use_chapter_filter: bool = True,
-    fallback_threshold: int = 3
+    fallback_threshold: int = 3,
+    search_hits: Optional[tuple] = None,
+    chunk_lookup: Optional[dict] = None
 ) -> EnrichedTopic:
     """
     Enrich a single topic bullet with textbook evidence.
@@ -191,39 +289,32 @@ def enrich_topic(
         min_score: Minimum similarity score
         use_chapter_filter: Whether to filter by chapter
         fallback_threshold: If chapter filter returns < this, try without filter
+        search_hits: Optional precomputed (scores, indices) for this topic from
+            search_index_batch with k >= top_k*3; skips the embed + search calls
+        chunk_lookup: Optional preloaded {chunk_id: Chunk}; avoids re-reading chunks_path
         
     Returns:
         EnrichedTopic with reading pages, problems, terms, and confidence
     """
-    # Embed query
-    query_embedding = embed_query(topic_bullet)
-    
     # Build filters
     filters = {"min_score": min_score}
     if use_chapter_filter and chapter_number:
         filters["chapter_number"] = chapter_number
     
+    if search_hits is None:
+        # Embed query and fetch enough raw hits for post-filtering
+        query_embedding = embed_query(topic_bullet)
+        search_k = max(top_k * 3, adaptive_search_k(top_k, mapping, filters))
+        scores, indices = search_index_batch(query_embedding.reshape(1, -1), index, search_k)
+        search_hits = (scores[0], indices[0])
+    
     # Search with chapter filter
-    results = search_index(
-        query_embedding=query_embedding,
-        index=index,
-        mapping=mapping,
-        chunks_path=chunks_path,
-        top_k=top_k,
-        filters=filters
-    )
+    results = filter_search_hits(*search_hits, mapping, top_k, filters)
     
     # Fallback: if too few results with chapter filter, try without
     if use_chapter_filter and len(results) < fallback_threshold:
         filters.pop("chapter_number", None)
-        results = search_index(
-            query_embedding=query_embedding,
-            index=index,
-            mapping=mapping,
-            chunks_path=chunks_path,
-            top_k=top_k,
-            filters=filters
-        )
+        results = filter_search_hits(*search_hits, mapping, top_k, filters)
     
     # If still no results, return empty enrichment
     if not results:
@@ -238,25 +329,19 @@ def enrich_topic(
         )
     
     # Load full chunks
-    all_chunks = load_chunks_jsonl(chunks_path)
-    chunk_dict = {c.chunk_id: c for c in all_chunks}
+    if chunk_lookup is None:
+        chunk_lookup = get_chunks_by_ids([r["chunk_id"] for r in results], chunks_path)
     
-    retrieved_chunks = []
-    for result in results:
-        chunk = chunk_dict.get(result["chunk_id"])
-        if chunk:
-            retrieved_chunks.append(chunk)
+    retrieved_chunks = [
+        chunk_lookup[r["chunk_id"]] for r in results if r["chunk_id"] in chunk_lookup
+    ]
     
     # Calculate confidence score (average of retrieval scores)
-    avg_score = np.mean([r["score"] for r in results])
+    avg_score = sum(r["score"] for r in results) / len(results)
     
     # Extract reading pages from all retrieved chunks
     # Note: section_type categorization was removed as unreliable
-    all_pages = []
-    for chunk in retrieved_chunks:
-        all_pages.extend(range(chunk.page_start, chunk.page_end + 1))
-    
-    page_ranges = consolidate_page_ranges(all_pages)
+    page_ranges = merge_intervals([(chunk.page_start, chunk.page_end) for chunk in retrieved_chunks])
     
     # Get file info from first chunk
     first_chunk = retrieved_chunks[0] if retrieved_chunks else None
@@ -266,12 +351,11 @@ def enrich_topic(
         page_ranges=page_ranges
     )
     
-    # Extract practice problems from all chunks
-    # Section type filtering disabled - extract from any chunk
-    practice_problems = extract_practice_problems(retrieved_chunks, max_problems=5)
-    
-    # Extract key terms
-    key_terms = extract_key_terms(retrieved_chunks[:5], top_k=8)
+    # Extract practice problems (from any chunk; section type filtering
+    # disabled) and key terms (from the top chunks) in one pass
+    practice_problems, key_terms = extract_problems_and_terms(
+        retrieved_chunks, max_problems=5, top_k=8
+    )
     
     # Store top chunk excerpts for question generation (limit to 2-3, max 400 chars each)
     top_chunk_excerpts = []
@@ -294,13 +378,45 @@ def enrich_topic(
         reading_pages=reading_pages,
         practice_problems=practice_problems,
         key_terms=key_terms,
-        confidence_score=float(avg_score),
+        confidence_score=avg_score,
         chunks_retrieved=len(results),
         notes=notes,
         top_chunks=top_chunk_excerpts
     )
 
 
+def _file_fingerprint(path: Path) -> list:
+    """Cheap change detector for cache keys (size + mtime)."""
+    stat = path.stat()
+    return [str(path), stat.st_size, stat.st_mtime_ns]
+
+
+# Per-process semantic caches of enriched topics, one per index/parameter/chapter
+# namespace, so near-duplicate bullets across exams skip search + extraction.
+# Namespaces are LRU-bounded (a rebuilt index gets a new one) and entries expire.
+TOPIC_CACHE_NAMESPACES = 16
+TOPIC_CACHE_MAX_ENTRIES = 1024
+TOPIC_CACHE_TTL = 3600
+_topic_caches: OrderedDict[str, SemanticCache] = OrderedDict()
+
+
+def _topic_cache(namespace: dict, chapter: Optional[int], dim: int) -> Optional[SemanticCache]:
+    """Get (or create) the semantic topic cache for a namespace + chapter; None if caching is off."""
+    if not is_cache_enabled():
+        return None
+    key = make_key("enrich_topic", {**namespace, "chapter": chapter})
+    cache = _topic_caches.get(key)
+    if cache is None:
+        cache = _topic_caches[key] = SemanticCache(
+            dim, max_entries=TOPIC_CACHE_MAX_ENTRIES, ttl=TOPIC_CACHE_TTL
+        )
+        if len(_topic_caches) > TOPIC_CACHE_NAMESPACES:
+            _topic_caches.popitem(last=False)
+    else:
+        _topic_caches.move_to_end(key)
+    return cache
+
+
 def enrich_coverage(
     coverage: ExamCoverage,
     index_path: Path,
@@ -308,7 +424,9 @@ def enrich_coverage(
     chunks_path: Path,
     top_k: int = 10,
     min_score: float = 0.6,
-    use_chapter_filter: bool = True
+    use_chapter_filter: bool = True,
+    concurrency: int = 4,
+    device: str = "cpu"
 ) -> EnrichedCoverage:
     """
     Enrich exam coverage with textbook evidence via RAG.
@@ -321,25 +439,88 @@ def enrich_coverage(
         top_k: Number of chunks to retrieve per topic
         min_score: Minimum similarity score threshold
         use_chapter_filter: Whether to use chapter-aware filtering
+        concurrency: Max embedding requests in flight for the topic queries
+        device: "cpu" or "gpu" for the batched FAISS search
         
     Returns:
         EnrichedCoverage with reading pages, problems, and terms
     """
-    print(f"\n🔍 RAG Scout: Enriching {coverage.exam_name}")
-    print(f"   Exam ID: {coverage.exam_id}")
-    print(f"   Chapters: {coverage.chapters}")
-    print(f"   Strategy: {'Chapter-aware' if use_chapter_filter else 'Full-textbook'} filtering")
-    print()
+    header = io.StringIO()
+    print(f"\n🔍 RAG Scout: Enriching {coverage.exam_name}", file=header)
+    print(f"   Exam ID: {coverage.exam_id}", file=header)
+    print(f"   Chapters: {coverage.chapters}", file=header)
+    print(f"   Strategy: {'Chapter-aware' if use_chapter_filter else 'Full-textbook'} filtering", file=header)
+    print(file=header)
+    sys.stdout.write(header.getvalue())
+    
+    # Reuse a previous run if coverage, index, and parameters are unchanged
+    cache_key = make_key("enrich_coverage", {
+        "coverage": coverage.model_dump(mode="json"),
+        "index": _file_fingerprint(index_path),
+        "chunks": _file_fingerprint(chunks_path),
+        "top_k": top_k,
+        "min_score": min_score,
+        "use_chapter_filter": use_chapter_filter
+    })
+    cached = cache_get(cache_key)
+    if cached is not None:
+        print("✓ Using cached enrichment (index and coverage unchanged)")
+        return EnrichedCoverage(**cached)
     
     # Load FAISS index and mapping
     print("Loading index...", flush=True)
-    index = load_faiss_index(index_path)
+    index = to_device(load_faiss_index(index_path), device)
     mapping = load_chunk_mapping(mapping_path)
+    chunk_lookup = load_chunks_dict_jsonl(chunks_path)
     print(f"✓ Loaded index with {index.ntotal} vectors\n")
     
+    # Embed every topic up front and search them in one FAISS call
+    bullets = [bullet for chapter_topic in coverage.topics for bullet in chapter_topic.bullets]
+    total_topics = len(bullets)
+    cache_namespace = {
+        "index": _file_fingerprint(index_path),
+        "chunks": _file_fingerprint(chunks_path),
+        "top_k": top_k,
+        "min_score": min_score,
+        "use_chapter_filter": use_chapter_filter
+    }
+    topic_caches = []
+    cached_topics = [None] * total_topics
+    row_hits = {}
+    if bullets:
+        # Identical bullets (repeated across chapters) share one embedding + search row
+        unique_bullets = list(dict.fromkeys(bullets))
+        bullet_rows = {bullet: row for row, bullet in enumerate(unique_bullets)}
+        print(f"Embedding {len(unique_bullets)} unique topic queries ({total_topics} topics)...", flush=True)
+        query_embeddings = embed_texts(unique_bullets, task_type="RETRIEVAL_QUERY", batch_size=100, max_inflight=concurrency)
+        
+        # Near-duplicates of bullets enriched earlier in this process need no search
+        dim = query_embeddings.shape[1]
+        for chapter_topic in coverage.topics:
+            cache = _topic_cache(cache_namespace, chapter_topic.chapter if use_chapter_filter else None, dim)
+            topic_caches.extend([cache] * len(chapter_topic.bullets))
+        for i, bullet in enumerate(bullets):
+            if topic_caches[i] is not None:
+                cached_topics[i] = topic_caches[i].get(query_embeddings[bullet_rows[bullet]])
+        miss_rows = sorted({bullet_rows[bullet] for bullet, hit in zip(bullets, cached_topics) if hit is None})
+        reused = sum(hit is not None for hit in cached_topics)
+        if reused:
+            print(f"✓ {reused} topics reuse cached near-duplicate enrichments")
+        
+        if miss_rows:
+            # One k for the whole batch: enough for the most selective chapter filter
+            search_k = top_k * 3
+            if use_chapter_filter:
+                for chapter_topic in coverage.topics:
+                    if chapter_topic.chapter:
+                        filters = {"min_score": min_score, "chapter_number": chapter_topic.chapter}
+                        search_k = max(search_k, adaptive_search_k(top_k, mapping, filters))
+            miss_scores, miss_indices = search_index_batch(query_embeddings[miss_rows], index, search_k)
+            row_hits = {row: (miss_scores[j], miss_indices[j]) for j, row in enumerate(miss_rows)}
+        print()
+    
     # Enrich each topic
     enriched_topics = []
-    total_topics = sum(len(chapter_topic.bullets) for chapter_topic in coverage.topics)
     
     topic_count = 0
     for chapter_topic in coverage.topics:
@@ -354,17 +535,32 @@ def enrich_coverage(
             bullet_preview = bullet[:70] + "..." if len(bullet) > 70 else bullet
             print(f"  [{topic_count}/{total_topics}] {bullet_preview}")
             
-            enriched = enrich_topic(
-                topic_bullet=bullet,
-                chapter_number=chapter_num,
-                chapter_title=chapter_title,
-                index=index,
-                mapping=mapping,
-                chunks_path=chunks_path,
-                top_k=top_k,
-                min_score=min_score,
-                use_chapter_filter=use_chapter_filter
-            )
+            i = topic_count - 1
+            query_embedding = query_embeddings[bullet_rows[bullet]]
+            # Re-probe: a near-duplicate may have been enriched earlier in this loop
+            cache = topic_caches[i]
+            cached = cached_topics[i] or (cache.get(query_embedding) if cache is not None else None)
+            if cached is not None:
+                enriched = cached.model_copy(
+                    update={"chapter": chapter_num, "chapter_title": chapter_title, "bullet": bullet},
+                    deep=True
+                )
+            else:
+                enriched = enrich_topic(
+                    topic_bullet=bullet,
+                    chapter_number=chapter_num,
+                    chapter_title=chapter_title,
+                    index=index,
+                    mapping=mapping,
+                    chunks_path=chunks_path,
+                    top_k=top_k,
+                    min_score=min_score,
+                    use_chapter_filter=use_chapter_filter,
+                    search_hits=row_hits.get(bullet_rows[bullet]),
+                    chunk_lookup=chunk_lookup
+                )
+                if cache is not None:
+                    cache.put(query_embedding, enriched)
             
             enriched_topics.append(enriched)
             
@@ -391,17 +587,20 @@ def enrich_coverage(
     enriched_coverage.calculate_stats()
     
     # Print summary
-    print("="*70)
-    print("📊 Enrichment Summary")
-    print("="*70)
-    print(f"Total topics: {enriched_coverage.total_topics}")
-    print(f"  🟢 High confidence (≥0.75): {enriched_coverage.high_confidence_count}")
-    print(f"  🟡 Medium confidence (0.6-0.75): {enriched_coverage.medium_confidence_count}")
-    print(f"  🔴 Low confidence (<0.6): {enriched_coverage.low_confidence_count}")
+    # Buffered so the summary reaches stdout in one write
+    summary = io.StringIO()
+    print(f"{_BANNER}\n📊 Enrichment Summary\n{_BANNER}", file=summary)
+    print(f"Total topics: {enriched_coverage.total_topics}", file=summary)
+    print(f"  🟢 High confidence (≥0.75): {enriched_coverage.high_confidence_count}", file=summary)
+    print(f"  🟡 Medium confidence (0.6-0.75): {enriched_coverage.medium_confidence_count}", file=summary)
+    print(f"  🔴 Low confidence (<0.6): {enriched_coverage.low_confidence_count}", file=summary)
     
     if enriched_coverage.low_confidence_count > 0:
         pct = (enriched_coverage.low_confidence_count / enriched_coverage.total_topics) * 100
-        print(f"\n⚠️  Warning: {pct:.1f}% of topics have low confidence matches.")
-        print("   The textbook may not align perfectly with exam coverage.")
+        print(f"\n⚠️  Warning: {pct:.1f}% of topics have low confidence matches.", file=summary)
+        print("   The textbook may not align perfectly with exam coverage.", file=summary)
+    sys.stdout.write(summary.getvalue())
+    
+    cache_put(cache_key, enriched_coverage.model_dump(mode="json"), ttl=ENRICHMENT_TTL)
     
     return enriched_coverage
@@ -0,0 +1,102 @@
+"""In-memory semantic cache: reuse results for near-duplicate query embeddings.
+
+Exact-text caching misses paraphrased topic bullets ("Understand the Central
+Limit Theorem" vs "Explain the central limit theorem") that retrieve the same
+textbook evidence. This cache stores unit-normalized query embeddings in a
+FAISS IndexFlatIP and returns the stored value when the nearest cached query
+has cosine similarity >= threshold.
+"""
+from typing import Any, Optional
+import time
+
+import faiss
+import numpy as np
+
+
+DEFAULT_THRESHOLD = 0.95
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class SemanticCache:
+    """Nearest-neighbour cache keyed by query embedding (LRU + optional TTL)."""
+
+    def __init__(
+        self,
+        dim: int,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: Optional[float] = None
+    ):
+        """
+        Args:
+            dim: Embedding dimension
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Entries kept before evicting the least recently used
+            ttl: Seconds an entry stays valid (None = until evicted)
+        """
+        self.dim = dim
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._index = faiss.IndexFlatIP(dim)
+        # Parallel to the index rows
+        self._values: list[Any] = []
+        self._expires: list[Optional[float]] = []
+        self._last_used: list[int] = []
+        self._clock = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _prepare(self, embedding: np.ndarray) -> np.ndarray:
+        query = np.array(embedding, dtype=np.float32).reshape(1, -1)
+        faiss.normalize_L2(query)
+        return query
+
+    def _remove(self, row: int) -> None:
+        # IndexFlat.remove_ids shifts later rows down, matching list.pop
+        self._index.remove_ids(np.array([row], dtype=np.int64))
+        del self._values[row], self._expires[row], self._last_used[row]
+
+    def get(self, embedding: np.ndarray) -> Optional[Any]:
+        """
+        Return the value cached for the nearest query, or None on a miss.
+
+        Args:
+            embedding: Query embedding (any norm), shape (dim,) or (1, dim)
+
+        Returns:
+            Cached value if a stored query is within threshold, else None
+        """
+        if not self._values:
+            return None
+        scores, rows = self._index.search(self._prepare(embedding), 1)
+        row = int(rows[0][0])
+        if row < 0 or scores[0][0] < self.threshold:
+            return None
+
+        expires_at = self._expires[row]
+        if expires_at is not None and expires_at < time.time():
+            self._remove(row)
+            return None
+
+        self._clock += 1
+        self._last_used[row] = self._clock
+        return self._values[row]
+
+    def put(self, embedding: np.ndarray, value: Any) -> None:
+        """
+        Store value under embedding, evicting the least recently used entry if full.
+
+        Args:
+            embedding: Query embedding (any norm)
+            value: Result to return for near-duplicate queries
+        """
+        if len(self._values) >= self.max_entries:
+            self._remove(int(np.argmin(self._last_used)))
+
+        self._clock += 1
+        self._index.add(self._prepare(embedding))
+        self._values.append(value)
+        self._expires.append(time.time() + self.ttl if self.ttl is not None else None)
+        self._last_used.append(self._clock)
@@ -2,12 +2,19 @@
 from pathlib import Path
 from datetime import date, datetime, timedelta
 import re
-import json
+from collections import deque
 from typing import Literal, Optional
 
-from app.models.enriched_coverage import EnrichedCoverage, EnrichedTopic
+from app.models.enriched_coverage import EnrichedTopic
 from app.models.plan import StudyPlan, StudyDay, StudyBlock, ExamInfo, Priority
-from app.tools.question_generator import generate_study_question
+from app.tools.intelligent_planner import load_coverage
+from app.tools.question_generator import generate_study_question, generate_study_questions_batch
+
+
+# Course code at the start of an exam name, e.g. "HLTH 204"
+_COURSE_RE = re.compile(r'([A-Z]{3,5}\s+\d{3})')
+# Indexed by date.weekday()
+_DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 
 
 def estimate_time_minutes(
@@ -201,9 +208,8 @@ def generate_multi_exam_plan(
     print("[1/5] Loading enriched coverages...", flush=True)
     coverages = []
     for path in enriched_coverage_paths:
-        with open(path) as f:
-            data = json.load(f)
-        coverage = EnrichedCoverage(**data)
+        # Shared cache: prioritization below re-reads the same files
+        coverage = load_coverage(path)
         coverages.append(coverage)
         print(f"  ✓ {coverage.exam_name}: {len(coverage.topics)} topics")
     
@@ -212,11 +218,10 @@ def generate_multi_exam_plan(
     
     for coverage in coverages:
         # Extract course code from exam_name (e.g., "HLTH 204 - Midterm Examination 1")
-        course_pattern = r'([A-Z]{3,5}\s+\d{3})'
         exam_name = coverage.exam_name
         
         # Try to extract course code from exam_name
-        match = re.search(course_pattern, exam_name)
+        match = _COURSE_RE.search(exam_name)
         if match:
             course = match.group(1)
         else:
@@ -310,7 +315,7 @@ def generate_multi_exam_plan(
             x["topic"].chapter
         ))
         scheduled_items = []
-        exam_queues = {exam.exam_id: [] for exam in exams}
+        exam_queues = {exam.exam_id: deque() for exam in exams}
         
         for item in work_items:
             exam_queues[item["exam_info"].exam_id].append(item)
@@ -319,7 +324,7 @@ def generate_multi_exam_plan(
         while any(exam_queues.values()):
             for exam_id in exam_queues:
                 if exam_queues[exam_id]:
-                    scheduled_items.append(exam_queues[exam_id].pop(0))
+                    scheduled_items.append(exam_queues[exam_id].popleft())
     
     elif strategy == "priority_first":
         # Sort by priority first, then exam order, then chapter
@@ -338,20 +343,26 @@ def generate_multi_exam_plan(
             x["topic"].chapter
         ))
         
-        exam_minutes = {exam.exam_id: 0 for exam in exams}
+        exam_queues = {exam.exam_id: deque() for exam in exams}
+        for item in work_items:
+            exam_queues[item["exam_info"].exam_id].append(item)
+        
+        # Only exams with topics left compete for the next slot
+        exam_minutes = {exam_id: 0 for exam_id, queue in exam_queues.items() if queue}
         scheduled_items = []
         
-        while work_items:
+        while exam_minutes:
             # Find exam with least total minutes
-            min_exam = min(exam_minutes.items(), key=lambda x: x[1])[0]
+            min_exam = min(exam_minutes, key=exam_minutes.__getitem__)
             
-            # Find next item for that exam (already priority-sorted)
-            for item in work_items:
-                if item["exam_info"].exam_id == min_exam:
-                    scheduled_items.append(item)
-                    exam_minutes[min_exam] += item["minutes"]
-                    work_items.remove(item)
-                    break
+            # Take next item for that exam (already priority-sorted)
+            queue = exam_queues[min_exam]
+            item = queue.popleft()
+            scheduled_items.append(item)
+            if queue:
+                exam_minutes[min_exam] += item["minutes"]
+            else:
+                del exam_minutes[min_exam]
     
     print(f"  ✓ Scheduled {len(scheduled_items)} topics")
     
@@ -378,7 +389,7 @@ def generate_multi_exam_plan(
             
             current_day = StudyDay(
                 date=current_date.isoformat(),
-                day_name=current_date.strftime("%A")
+                day_name=_DAY_NAMES[current_date.weekday()]
             )
         
         # Create block (without questions for now - we'll batch generate)
@@ -408,29 +419,35 @@ def generate_multi_exam_plan(
         topic_map = {}
         for coverage in coverages:
             for topic in coverage.topics:
-                # Create a key from chapter + bullet (should be unique)
-                key = f"{topic.chapter}|{topic.bullet}"
-                topic_map[key] = topic
+                # Key on chapter + bullet (should be unique)
+                topic_map[(topic.chapter, topic.bullet)] = topic
         
         total_blocks = len(all_blocks)
-        questions_generated = 0
         
-        for i, block in enumerate(all_blocks, 1):
-            if i % 10 == 0 or i == total_blocks:
-                print(f"  Progress: {i}/{total_blocks}", flush=True)
-            
-            # Find corresponding enriched topic to get chunks
-            key = f"{block.chapter}|{block.objective}"
-            enriched_topic = topic_map.get(key)
-            
+        # Find corresponding enriched topic to get chunks
+        pending = []
+        for block in all_blocks:
+            enriched_topic = topic_map.get((block.chapter, block.objective))
             if enriched_topic and enriched_topic.top_chunks:
-                block.study_question = generate_study_question(
-                    objective=block.objective,
-                    chunk_excerpts=enriched_topic.top_chunks,
-                    chapter_title=block.chapter_title
-                )
-                if block.study_question:
-                    questions_generated += 1
+                pending.append((block, {
+                    "objective": block.objective,
+                    "chunk_excerpts": enriched_topic.top_chunks,
+                    "chapter_title": block.chapter_title
+                }))
+        
+        def report(done: int, total: int) -> None:
+            if done % 10 == 0 or done == total:
+                print(f"  Progress: {done}/{total}", flush=True)
+        
+        questions = generate_study_questions_batch(
+            [kwargs for _, kwargs in pending],
+            on_progress=report
+        )
+        questions_generated = 0
+        for (block, _), question in zip(pending, questions):
+            block.study_question = question
+            if question:
+                questions_generated += 1
         
         print(f"  ✓ Generated {questions_generated}/{total_blocks} study questions")
     else:
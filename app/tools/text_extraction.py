@@ -53,18 +53,25 @@ def extract_all_pending(
         if progress_callback:
             progress_callback(file_entry)
         
-        # Extract text
-        file_path = uploads_dir / file_entry.path
-        extracted, error = extract_text_from_pdf(
-            file_path=file_path,
-            file_id=file_entry.file_id,
-            relative_path=file_entry.path
+        # Reuse an earlier extraction of identical bytes (e.g. a renamed re-upload)
+        extracted = find_extracted_by_hash(
+            file_entry.sha256, file_entry.file_id, file_entry.path, extracted_text_dir
         )
+        error = None
+        if extracted is None:
+            # Extract text
+            file_path = uploads_dir / file_entry.path
+            extracted, error = extract_text_from_pdf(
+                file_path=file_path,
+                file_id=file_entry.file_id,
+                relative_path=file_entry.path
+            )
         
         if extracted is not None:
             # Save extracted text
             output_path = extracted_text_dir / f"{file_entry.file_id}.json"
             _save_extracted_text(extracted, output_path)
+            record_content_hash(file_entry.sha256, file_entry.file_id, extracted_text_dir)
             
             # Update manifest entry
             artifact_path = f"storage/state/extracted_text/{file_entry.file_id}.json"
@@ -103,3 +110,43 @@ def load_extracted_text(file_id: str, extracted_text_dir: Path) -> Optional[Extr
         return ExtractedText(**data)
     except Exception:
         return None
+
+
+def _hash_pointer_path(sha256: str, extracted_text_dir: Path) -> Path:
+    return extracted_text_dir / "by_hash" / sha256
+
+
+def record_content_hash(sha256: str, file_id: str, extracted_text_dir: Path) -> None:
+    """Remember which file_id holds the extraction for these PDF bytes."""
+    pointer = _hash_pointer_path(sha256, extracted_text_dir)
+    pointer.parent.mkdir(parents=True, exist_ok=True)
+    pointer.write_text(file_id)
+
+
+def find_extracted_by_hash(
+    sha256: str,
+    file_id: str,
+    relative_path: str,
+    extracted_text_dir: Path
+) -> Optional[ExtractedText]:
+    """
+    Look up an existing extraction of a PDF with the same SHA-256.
+    
+    Args:
+        sha256: Content hash from the manifest entry
+        file_id: File ID the extraction should be re-keyed to
+        relative_path: Upload path of the file being processed
+        extracted_text_dir: Directory with extracted text files
+    
+    Returns:
+        ExtractedText re-keyed to file_id/relative_path, or None if never extracted
+    """
+    pointer = _hash_pointer_path(sha256, extracted_text_dir)
+    if not pointer.exists():
+        return None
+    
+    source = load_extracted_text(pointer.read_text().strip(), extracted_text_dir)
+    if source is None:
+        return None
+    
+    return source.model_copy(update={"file_id": file_id, "path": relative_path})
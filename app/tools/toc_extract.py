@@ -4,9 +4,10 @@ import re
 import json
 import logging
 from typing import Optional, Tuple
-from google import genai
 from google.genai import types
 from app.models.textbook_metadata import TextbookMetadata, ChapterInfo, SectionInfo
+from app.tools.llm_utils import get_client
+from app.tools.tool_cache import cached_tool
 
 logger = logging.getLogger(__name__)
 
@@ -139,6 +140,19 @@ def _extract_chapters_with_llm(toc_text: str) -> Tuple[list[ChapterInfo], Option
     Returns:
         Tuple of (chapters_list, error_message)
     """
+    # Use the model from environment or default to gemini-2.0-flash
+    model_name = os.getenv("CHAT_MODEL", "gemini-2.0-flash")
+    return _extract_chapters_for_model(toc_text, model_name)
+
+
+@cached_tool(
+    "extract_toc",
+    encode=lambda result: [ch.model_dump(mode="json") for ch in result[0]],
+    decode=lambda data: ([ChapterInfo(**item) for item in data], None),
+    should_cache=lambda result: result[1] is None and bool(result[0])
+)
+def _extract_chapters_for_model(toc_text: str, model_name: str) -> Tuple[list[ChapterInfo], Optional[str]]:
+    """LLM chapter extraction for a given model (cached on TOC text + model)."""
     try:
         logger.info("Starting LLM extraction of chapters and sections")
         
@@ -149,7 +163,7 @@ def _extract_chapters_with_llm(toc_text: str) -> Tuple[list[ChapterInfo], Option
             return [], "GOOGLE_API_KEY environment variable not set"
         
         logger.debug(f"API key found: {api_key[:10]}...")
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
         
         prompt = """Extract the table of contents from this textbook. For each chapter, provide:
 
@@ -187,8 +201,6 @@ Return as JSON array:
         logger.debug(toc_text_preview)
         logger.debug("="*80)
         
-        # Use the model from environment or default to gemini-2.0-flash
-        model_name = os.getenv("CHAT_MODEL", "gemini-2.0-flash")
         logger.info(f"Calling LLM ({model_name}) for TOC extraction (chapters-only)...")
         response = client.models.generate_content(
             model=model_name,
@@ -0,0 +1,132 @@
+"""Persistent cache for LLM-backed tool results (SQLite, WAL mode).
+
+Results are keyed on sha256(tool name + model + arguments), so any change in
+the input text or model produces a new key. Content-addressed tools
+(classification, TOC, coverage extraction) never expire; tools whose inputs
+can drift outside the key (e.g. RAG enrichment against a rebuilt index) pass
+a TTL.
+"""
+from pathlib import Path
+from contextlib import closing
+from functools import wraps
+from typing import Any, Callable, Optional
+import hashlib
+import json
+import sqlite3
+import time
+
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / "storage" / "state" / "tool_cache.sqlite"
+
+# Per-tool TTLs (seconds); None = never expires
+ENRICHMENT_TTL = 30 * 24 * 3600
+
+_cache_path: Path = DEFAULT_CACHE_PATH
+_enabled: bool = True
+
+
+def set_cache_enabled(enabled: bool) -> None:
+    """Globally enable/disable cache reads and writes (e.g. for --no-cache)."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_cache_enabled() -> bool:
+    """Whether cache reads and writes are currently enabled."""
+    return _enabled
+
+
+def set_cache_path(path: Path) -> None:
+    """Point the cache at a different SQLite file (mainly for tests)."""
+    global _cache_path
+    _cache_path = path
+
+
+def make_key(tool_name: str, payload: Any, model: str = "") -> str:
+    """Build a stable cache key from tool name, model, and JSON-able payload."""
+    raw = json.dumps([tool_name, model, payload], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _connect() -> sqlite3.Connection:
+    _cache_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(_cache_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS tool_cache ("
+        "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+    )
+    return conn
+
+
+def cache_get(key: str) -> Optional[Any]:
+    """Return the cached JSON value for key, or None if missing/expired/disabled."""
+    if not _enabled:
+        return None
+    try:
+        with closing(_connect()) as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM tool_cache WHERE key = ?", (key,)
+            ).fetchone()
+    except sqlite3.Error:
+        return None
+
+    if row is None:
+        return None
+    value, expires_at = row
+    if expires_at is not None and expires_at < time.time():
+        return None
+    return json.loads(value)
+
+
+def cache_put(key: str, value: Any, ttl: Optional[float] = None) -> None:
+    """Store a JSON-serializable value; ttl in seconds (None = no expiry)."""
+    if not _enabled:
+        return
+    expires_at = time.time() + ttl if ttl is not None else None
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO tool_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, default=str), expires_at)
+            )
+    except sqlite3.Error as e:
+        print(f"Warning: Failed to write tool cache: {e}")
+
+
+def cached_tool(
+    tool_name: str,
+    model: str = "",
+    ttl: Optional[float] = None,
+    encode: Optional[Callable[[Any], Any]] = None,
+    decode: Optional[Callable[[Any], Any]] = None,
+    should_cache: Optional[Callable[[Any], bool]] = None
+) -> Callable:
+    """
+    Decorator caching a function's result keyed on its arguments.
+
+    Args:
+        tool_name: Namespace for the key
+        model: Model name/version (part of the key)
+        ttl: Seconds until expiry (None = never)
+        encode: Convert the result to a JSON-able value before storing
+        decode: Rebuild the result from the stored value
+        should_cache: Predicate on the result; failures return False
+    """
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = make_key(tool_name, {"args": args, "kwargs": kwargs}, model)
+
+            cached = cache_get(key)
+            if cached is not None:
+                return decode(cached) if decode else cached
+
+            result = fn(*args, **kwargs)
+            if should_cache is None or should_cache(result):
+                cache_put(key, encode(result) if encode else result, ttl)
+            return result
+
+        return wrapper
+
+    return decorator
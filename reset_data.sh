@@ -17,6 +17,7 @@ rm -rf storage/state/enriched_coverage/*
 rm -rf storage/state/chunks/*
 rm -rf storage/state/index/*
 rm -rf storage/state/embeddings/*
+rm -f storage/state/tool_cache.sqlite*
 
 # Keep the directory structure
 mkdir -p storage/state/extracted_text
@@ -52,6 +53,7 @@ echo "   - All embeddings (.npy files)"
 echo "   - All FAISS indexes"
 echo "   - All coverage files"
 echo "   - All enriched coverage"
+echo "   - Cached LLM tool results"
 echo "   - All generated plans"
 echo ""
 echo "🚀 Ready for a fresh start! Run your agent to reprocess files."
@@ -0,0 +1,54 @@
+"""Tests for app.tools.chunk_store."""
+from pathlib import Path
+
+from app.models.chunks import Chunk
+from app.tools.chunk_store import (
+    append_chunks_jsonl,
+    get_chunks_by_ids,
+    load_chunks_dict_jsonl,
+    load_chunks_jsonl,
+    save_chunks_jsonl,
+)
+
+
+def _chunk(i: int) -> Chunk:
+    return Chunk(
+        chunk_id=f"c{i}",
+        file_id="f1",
+        filename="book.pdf",
+        text=f"text {i} – é",
+        page_start=i,
+        page_end=i,
+        token_count=3,
+    )
+
+
+def test_get_chunks_by_ids_uses_fresh_offsets(tmp_path: Path) -> None:
+    path = tmp_path / "chunks.jsonl"
+    save_chunks_jsonl([_chunk(0), _chunk(1), _chunk(2)], path)
+
+    found = get_chunks_by_ids(["c2", "c0", "missing"], path)
+    assert set(found) == {"c0", "c2"}
+    assert found["c2"] == _chunk(2)
+
+    # Appending invalidates the saved offsets
+    append_chunks_jsonl([_chunk(3)], path)
+    assert get_chunks_by_ids(["c3"], path)["c3"] == _chunk(3)
+
+
+def test_raw_lookup_matches_models(tmp_path: Path) -> None:
+    path = tmp_path / "chunks.jsonl"
+    save_chunks_jsonl([_chunk(0), _chunk(1)], path)
+
+    raw = get_chunks_by_ids(["c1", "c0"], path, raw=True)
+    assert {chunk_id: Chunk(**c) for chunk_id, c in raw.items()} == get_chunks_by_ids(["c0", "c1"], path)
+
+
+def test_dict_loader_keys_by_chunk_id(tmp_path: Path) -> None:
+    path = tmp_path / "chunks.jsonl"
+    save_chunks_jsonl([_chunk(0), _chunk(1)], path)
+    with path.open("a", encoding="utf-8") as f:
+        f.write("not json\n")
+
+    assert load_chunks_dict_jsonl(path) == {c.chunk_id: c for c in load_chunks_jsonl(path)}
+    assert load_chunks_dict_jsonl(tmp_path / "missing.jsonl") == {}
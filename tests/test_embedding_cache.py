@@ -0,0 +1,79 @@
+"""Tests for app.tools.embedding_cache."""
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.tools.embedding_cache import (
+    EmbeddingCacheShard,
+    get_or_compute_embedding_rows,
+    get_or_compute_embeddings,
+    save_embedding_to_cache,
+)
+
+
+def _chunk(chunk_id: str, text: str) -> SimpleNamespace:
+    return SimpleNamespace(chunk_id=chunk_id, text=text)
+
+
+def _fake_embed(texts: list[str]) -> np.ndarray:
+    return np.array([[len(t), 1.0, 2.0] for t in texts], dtype=np.float32)
+
+
+def test_shard_roundtrip(tmp_path: Path) -> None:
+    shard = EmbeddingCacheShard(tmp_path)
+    shard.put("a", "hello", np.array([1.0, 2.0, 3.0]))
+    shard.flush()
+
+    reopened = EmbeddingCacheShard(tmp_path)
+    assert shard.num_rows == reopened.num_rows == 1
+    assert np.allclose(reopened.get("a", "hello"), [1.0, 2.0, 3.0])
+    assert reopened.get("a", "changed text") is None
+    assert reopened.get("missing", "hello") is None
+
+
+def test_get_or_compute_uses_cache(tmp_path: Path) -> None:
+    chunks = [_chunk("a", "x"), _chunk("b", "yy")]
+    first, stats = get_or_compute_embeddings(chunks, tmp_path, _fake_embed, show_progress=False)
+    assert stats["computed"] == 2
+
+    chunks.append(_chunk("c", "zzz"))
+    second, stats = get_or_compute_embeddings(chunks, tmp_path, _fake_embed, show_progress=False)
+    assert stats == {"total": 3, "cached": 2, "computed": 1}
+    assert np.allclose(second[:2], first)
+    assert second[2, 0] == 3
+
+
+def test_legacy_files_are_migrated(tmp_path: Path) -> None:
+    save_embedding_to_cache("a", "x", np.array([9.0, 9.0, 9.0], dtype=np.float32), tmp_path)
+
+    embeddings, stats = get_or_compute_embeddings([_chunk("a", "x")], tmp_path, _fake_embed, show_progress=False)
+    assert stats["cached"] == 1
+    assert np.allclose(embeddings[0], 9.0)
+
+
+def test_streaming_rows_match_chunk_order(tmp_path: Path) -> None:
+    chunks = [_chunk(f"c{i}", "x" * (i + 1)) for i in range(5)]
+    seen_blocks = []
+
+    rows, stats = get_or_compute_embedding_rows(
+        iter(chunks), tmp_path, _fake_embed, block_size=2, show_progress=False, on_block=seen_blocks.append
+    )
+    assert stats == {"total": 5, "cached": 0, "computed": 5}
+    assert [len(block) for block in seen_blocks] == [2, 2, 1]
+
+    matrix = EmbeddingCacheShard(tmp_path).matrix
+    assert matrix[rows][:, 0].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_streaming_writes_row_index_once(tmp_path: Path, monkeypatch) -> None:
+    shard = EmbeddingCacheShard(tmp_path)
+    index_writes = []
+    original_flush = shard.flush
+    monkeypatch.setattr(shard, "flush", lambda: (index_writes.append(1), original_flush()))
+
+    chunks = [_chunk(f"c{i}", "x" * (i + 1)) for i in range(5)]
+    get_or_compute_embedding_rows(chunks, tmp_path, _fake_embed, block_size=2, show_progress=False, cache_backend=shard)
+
+    assert index_writes == [1]
+    assert len(EmbeddingCacheShard(tmp_path)) == 5
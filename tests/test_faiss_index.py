@@ -0,0 +1,144 @@
+"""Tests for app.tools.faiss_index."""
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from app.models.chunks import Chunk
+from app.tools.faiss_index import (
+    AUTO_HNSW_THRESHOLD,
+    adaptive_search_k,
+    apply_search_params,
+    build_chunk_mapping,
+    build_faiss_index,
+    create_index,
+    filter_search_hits,
+    flat_index_matrix,
+    load_chunk_mapping,
+    load_search_index,
+    normalize_vectors,
+    resolve_index_type,
+    search_index_batch,
+    search_numpy,
+    top_k_argpartition,
+)
+
+
+def _chunk(i: int, chapter: int | None) -> Chunk:
+    return Chunk(
+        chunk_id=f"c{i}",
+        file_id="f1",
+        filename="book.pdf",
+        text="text",
+        page_start=i,
+        page_end=i + 1,
+        token_count=10,
+        chapter_number=chapter,
+        chapter_title=f"Chapter {chapter}" if chapter else None,
+    )
+
+
+def test_binary_mapping_matches_json(tmp_path: Path) -> None:
+    chunks = [_chunk(0, None), _chunk(1, 2), _chunk(2, 3)]
+    mapping = build_chunk_mapping(chunks, tmp_path / "map.json", legacy_json=True)
+
+    loaded = load_chunk_mapping(tmp_path / "map.json")
+    assert len(loaded) == 3
+    assert [loaded[i] for i in range(3)] == [mapping[i] for i in range(3)]
+    assert loaded.get(3) is None
+
+
+def test_legacy_object_mapping_loads_as_list(tmp_path: Path) -> None:
+    path = tmp_path / "map.json"
+    path.write_text('{"1": {"chunk_id": "c1"}, "0": {"chunk_id": "c0"}}')
+
+    assert load_chunk_mapping(path) == [{"chunk_id": "c0"}, {"chunk_id": "c1"}]
+
+
+def test_numpy_search_matches_faiss() -> None:
+    rng = np.random.default_rng(0)
+    vectors = normalize_vectors(rng.random((50, 16), dtype=np.float32))
+    queries = normalize_vectors(rng.random((3, 16), dtype=np.float32))
+    index = faiss.IndexFlatIP(16)
+    index.add(vectors)
+
+    scores, indices = search_numpy(queries, flat_index_matrix(index), 5)
+    expected_scores, expected_indices = index.search(queries, 5)
+    assert (indices == expected_indices).all()
+    assert np.allclose(scores, expected_scores, atol=1e-5)
+
+    _, padded = search_numpy(queries, flat_index_matrix(index), 60)
+    assert (padded[:, 50:] == -1).all()
+
+
+def test_pca_index_projects_queries() -> None:
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 8)) @ rng.normal(size=(8, 64))
+    vectors = normalize_vectors(vectors.astype(np.float32))
+
+    index, meta = create_index(vectors, "hnsw", pca_dim=16)
+    apply_search_params(index, meta)
+    assert meta["pca_dim"] == 16
+    assert faiss.downcast_index(index.index).hnsw.efSearch == meta["ef_search"]
+
+    _, indices = search_index_batch(vectors[:10], index, 1)
+    assert (indices[:, 0] == np.arange(10)).all()
+
+
+def test_flat_index_loads_as_mmap_matrix(tmp_path: Path) -> None:
+    vectors = np.random.default_rng(0).random((20, 8), dtype=np.float32)
+    index_path = tmp_path / "faiss.index"
+
+    index = build_faiss_index(vectors.copy(), index_path)
+    loaded = load_search_index(index_path)
+    assert isinstance(loaded, np.memmap)
+    assert (search_index_batch(vectors, loaded, 3)[1] == search_index_batch(vectors, index, 3)[1]).all()
+
+    build_faiss_index(vectors.copy(), index_path, index_type="hnsw")
+    assert not isinstance(load_search_index(index_path), np.ndarray)
+
+
+def test_auto_index_type_switches_on_size() -> None:
+    assert resolve_index_type("auto", 1000) == "flat"
+    assert resolve_index_type("auto", AUTO_HNSW_THRESHOLD + 1) == "hnsw"
+    assert resolve_index_type("ivfpq", 10) == "ivfpq"
+
+
+def test_filters_match_for_binary_and_json_mappings(tmp_path: Path) -> None:
+    chunks = [_chunk(i, chapter) for i, chapter in enumerate([1, 2, None, 2, 3])]
+    json_mapping = build_chunk_mapping(chunks, tmp_path / "map.json")
+    binary_mapping = load_chunk_mapping(tmp_path / "map.json")
+
+    scores = np.array([0.9, 0.8, 0.7, 0.6, 0.4, 0.3], dtype=np.float32)
+    indices = np.array([3, 1, 2, 0, 4, -1])
+    for filters in ({"chapter_number": [2, 3], "min_score": 0.5}, {"chapter_number": 1}, {"file_id": "f2"}, None):
+        expected = filter_search_hits(scores, indices, json_mapping, 10, filters)
+        assert filter_search_hits(scores, indices, binary_mapping, 10, filters) == expected
+    assert [r["chunk_id"] for r in expected] == ["c3", "c1", "c2", "c0", "c4"]
+
+
+def test_filters_on_empty_binary_mapping_return_no_hits(tmp_path: Path) -> None:
+    build_chunk_mapping([], tmp_path / "map.json")
+    mapping = load_chunk_mapping(tmp_path / "map.json")
+
+    scores = np.array([0.9, 0.8], dtype=np.float32)
+    indices = np.array([0, -1])
+    assert filter_search_hits(scores, indices, mapping, 10, {"chapter_number": 1}) == []
+
+
+def test_top_k_argpartition_orders_best_first() -> None:
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [0.4, 0.2, 0.8, 0.6]])
+    assert top_k_argpartition(scores, 2).tolist() == [[1, 3], [2, 3]]
+    assert top_k_argpartition(scores[0], 10).tolist() == [1, 3, 2, 0]
+
+
+def test_adaptive_search_k_scales_with_chapter_selectivity(tmp_path: Path) -> None:
+    chunks = [_chunk(i, 1 if i < 90 else 2) for i in range(100)]
+    build_chunk_mapping(chunks, tmp_path / "map.json")
+    mapping = load_chunk_mapping(tmp_path / "map.json")
+
+    assert adaptive_search_k(5, mapping, {"min_score": 0.5}) == 5
+    assert adaptive_search_k(5, mapping, {"chapter_number": 2}) == 50
+    assert adaptive_search_k(5, mapping, {"chapter_number": [1, 2]}) == 5
+    assert adaptive_search_k(5, mapping, {"chapter_number": 7}) == 100
+    assert adaptive_search_k(5, mapping, {"file_id": "f1"}) == 15
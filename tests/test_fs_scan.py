@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pytest
 
-from app.tools.fs_scan import scan_uploads
+from app.tools.fs_scan import scan_uploads, uploads_fingerprint
 
 
 def test_scan_uploads_empty_dir(tmp_path: Path) -> None:
@@ -18,3 +18,12 @@ def test_scan_uploads_lists_files(tmp_path: Path) -> None:
     assert len(paths) == 2
     assert any("a.pdf" in p for p in paths)
     assert any("b.pdf" in p for p in paths)
+
+
+def test_uploads_fingerprint_tracks_changes(tmp_path: Path) -> None:
+    (tmp_path / "a.pdf").write_text("x")
+    first = uploads_fingerprint(tmp_path)
+    assert first == uploads_fingerprint(tmp_path)
+
+    (tmp_path / "b.pdf").write_text("y")
+    assert uploads_fingerprint(tmp_path) != first
@@ -0,0 +1,54 @@
+"""Tests for app.tools.intelligent_planner."""
+import os
+from datetime import date
+from pathlib import Path
+
+from app.models.enriched_coverage import EnrichedCoverage, EnrichedTopic, ReadingPages
+from app.tools.intelligent_planner import analyze_study_load, load_coverage
+
+
+def _write_coverage(path: Path, n_topics: int) -> None:
+    topics = [
+        EnrichedTopic(
+            chapter=1,
+            chapter_title="Intro",
+            bullet=f"Objective {i}",
+            reading_pages=ReadingPages(file_id="f1", filename="book.pdf"),
+        )
+        for i in range(n_topics)
+    ]
+    coverage = EnrichedCoverage(
+        exam_id="e1",
+        exam_name="Midterm",
+        exam_date="2025-03-01",
+        source_file_id="f0",
+        topics=topics,
+    )
+    path.write_text(coverage.model_dump_json())
+
+
+def test_load_coverage_reuses_until_file_changes(tmp_path: Path):
+    path = tmp_path / "e1_enriched.json"
+    _write_coverage(path, 2)
+
+    first = load_coverage(path)
+    assert load_coverage(path) is first
+
+    _write_coverage(path, 3)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    reloaded = load_coverage(path)
+    assert reloaded is not first
+    assert len(reloaded.topics) == 3
+
+
+def test_analyze_study_load_counts_topics(tmp_path: Path):
+    path = tmp_path / "e1_enriched.json"
+    _write_coverage(path, 4)
+
+    result = analyze_study_load([path], date(2025, 2, 1), date(2025, 2, 28))
+    assert result["total_topics"] == 4
+    assert result["days_available"] == 20  # weekdays in February 2025
+    assert result["exams"] == [
+        {"exam_name": "Midterm", "topics": 4, "exam_date": "2025-03-01"}
+    ]
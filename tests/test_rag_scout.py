@@ -0,0 +1,93 @@
+"""Tests for app.tools.rag_scout."""
+from app.models.chunks import Chunk
+from app.tools import rag_scout, tool_cache
+from app.tools.rag_scout import (
+    consolidate_page_ranges,
+    extract_key_terms,
+    extract_practice_problems,
+    extract_problems_and_terms,
+    merge_intervals,
+)
+
+
+def _chunk(text: str, page: int = 1) -> Chunk:
+    return Chunk(
+        chunk_id=f"c{page}",
+        file_id="f1",
+        filename="book.pdf",
+        text=text,
+        page_start=page,
+        page_end=page,
+        token_count=10,
+    )
+
+
+def test_extract_practice_problems_in_document_order() -> None:
+    chunks = [
+        _chunk("See exercise 2.1 first.\n\n  Then   Problem 3 and Challenge 1.2.3.", page=4),
+        _chunk("Question 7: define osmosis.", page=5),
+    ]
+    problems = extract_practice_problems(chunks, max_problems=3)
+
+    assert [p.snippet.split()[0] for p in problems] == ["exercise", "Problem", "Challenge"]
+    assert problems[0].snippet == "exercise 2.1 first. Then Problem 3 and Challenge 1.2.3."
+    assert all(p.page == 4 for p in problems)
+
+
+def test_extract_key_terms_filters_stopwords_and_rare_terms() -> None:
+    text = "Cell Membrane and Active Transport. The Golgi. so the Cell Membrane uses Active Transport. Golgi Body."
+    terms = extract_key_terms([_chunk(text)], top_k=5, min_frequency=2)
+
+    assert terms == ["Cell Membrane", "Active Transport"]
+
+
+def test_consolidate_page_ranges() -> None:
+    assert consolidate_page_ranges([15, 1, 2, 3, 7, 8, 2]) == [[1, 3], [7, 8], [15, 15]]
+    assert consolidate_page_ranges([]) == []
+
+
+def test_merge_intervals_matches_page_consolidation() -> None:
+    intervals = [(100, 180), (9, 10), (1, 3), (2, 4), (183, 185), (50, 49)]
+    pages = [p for start, end in intervals for p in range(start, end + 1)]
+
+    assert merge_intervals(intervals) == [[1, 4], [9, 10], [100, 185]]
+    assert merge_intervals(intervals) == consolidate_page_ranges(pages)
+
+
+def test_extract_key_terms_stops_after_enough_candidates() -> None:
+    first = _chunk("Cell Membrane, Cell Membrane, Active Transport, Active Transport.")
+    later = _chunk("Golgi Body. " * 10, page=2)
+
+    assert extract_key_terms([first, later], top_k=1) == ["Cell Membrane"]
+    assert extract_key_terms([first, later], top_k=2) == ["Golgi Body", "Cell Membrane"]
+
+
+def test_fused_extraction_matches_separate_passes() -> None:
+    chunks = [
+        _chunk("Problem 1.1 on Cell Membrane. Cell Membrane again.", page=1),
+        _chunk("Exercise 2 covers Active Transport and Active Transport.", page=2),
+        _chunk("Question 3 asks about the Cell Membrane.", page=3),
+    ]
+
+    assert extract_problems_and_terms(chunks, max_problems=2, top_k=3) == (
+        extract_practice_problems(chunks, max_problems=2),
+        extract_key_terms(chunks, top_k=3),
+    )
+
+
+def test_topic_caches_are_bounded_and_respect_cache_switch(monkeypatch) -> None:
+    monkeypatch.setattr(rag_scout, "_topic_caches", rag_scout.OrderedDict())
+    monkeypatch.setattr(rag_scout, "TOPIC_CACHE_NAMESPACES", 2)
+
+    first = rag_scout._topic_cache({"index": 1}, 1, 4)
+    assert rag_scout._topic_cache({"index": 1}, 1, 4) is first
+    rag_scout._topic_cache({"index": 2}, 1, 4)
+    rag_scout._topic_cache({"index": 3}, 1, 4)
+    assert len(rag_scout._topic_caches) == 2
+    assert rag_scout._topic_cache({"index": 1}, 1, 4) is not first
+
+    tool_cache.set_cache_enabled(False)
+    try:
+        assert rag_scout._topic_cache({"index": 1}, 1, 4) is None
+    finally:
+        tool_cache.set_cache_enabled(True)
@@ -0,0 +1,37 @@
+"""Tests for app.tools.semantic_cache."""
+import numpy as np
+
+from app.tools.semantic_cache import SemanticCache
+
+
+def _vec(*values: float) -> np.ndarray:
+    return np.array(values, dtype=np.float32)
+
+
+def test_hit_on_near_duplicate_and_miss_below_threshold() -> None:
+    cache = SemanticCache(dim=3, threshold=0.95)
+    assert cache.get(_vec(1, 0, 0)) is None
+
+    cache.put(_vec(2, 0, 0), "a")  # stored normalized
+    assert cache.get(_vec(1, 0.1, 0)) == "a"
+    assert cache.get(_vec(1, 1, 0)) is None  # cosine ~0.71
+
+
+def test_evicts_least_recently_used() -> None:
+    cache = SemanticCache(dim=3, max_entries=2)
+    cache.put(_vec(1, 0, 0), "x")
+    cache.put(_vec(0, 1, 0), "y")
+    assert cache.get(_vec(1, 0, 0)) == "x"  # y is now least recently used
+
+    cache.put(_vec(0, 0, 1), "z")
+    assert len(cache) == 2
+    assert cache.get(_vec(0, 1, 0)) is None
+    assert cache.get(_vec(1, 0, 0)) == "x"
+    assert cache.get(_vec(0, 0, 1)) == "z"
+
+
+def test_expired_entries_miss() -> None:
+    cache = SemanticCache(dim=3, ttl=-1)
+    cache.put(_vec(1, 0, 0), "stale")
+    assert cache.get(_vec(1, 0, 0)) is None
+    assert len(cache) == 0
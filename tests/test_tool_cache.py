@@ -0,0 +1,38 @@
+"""Tests for app.tools.tool_cache."""
+from pathlib import Path
+
+from app.tools import tool_cache
+
+
+def test_cached_tool_reuses_result(tmp_path: Path):
+    tool_cache.set_cache_path(tmp_path / "cache.sqlite")
+    calls = []
+
+    @tool_cache.cached_tool("echo", model="m1")
+    def echo(text: str) -> dict:
+        calls.append(text)
+        return {"text": text}
+
+    try:
+        assert echo("a") == {"text": "a"}
+        assert echo("a") == {"text": "a"}
+        assert echo("b") == {"text": "b"}
+        assert calls == ["a", "b"]
+    finally:
+        tool_cache.set_cache_path(tool_cache.DEFAULT_CACHE_PATH)
+
+
+def test_expired_and_disabled_entries_miss(tmp_path: Path):
+    tool_cache.set_cache_path(tmp_path / "cache.sqlite")
+    try:
+        tool_cache.cache_put("stale", {"v": 1}, ttl=-1)
+        assert tool_cache.cache_get("stale") is None
+
+        tool_cache.cache_put("fresh", {"v": 2})
+        tool_cache.set_cache_enabled(False)
+        assert tool_cache.cache_get("fresh") is None
+        tool_cache.set_cache_enabled(True)
+        assert tool_cache.cache_get("fresh") == {"v": 2}
+    finally:
+        tool_cache.set_cache_enabled(True)
+        tool_cache.set_cache_path(tool_cache.DEFAULT_CACHE_PATH)